@@ -0,0 +1,68 @@
+"""
+Matriz usuarios x productos de asequibilidad y noches máximas.
+
+Compara la matriz calculada de una vez (services/affordability.py), en un
+proceso y repartida en varios, contra llamar `can_afford` y
+`calculate_max_nights` por cada par (medido sobre una muestra de usuarios y
+extrapolado).
+
+Uso:
+    python -m benchmarks.affordability_bench --users 100000 --products 1000
+"""
+import argparse
+import os
+import time
+
+from benchmarks.generators import make_catalog, make_users
+from models.accommodation import Accommodation
+from services.affordability import affordability_matrix
+
+
+def per_pair(users, products):
+    """Asequibilidad y noches de cada par con los métodos de User."""
+    cells = 0
+    for user in users:
+        for product in products:
+            if isinstance(product, Accommodation):
+                cells += user.calculate_max_nights(product) > 0
+            else:
+                cells += user.can_afford(product)
+    return cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--sample', type=int, default=200,
+                        help="Usuarios a medir con el cálculo por par")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    products = make_catalog(args.products, seed=args.seed)
+    users = make_users(args.users, seed=args.seed)
+    cells = args.users * args.products
+    print(f"{args.users:,} usuarios x {args.products:,} productos = {cells:,} celdas\n")
+
+    sample = users[:args.sample]
+    start = time.perf_counter()
+    per_pair(sample, products)
+    elapsed = (time.perf_counter() - start) * len(users) / len(sample)
+    print(f"{'Por par (extrapolado)':<28} {elapsed:>9.2f}s  {cells / elapsed:>14,.0f} celdas/s")
+
+    for label, workers in (("Matriz, 1 proceso", 1),
+                           (f"Matriz, {args.workers} procesos", args.workers)):
+        start = time.perf_counter()
+        matrix = affordability_matrix(users, products, workers=workers,
+                                      chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<28} {elapsed:>9.2f}s  {cells / elapsed:>14,.0f} celdas/s")
+
+    affordable = sum(sum(row) for row in matrix.affordable)
+    print(f"\nCeldas asequibles: {affordable:,}  Celdas con error: {sum(1 for _ in matrix.errors()):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Carga del servicio asíncrono de compras con miles de usuarios simultáneos.
+
+Cada usuario simulado envía una serie de compras de precio creciente con
+presupuesto para solo una parte de ellas; se verifica que cada usuario
+recibió sus resultados en orden y se reportan las compras por segundo.
+
+Uso:
+    python -m benchmarks.async_purchase_load --users 5000 --purchases 20
+"""
+import argparse
+import asyncio
+import time
+
+from models.flight import Flight
+from models.user import User
+from services.purchase_service import AsyncPurchaseService
+
+
+async def simulate_user(service, user, flights):
+    """Envía todas las compras de un usuario y espera sus resultados."""
+    futures = [await service.submit(user, flight) for flight in flights]
+    return await asyncio.gather(*futures)
+
+
+async def run(users, purchases, queue_size):
+    """
+    Ejecuta la carga y retorna las métricas obtenidas.
+    """
+    flights = [Flight("2025-01-15", None, "LATAM", 1000 * (i + 1)) for i in range(purchases)]
+    affordable = purchases // 2
+    budget = sum(flight.price for flight in flights[:affordable])
+    clients = [User(f"Usuario {i}", budget) for i in range(users)]
+
+    start = time.perf_counter()
+    async with AsyncPurchaseService(max_queue_size=queue_size) as service:
+        results = await asyncio.gather(*(simulate_user(service, user, flights) for user in clients))
+    elapsed = time.perf_counter() - start
+
+    # Con precios crecientes y compras en orden, solo las primeras deben entrar
+    for user, user_results in zip(clients, results):
+        outcome = [result.success for result in user_results]
+        assert outcome == [True] * affordable + [False] * (purchases - affordable), \
+            f"Compras fuera de orden para {user.name}"
+        assert user.budget == 0, f"{user.name} terminó con presupuesto {user.budget}"
+
+    total = users * purchases
+    return {
+        'users': users,
+        'purchases': total,
+        'elapsed_s': elapsed,
+        'purchases_per_s': total / elapsed if elapsed else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--purchases', type=int, default=20, help="Compras por usuario")
+    parser.add_argument('--queue-size', type=int, default=8)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.users, args.purchases, args.queue_size))
+    print(f"Usuarios: {result['users']}  Compras: {result['purchases']}")
+    print(f"Tiempo: {result['elapsed_s']:.3f}s  ({result['purchases_per_s']:,.0f} compras/s)")
+    print("✓ Compras procesadas en orden por usuario")
+
+
+if __name__ == "__main__":
+    main()
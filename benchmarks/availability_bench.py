@@ -0,0 +1,68 @@
+"""
+Memoria y velocidad del inventario de disponibilidad con bitsets.
+
+Se crea un calendario de un año para muchas unidades, se ocupan noches al
+azar y se miden las reservas, las consultas de rango libre y la búsqueda de
+las primeras N noches libres seguidas. La memoria se mide con tracemalloc.
+
+Uso:
+    python -m benchmarks.availability_bench --units 1000000 --queries 100000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import date
+
+from models.availability import Inventory, DAYS_PER_YEAR
+
+
+def timed(label, count, function):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float('inf')
+    print(f"{label:<34} {rate:>12,.0f} op/s  ({elapsed / count * 1e6:,.2f} µs/op)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--units', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=DAYS_PER_YEAR)
+    parser.add_argument('--queries', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tracemalloc.start()
+    inventory = Inventory(date(2025, 1, 1), args.days)
+    inventory.add_units(args.units)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{args.units:,} unidades x {args.days} noches: "
+          f"{current / 2 ** 20:,.1f} MiB ({inventory.memory_bytes / args.units:.0f} B/unidad)")
+
+    def random_range():
+        first = rng.randrange(args.days)
+        return inventory.date_of(first), rng.randint(1, min(14, args.days - first))
+
+    requests = [(rng.randrange(args.units),) + random_range() for _ in range(args.queries)]
+    reserved = timed("Reservas (reserve)", len(requests),
+                     lambda: sum(inventory.reserve(*request) for request in requests))
+
+    queries = [(rng.randrange(args.units),) + random_range() for _ in range(args.queries)]
+    free = timed("Rango libre (is_free)", len(queries),
+                 lambda: sum(inventory.is_free(*query) for query in queries))
+
+    searches = [(rng.randrange(args.units), rng.randint(1, 30)) for _ in range(args.queries)]
+    found = timed("Primeras N libres (first_free_unit)", len(searches),
+                  lambda: sum(inventory.first_free_unit(*search) is not None
+                              for search in searches))
+
+    print(f"\nReservas aceptadas: {reserved:,}  Rangos libres: {free:,}  "
+          f"Búsquedas con lugar: {found:,}")
+
+
+if __name__ == "__main__":
+    main()
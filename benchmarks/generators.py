@@ -0,0 +1,129 @@
+"""
+Generadores sintéticos de catálogos, paquetes y usuarios para los benchmarks.
+
+Todos son deterministas para una misma semilla, así dos corridas (por
+ejemplo, antes y después de un cambio) miden exactamente la misma carga.
+Los catálogos se generan como iteradores para poder recorrer 10^7 productos
+sin tenerlos todos en memoria cuando el caso no lo necesita.
+"""
+import random
+
+from models.complex import Complex
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+from models.package import Package
+from models.user import User
+
+
+AIRLINES = ("Aerolíneas Argentinas", "LATAM", "Flybondi", "JetSMART")
+
+
+def iter_products(count, seed=1, complex_size=4):
+    """
+    Genera productos sueltos con la mezcla del escenario de main.py.
+
+    De cada 10 productos: 4 vuelos, 3 hoteles, 2 casas y 1 complejo.
+
+    Args:
+        count (int): Cantidad de productos
+        seed (int): Semilla del generador
+        complex_size (int): Casas por complejo
+
+    Yields:
+        Product: Producto generado
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        kind = i % 10
+        if kind < 4:
+            day = rng.randint(1, 28)
+            return_date = f"2025-04-{day:02d}" if rng.random() < 0.6 else None
+            yield Flight(f"2025-03-{day:02d}", return_date, AIRLINES[i % len(AIRLINES)],
+                         rng.randint(40, 400) * 1000)
+        elif kind < 7:
+            yield Hotel(f"Calle {i % 5000} {i}", f"Hotel {i % 800}", rng.randint(1, 5))
+        elif kind < 9:
+            yield House(f"Calle {i % 5000} {i}", rng.randint(1, 6))
+        else:
+            yield make_complex(complex_size, seed=rng.randrange(1 << 30), name=f"Barrio {i}")
+
+
+def make_catalog(count, seed=1, complex_size=4):
+    """
+    Catálogo materializado en una lista.
+
+    Args:
+        count (int): Cantidad de productos
+        seed (int): Semilla del generador
+        complex_size (int): Casas por complejo
+
+    Returns:
+        list: Productos generados
+    """
+    return list(iter_products(count, seed, complex_size))
+
+
+def make_complex(houses, seed=1, name="Complejo"):
+    """
+    Complejo con muchas casas de tamaños variados.
+
+    Args:
+        houses (int): Cantidad de casas
+        seed (int): Semilla del generador
+        name (str): Dirección del complejo
+
+    Returns:
+        Complex: Complejo generado
+    """
+    rng = random.Random(seed)
+    return Complex(name, [House(f"{name} - Casa {i}", rng.randint(1, 6)) for i in range(houses)])
+
+
+def make_deep_package(depth, fanout=3, shared=False, seed=1):
+    """
+    Paquete anidado `depth` niveles.
+
+    Cada nivel contiene `fanout` productos sueltos y el paquete del nivel
+    anterior. Con `shared=True` cada nivel incluye dos veces el mismo
+    sub-paquete, así el árbol expandido crece como 2^depth aunque haya solo
+    `depth` paquetes distintos.
+
+    Args:
+        depth (int): Niveles de anidamiento
+        fanout (int): Productos sueltos por nivel
+        shared (bool): Reutilizar el sub-paquete dos veces por nivel
+        seed (int): Semilla del generador
+
+    Returns:
+        Package: Paquete raíz
+    """
+    leaves = iter_products(depth * fanout, seed)
+    package = None
+    for level in range(depth):
+        current = Package(f"Nivel {level}", f"Paquete de nivel {level}")
+        for _ in range(fanout):
+            current.add_product(next(leaves))
+        if package is not None:
+            current.add_product(package)
+            if shared:
+                current.add_product(package)
+        package = current
+    return package
+
+
+def make_users(count, seed=1, min_budget=100000, max_budget=5000000):
+    """
+    Usuarios con presupuestos aleatorios y sin destino de eventos.
+
+    Args:
+        count (int): Cantidad de usuarios
+        seed (int): Semilla del generador
+        min_budget (int): Presupuesto mínimo
+        max_budget (int): Presupuesto máximo
+
+    Returns:
+        list: Usuarios generados
+    """
+    rng = random.Random(seed)
+    return [User(f"Usuario {i}", rng.randint(min_budget, max_budget)) for i in range(count)]
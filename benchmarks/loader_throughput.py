@@ -0,0 +1,103 @@
+"""
+Velocidad de carga del catálogo en registros por segundo.
+
+Genera un archivo sintético (JSONL o CSV) con varios millones de registros,
+lo carga en lotes con CatalogLoader y reporta registros por segundo, errores
+y memoria máxima del proceso.
+
+Uso:
+    python -m benchmarks.loader_throughput --records 2000000 --format jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+
+from services.catalog_loader import CatalogLoader
+
+
+CSV_FIELDS = ['type', 'departure_date', 'return_date', 'airline', 'price',
+              'address', 'name', 'stars', 'rooms', 'houses', 'products', 'budget']
+
+
+def synthetic_record(i, rng):
+    """Registro sintético; uno de cada mil es inválido a propósito."""
+    kind = i % 7
+    if i % 1000 == 999:
+        return {'type': 'hotel', 'address': f"Calle {i}", 'stars': 3}  # falta name
+    if kind in (0, 1):
+        return {'type': 'flight', 'departure_date': "2025-03-01",
+                'return_date': "2025-03-10" if kind else None,
+                'airline': rng.choice(["LATAM", "Flybondi", "Aerolíneas Argentinas"]),
+                'price': rng.randint(50, 400) * 1000}
+    if kind in (2, 3):
+        return {'type': 'hotel', 'address': f"Calle {i % 5000}", 'name': f"Hotel {i % 800}",
+                'stars': rng.randint(1, 5)}
+    if kind == 4:
+        return {'type': 'house', 'address': f"Calle {i % 5000}", 'rooms': rng.randint(1, 6)}
+    if kind == 5:
+        return {'type': 'complex', 'address': f"Barrio {i % 300}",
+                'houses': [{'address': "A", 'rooms': 2}, {'address': "B", 'rooms': 3}]}
+    return {'type': 'package', 'name': f"Paquete {i}", 'products': [
+        {'type': 'flight', 'departure_date': "2025-03-01", 'airline': "LATAM", 'price': 90000},
+        {'type': 'house', 'address': "Calle 1", 'rooms': 2},
+    ]}
+
+
+def write_file(path, records, fmt, seed):
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        if fmt == 'jsonl':
+            for i in range(records):
+                file.write(json.dumps(synthetic_record(i, rng)) + "\n")
+            return
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for i in range(records):
+            record = synthetic_record(i, rng)
+            for field in ('houses', 'products'):
+                if field in record:
+                    record[field] = json.dumps(record[field])
+            writer.writerow(record)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=2000000)
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"catalogo.{args.format}")
+        start = time.perf_counter()
+        write_file(path, args.records, args.format, args.seed)
+        print(f"Archivo generado en {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(path) / 2**20:.0f} MiB)")
+
+        loader = CatalogLoader()
+        chunks = []
+
+        def consumer(chunk):
+            chunks.append(len(chunk))
+
+        start = time.perf_counter()
+        loaded = loader.load_into(path, consumer, args.chunk_size)
+        elapsed = time.perf_counter() - start
+
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Registros cargados: {loaded:,}  Errores: {loader.error_count:,}  Lotes: {len(chunks):,}")
+    print(f"Tiempo: {elapsed:.2f}s  ({args.records / elapsed:,.0f} registros/s)")
+    print(f"Memoria máxima del proceso: {peak_mib:.0f} MiB")
+    if loader.errors:
+        first = loader.errors[0]
+        print(f"Primer error (línea {first.line}): {first.message}")
+
+
+if __name__ == "__main__":
+    main()
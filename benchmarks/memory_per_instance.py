@@ -0,0 +1,95 @@
+"""
+Memoria por instancia de los productos, antes y después de `__slots__`.
+
+"Antes" usa réplicas de las clases originales (atributos en `__dict__` y
+una copia de cada texto por instancia, como cuando se leen de un archivo);
+"después" usa las clases actuales de models/. Se mide con tracemalloc.
+
+Uso:
+    python -m benchmarks.memory_per_instance --count 100000
+"""
+import argparse
+import tracemalloc
+
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+
+
+class _LegacyFlight:
+    def __init__(self, departure_date, return_date, airline, price):
+        self.departure_date = departure_date
+        self.return_date = return_date
+        self.airline = airline
+        self.price = price
+
+
+class _LegacyHotel:
+    def __init__(self, address, name, stars):
+        self.address = address
+        self.name = name
+        self.stars = stars
+
+
+class _LegacyHouse:
+    def __init__(self, address, rooms):
+        self.address = address
+        self.rooms = rooms
+
+
+def _fresh(text):
+    """Crea una copia nueva del texto, como si se hubiera leído de un archivo."""
+    return "".join(list(text))
+
+
+def _flight_args(i):
+    day = i % 28 + 1
+    return (_fresh(f"2025-01-{day:02d}"), _fresh(f"2025-02-{day:02d}"),
+            _fresh(("Aerolíneas Argentinas", "LATAM", "Flybondi")[i % 3]), 100000 + i % 50)
+
+
+def _hotel_args(i):
+    return (_fresh(f"Av. Corrientes {i % 500}"), _fresh(f"Hotel {i % 200}"), i % 5 + 1)
+
+
+def _house_args(i):
+    return (_fresh(f"Calle Florida {i % 500}"), i % 6 + 1)
+
+
+CASES = [
+    ('Flight', _LegacyFlight, Flight, _flight_args),
+    ('Hotel', _LegacyHotel, Hotel, _hotel_args),
+    ('House', _LegacyHouse, House, _house_args),
+]
+
+
+def bytes_per_instance(cls, make_args, count):
+    """
+    Mide los bytes asignados por instancia al crear `count` objetos.
+    """
+    arguments = [make_args(i) for i in range(count)]
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # Los textos se copian dentro de la medición para contar su costo
+    instances = [cls(*[_fresh(value) if type(value) is str else value for value in args])
+                 for args in arguments]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(instances) == count
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'Clase':<8} {'Antes (B)':>10} {'Después (B)':>12} {'Ahorro':>8}")
+    for name, legacy, current, make_args in CASES:
+        old = bytes_per_instance(legacy, make_args, args.count)
+        new = bytes_per_instance(current, make_args, args.count)
+        print(f"{name:<8} {old:>10.1f} {new:>12.1f} {1 - new / old:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Aritmética de dinero: float vs Decimal vs Money vs centavos en int64.
+
+Cada variante aplica un descuento a una lista de precios, redondea al
+centavo (salvo float, que no redondea) y descuenta cada precio de un
+presupuesto, como hacen los complejos y las compras. Los precios se
+convierten a la representación de cada variante antes de medir, así se
+compara solo la aritmética. Se informa el tiempo de cada una y cuánto se
+desvía el presupuesto final del resultado exacto (Decimal).
+
+Las dos filas de Money miden cosas distintas:
+- "Money (por operación)" usa el tipo tal cual: un Money nuevo en cada
+  descuento y cada resta. No es más rápido que Decimal (alrededor de 0.7x
+  a 1.0x): el costo es crear un objeto Python por paso.
+- "Centavos int + 1 Money" no opera con Money: suma enteros con
+  `discounted_cents` y crea un solo Money con el total. Es lo que hacen los
+  caminos calientes (paquetes, planes, complejos) y es donde está la
+  ganancia frente a Decimal; no es una medida del tipo Money.
+
+Uso:
+    python -m benchmarks.money_bench --prices 200000 --discount 0.15
+"""
+import argparse
+import random
+import time
+from decimal import Decimal, ROUND_HALF_UP
+
+from models.money import Money, BASIS_POINTS, discounted_cents, to_basis_points
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se omite la variante vectorizada
+    np = None
+
+
+def with_float(prices, discount, budget):
+    factor = 1 - discount
+    for price in prices:
+        budget -= price * factor
+    return budget
+
+
+def with_decimal(prices, discount, budget):
+    factor = 1 - Decimal(repr(discount))
+    cent = Decimal('0.01')
+    budget = Decimal(budget)
+    for price in prices:
+        budget -= (price * factor).quantize(cent, rounding=ROUND_HALF_UP)
+    return budget
+
+
+def with_money(prices, discount, budget):
+    """Centavos en el camino caliente y un solo Money al final."""
+    basis_points = to_basis_points(discount)
+    total = 0
+    for price in prices:
+        total += discounted_cents(price.cents, basis_points)
+    return Money.of(budget) - Money(total)
+
+
+def with_money_objects(prices, discount, budget):
+    """Un Money nuevo por cada descuento y cada resta."""
+    basis_points = to_basis_points(discount)
+    budget = Money.of(budget)
+    for price in prices:
+        budget -= price.apply_discount(basis_points)
+    return budget
+
+
+def with_cents(cents, discount, budget):
+    """Centavos enteros de Python, sin objetos intermedios."""
+    keep = BASIS_POINTS - to_basis_points(discount)
+    half = BASIS_POINTS // 2
+    budget = budget * 100
+    for price in cents:
+        budget -= (price * keep + half) // BASIS_POINTS
+    return budget
+
+
+def with_int64(cents, discount, budget):
+    """Mismo cálculo que `with_cents`, vectorizado sobre una columna int64."""
+    keep = BASIS_POINTS - to_basis_points(discount)
+    discounted = (cents * keep + BASIS_POINTS // 2) // BASIS_POINTS
+    return budget * 100 - int(discounted.sum())
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--prices', type=int, default=200000)
+    parser.add_argument('--discount', type=float, default=0.15)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cents = [rng.randint(1000, 5000000) for _ in range(args.prices)]
+    # Precios con centavos, como los recibe el sistema
+    prices = [c / 100 for c in cents]
+    budget = sum(cents) // 100 + 1
+
+    decimals = [Decimal(c).scaleb(-2) for c in cents]
+    exact, decimal_time = timed(with_decimal, decimals, args.discount, budget)
+    exact_cents = int(exact * 100)
+    rows = [("Decimal", decimal_time, exact_cents)]
+
+    result, elapsed = timed(with_float, prices, args.discount, budget)
+    rows.append(("float", elapsed, result * 100))
+    money = [Money(c) for c in cents]
+    result, elapsed = timed(with_money, money, args.discount, budget)
+    rows.append(("Centavos int + 1 Money", elapsed, result.cents))
+    result, elapsed = timed(with_money_objects, money, args.discount, budget)
+    rows.append(("Money (por operación)", elapsed, result.cents))
+    result, elapsed = timed(with_cents, cents, args.discount, budget)
+    rows.append(("int (centavos)", elapsed, result))
+    if np is not None:
+        column = np.array(cents, dtype=np.int64)
+        result, elapsed = timed(with_int64, column, args.discount, budget)
+        rows.append(("int64 NumPy", elapsed, result))
+
+    print(f"{args.prices:,} precios, descuento {args.discount:.0%}")
+    print(f"{'Variante':<24} {'Tiempo ms':>10} {'ns/precio':>10} {'vs Decimal':>11} "
+          f"{'Desvío (centavos)':>18}")
+    for name, elapsed, result_cents in rows:
+        print(f"{name:<24} {elapsed * 1000:>10,.1f} {elapsed / args.prices * 1e9:>10,.0f} "
+              f"{decimal_time / elapsed:>10.1f}x {result_cents - exact_cents:>18,.4f}")
+
+
+if __name__ == "__main__":
+    main()
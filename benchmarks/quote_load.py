@@ -0,0 +1,179 @@
+"""
+Prueba de carga del servidor de cotizaciones (services/quote_server.py).
+
+Abre varias conexiones persistentes y envía cotizaciones y consultas de
+asequibilidad; una parte de los pedidos se repite sobre pocos productos
+(pedidos "calientes") para ejercitar la coalescencia. Informa pedidos por
+segundo y latencias p50/p99.
+
+Sin `--url` levanta el servidor en el mismo proceso con un catálogo
+generado y compara la configuración con micro-lotes contra una sin lotes
+(que casi no coalesce). Con `--url` mide un servidor ya iniciado, que debe
+tener al menos `--products` productos y los usuarios "Usuario 0".."Usuario N".
+
+Uso:
+    python -m benchmarks.quote_load --requests 20000 --concurrency 64
+    python -m benchmarks.quote_load --url 127.0.0.1:8080 --products 1000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from benchmarks.generators import make_catalog, make_users
+from models.accommodation import Accommodation
+from models.package import Package
+from services.quote_server import QuoteServer
+
+
+USERS = 100
+
+
+def make_requests(products, count, hot_fraction, afford_fraction, seed):
+    """
+    Cuerpos de los pedidos, como tuplas (ruta, JSON codificado).
+
+    Args:
+        products (list | int): Catálogo del servidor, o su tamaño si es remoto
+        count (int): Cantidad de pedidos
+        hot_fraction (float): Fracción de pedidos sobre los 10 productos calientes
+        afford_fraction (float): Fracción de consultas de asequibilidad
+        seed (int): Semilla del generador
+
+    Returns:
+        list: Pedidos
+    """
+    rng = random.Random(seed)
+    size = products if isinstance(products, int) else len(products)
+    hot = [rng.randrange(size) for _ in range(10)]
+    requests = []
+    for _ in range(count):
+        index = rng.choice(hot) if rng.random() < hot_fraction else rng.randrange(size)
+        body = {'product': index, 'nights': rng.randint(1, 3)}
+        if not isinstance(products, int):
+            product = products[index]
+            if not isinstance(product, (Accommodation, Package)):
+                del body['nights']
+        if rng.random() < afford_fraction:
+            body['user'] = f"Usuario {rng.randrange(USERS)}"
+            requests.append(('/afford', json.dumps(body).encode()))
+        else:
+            requests.append(('/quote', json.dumps(body).encode()))
+    return requests
+
+
+async def client(host, port, requests, cursor, latencies, errors):
+    """Conexión persistente que envía pedidos hasta agotar la lista."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while cursor[0] < len(requests):
+            path, body = requests[cursor[0]]
+            cursor[0] += 1
+            start = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+                         f"Content-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+            await writer.drain()
+            status = (await reader.readline()).split(b' ', 2)[1]
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if status != b'200':
+                errors[0] += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, requests, concurrency):
+    """
+    Ejecuta la carga contra un servidor.
+
+    Returns:
+        dict: Métricas (pedidos, errores, segundos, pedidos/s, p50/p99/máx en ms)
+    """
+    cursor = [0]
+    errors = [0]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, cursor, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'elapsed_s': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed else float('inf'),
+        'p50_ms': _percentile(latencies, 0.50) * 1000,
+        'p99_ms': _percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0,
+    }
+
+
+async def run_local(args, batch_window, max_batch):
+    """Levanta el servidor en este proceso y lo mide."""
+    products = make_catalog(args.products, seed=args.seed)
+    users = make_users(USERS, seed=args.seed)
+    requests = make_requests(products, args.requests, args.hot, args.afford, args.seed)
+    async with QuoteServer(products, users, batch_window=batch_window,
+                           max_batch=max_batch) as server:
+        metrics = await run_load(server.host, server.port, requests, args.concurrency)
+        metrics['stats'] = server.stats()
+    return metrics
+
+
+def report(title, metrics):
+    print(f"{title}")
+    print(f"  {metrics['requests']:,} pedidos en {metrics['elapsed_s']:.2f}s: "
+          f"{metrics['requests_per_s']:,.0f} pedidos/s ({metrics['errors']:,} errores)")
+    print(f"  Latencia p50 {metrics['p50_ms']:.2f} ms  p99 {metrics['p99_ms']:.2f} ms  "
+          f"máx {metrics['max_ms']:.2f} ms")
+    stats = metrics.get('stats')
+    if stats is not None:
+        print(f"  Cálculos {stats.computations:,}  coalescidos {stats.coalesced:,}  "
+              f"lotes {stats.batches:,} (media {stats.batched / max(stats.batches, 1):.1f})")
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', help="host:puerto de un servidor ya iniciado")
+    parser.add_argument('--products', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=64, help="Conexiones simultáneas")
+    parser.add_argument('--hot', type=float, default=0.5,
+                        help="Fracción de pedidos sobre productos calientes")
+    parser.add_argument('--afford', type=float, default=0.2,
+                        help="Fracción de consultas de asequibilidad")
+    parser.add_argument('--batch-window', type=float, default=0.001)
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.url:
+        host, _, port = args.url.rpartition(':')
+        requests = make_requests(args.products, args.requests, args.hot, args.afford, args.seed)
+        report(f"Servidor {args.url}",
+               asyncio.run(run_load(host, int(port), requests, args.concurrency)))
+        return
+
+    report(f"Con micro-lotes (ventana {args.batch_window * 1000:g} ms, hasta {args.max_batch})",
+           asyncio.run(run_local(args, args.batch_window, args.max_batch)))
+    report("Sin micro-lotes", asyncio.run(run_local(args, 0, 1)))
+
+
+if __name__ == "__main__":
+    main()
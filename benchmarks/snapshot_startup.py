@@ -0,0 +1,62 @@
+"""
+Tiempo de arranque: snapshot con mmap contra reconstruir el catálogo.
+
+Genera un catálogo sintético, lo guarda como JSONL (datos fuente) y como
+snapshot binario. Compara cargar todo el catálogo desde el JSONL con abrir
+el snapshot y usar solo una parte de los productos.
+
+Uso:
+    python -m benchmarks.snapshot_startup --products 500000 --touch 1000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.loader_throughput import write_file
+from services.catalog_loader import CatalogLoader
+from services.snapshot import Snapshot, write_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, default=500000)
+    parser.add_argument('--touch', type=int, default=1000, help="Productos usados tras abrir")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, "catalogo.jsonl")
+        snapshot_path = os.path.join(directory, "catalogo.snap")
+        write_file(source, args.products, 'jsonl', args.seed)
+
+        start = time.perf_counter()
+        products = list(CatalogLoader().load(source))
+        construction = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_snapshot(snapshot_path, products)
+        written = time.perf_counter() - start
+        size_mib = os.path.getsize(snapshot_path) / 2**20
+        del products
+
+        rng = random.Random(args.seed)
+        start = time.perf_counter()
+        with Snapshot(snapshot_path) as snapshot:
+            opened = time.perf_counter() - start
+            for _ in range(args.touch):
+                str(snapshot.products[rng.randrange(len(snapshot.products))])
+            touched = time.perf_counter() - start
+            materialized = snapshot.materialized_count
+
+    print(f"Catálogo: {args.products:,} productos  Snapshot: {size_mib:.1f} MiB "
+          f"(escrito en {written:.2f}s)")
+    print(f"Construcción desde JSONL: {construction * 1000:,.1f} ms")
+    print(f"Snapshot abierto:         {opened * 1000:,.3f} ms")
+    print(f"Abierto + {args.touch:,} accesos:  {touched * 1000:,.1f} ms "
+          f"({materialized:,} objetos construidos)")
+
+
+if __name__ == "__main__":
+    main()
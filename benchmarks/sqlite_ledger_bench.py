@@ -0,0 +1,71 @@
+"""
+Compras confirmadas por segundo en SQLite, con y sin group commit.
+
+Varios hilos compran con usuarios registrados en un SQLiteLedger. Se mide
+con un commit por compra y con commits agrupados, y se verifica que al
+restaurar los usuarios el presupuesto y el historial coinciden.
+
+Uso:
+    python -m benchmarks.sqlite_ledger_bench --purchases 20000 --threads 4
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from models.flight import Flight
+from models.user import User
+from services.sqlite_ledger import SQLiteLedger
+
+
+def run(path, purchases, threads, group_commit_size):
+    """Ejecuta las compras y retorna compras confirmadas por segundo."""
+    ledger = SQLiteLedger(path, group_commit_size=group_commit_size)
+    flight = Flight("2025-01-15", None, "LATAM", 100)
+    users = [ledger.register_user(User(f"Usuario {i}", 10 ** 9)) for i in range(threads)]
+
+    def worker(user):
+        for _ in range(purchases // threads):
+            user.purchase_product(flight)
+
+    workers = [threading.Thread(target=worker, args=(user,)) for user in users]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    ledger.flush()
+    elapsed = time.perf_counter() - start
+    ledger.close()
+
+    restored = SQLiteLedger(path)
+    for user in users:
+        copy = restored.load_user(user.name)
+        assert copy.budget == user.budget, f"Presupuesto distinto para {user.name}"
+        assert len(copy.purchase_history) == len(user.purchase_history)
+    restored.close()
+
+    committed = (purchases // threads) * threads
+    return committed / elapsed if elapsed else float('inf')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--purchases', type=int, default=20000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--group-size', type=int, default=256)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        single = run(os.path.join(directory, "uno.db"), args.purchases, args.threads, 1)
+        grouped = run(os.path.join(directory, "grupo.db"), args.purchases, args.threads,
+                      args.group_size)
+
+    print(f"Commit por compra:          {single:>10,.0f} compras/s")
+    print(f"Group commit ({args.group_size} compras): {grouped:>10,.0f} compras/s")
+    print("✓ Presupuestos e historiales restaurados correctamente")
+
+
+if __name__ == "__main__":
+    main()
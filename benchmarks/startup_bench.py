@@ -0,0 +1,93 @@
+"""
+Tiempo de arranque en frío de los imports y de la línea de comandos.
+
+Ejecuta cada comando en un proceso nuevo varias veces y reporta la mediana
+y el mínimo, descontando el arranque del intérprete solo (`python -c pass`).
+Con `--max-ms` termina con código 1 si algún comando supera ese límite,
+para usarlo como control de regresiones del arranque.
+
+Uso:
+    python -m benchmarks.startup_bench --runs 20
+    python -m benchmarks.startup_bench --max-ms 150
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import make_catalog
+from services.snapshot import write_snapshot
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def commands(directory, products):
+    """Comandos medidos, como tuplas (nombre, argumentos de python)."""
+    source = os.path.join(directory, "catalogo.jsonl")
+    snapshot = os.path.join(directory, "catalogo.snap")
+    catalog = make_catalog(products)
+    write_snapshot(snapshot, catalog)
+    with open(source, 'w', encoding='utf-8') as file:
+        # Un catálogo chico: se mide el arranque, no la carga
+        file.write(json.dumps({'type': 'house', 'address': "Calle 1", 'rooms': 2}) + "\n")
+        file.write(json.dumps({'type': 'user', 'name': "Ana", 'budget': 500000}) + "\n")
+
+    cli = os.path.join(ROOT, "cli.py")
+    return [
+        ("import models", ['-c', 'import models']),
+        ("from models import User", ['-c', 'from models import User']),
+        ("cli.py --help", [cli, '--help']),
+        ("cli.py quote (snapshot)", [cli, 'quote', '--catalog', snapshot,
+                                     '--product', str(products // 2), '--nights', '2']),
+        ("cli.py quote (JSONL)", [cli, 'quote', '--catalog', source,
+                                  '--product', '0', '--nights', '2']),
+        ("cli.py affordable (JSONL)", [cli, 'affordable', '--catalog', source, '--user', "Ana"]),
+    ]
+
+
+def measure(arguments, runs):
+    """Duraciones en ms de `runs` ejecuciones de un comando."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--products', type=int, default=100000,
+                        help="Productos del snapshot")
+    parser.add_argument('--max-ms', type=float,
+                        help="Límite de la mediana por comando, sin el intérprete")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        measured = commands(directory, args.products)
+        baseline = statistics.median(measure(['-c', 'pass'], args.runs))
+        print(f"Intérprete solo (python -c pass): {baseline:.1f} ms\n")
+        print(f"{'Comando':<28} {'mediana':>10} {'mínimo':>10}")
+
+        failed = []
+        for name, arguments in measured:
+            times = measure(arguments, args.runs)
+            median = statistics.median(times) - baseline
+            print(f"{name:<28} {median:>7.1f} ms {min(times) - baseline:>7.1f} ms")
+            if args.max_ms is not None and median > args.max_ms:
+                failed.append(name)
+
+    if failed:
+        print(f"\nSuperan {args.max_ms:g} ms: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Prueba de estrés de compras concurrentes.
+
+Varios hilos compran sobre los mismos usuarios y se verifica que nunca se
+gaste más que el presupuesto. Reporta compras por segundo.
+
+Uso:
+    python -m benchmarks.stress_purchases --threads 8 --users 4 --purchases 20000
+"""
+import argparse
+import threading
+import time
+
+from models.flight import Flight
+from models.hotel import Hotel
+from models.user import User
+
+
+def run(threads, users, purchases, batch):
+    """
+    Ejecuta la prueba y retorna las métricas obtenidas.
+
+    Cada usuario recibe presupuesto para exactamente la mitad de las compras
+    que se intentan sobre él, de modo que la mitad deben fallar.
+    """
+    flight = Flight("2025-01-15", "2025-01-20", "Aerolíneas Argentinas", 100)
+    hotel = Hotel("Av. Corrientes 1234", "Hotel Plaza", 1)
+    cart = [flight, (hotel, {'nights': 2})]
+    cart_price = flight.calculate_price() + hotel.calculate_price(2)
+    price = cart_price if batch else flight.calculate_price()
+
+    attempts_per_user = purchases // users
+    budget = price * (attempts_per_user // 2)
+    clients = [User(f"Usuario {i}", budget) for i in range(users)]
+
+    def worker(index):
+        for attempt in range(index, purchases, threads):
+            user = clients[attempt % users]
+            if batch:
+                user.purchase_many(cart)
+            else:
+                user.purchase_product(flight)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    for user in clients:
+        spent = user.purchase_history.view().total_spent
+        assert user.budget >= 0, f"{user.name} gastó de más: {user.budget}"
+        assert spent == user.initial_budget - user.budget, f"Historial inconsistente en {user.name}"
+
+    items_per_purchase = len(cart) if batch else 1
+    committed = sum(len(user.purchase_history) for user in clients) // items_per_purchase
+    assert committed == users * (attempts_per_user // 2), "Cantidad de compras inesperada"
+    return {
+        'threads': threads,
+        'users': users,
+        'attempts': purchases,
+        'committed': committed,
+        'elapsed_s': elapsed,
+        'purchases_per_s': purchases / elapsed if elapsed else float('inf'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--users', type=int, default=4)
+    parser.add_argument('--purchases', type=int, default=20000)
+    parser.add_argument('--batch', action='store_true', help="Usar purchase_many con un carrito")
+    args = parser.parse_args()
+
+    result = run(args.threads, args.users, args.purchases, args.batch)
+    print(f"Hilos: {result['threads']}  Usuarios: {result['users']}")
+    print(f"Intentos: {result['attempts']}  Compras confirmadas: {result['committed']}")
+    print(f"Tiempo: {result['elapsed_s']:.3f}s  ({result['purchases_per_s']:,.0f} compras/s)")
+    print("✓ Sin gastos por encima del presupuesto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Suite de benchmarks del escenario de main.py llevado a tamaños de producción.
+
+Mide precios (productos sueltos, cotización por lotes, paquetes profundos y
+complejos grandes), compras, listado de productos accesibles y ranking de
+usuarios sobre catálogos sintéticos de 10^3 a 10^7 productos. Los resultados
+se pueden guardar en JSON y comparar contra una corrida anterior.
+
+Uso:
+    python -m benchmarks.suite --scales 1000 100000 --output actual.json
+    python -m benchmarks.suite --baseline base.json --threshold 0.1
+    python -m benchmarks.suite --list
+    python -m benchmarks.suite --cases purchases --instrument metricas.json
+
+Con --baseline el proceso termina con código 1 si algún caso es más lento
+que la base en más del umbral indicado. Los catálogos de 10^7 productos
+necesitan varios GB de memoria. Con --instrument se registran llamadas y
+latencias por clase (services.instrumentation); los tiempos de esa corrida
+incluyen el costo de la instrumentación y no conviene compararlos.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from benchmarks.generators import make_catalog, make_complex, make_deep_package, make_users
+from models.accommodation import Accommodation
+from models.batch_pricing import PriceCatalog
+from models.catalog_index import CatalogIndex
+from models.complex import Complex
+from models import quote_cache
+from models.package import Package
+from services import instrumentation
+from services.aggregates import AgencyStats, RANK_BY_SPENT
+
+
+RESULTS_VERSION = 1
+
+Case = namedtuple('Case', ['name', 'scaled', 'build', 'description'])
+Workload = namedtuple('Workload', ['setup', 'run', 'ops', 'params'])
+
+
+def _price_products(catalog, args):
+    def run(_):
+        for product in catalog:
+            if isinstance(product, Accommodation):
+                product.calculate_price(3)
+            else:
+                product.calculate_price()
+    return Workload(None, run, len(catalog), {})
+
+
+def _batch_pricing(catalog, args):
+    def run(_):
+        PriceCatalog(catalog).prices_for(3)
+    return Workload(None, run, len(catalog), {})
+
+
+def _package_cold(catalog, args):
+    package = make_deep_package(args.depth, shared=True, seed=args.seed)
+    deepest = _deepest_package(package)
+    calls = 100
+
+    def run(_):
+        for nights in range(1, calls + 1):
+            # Invalidar el más profundo limpia la caché de todos sus ancestros
+            deepest.invalidate_price_cache()
+            package.calculate_price(nights=nights)
+    return Workload(None, run, calls, {'depth': args.depth, 'shared': True})
+
+
+def _deepest_package(package):
+    while True:
+        children = [product for product in package.products if isinstance(product, Package)]
+        if not children:
+            return package
+        package = children[0]
+
+
+def _package_compiled(catalog, args):
+    package = make_deep_package(args.depth, shared=True, seed=args.seed)
+    calls = 1000
+
+    def run(_):
+        plan = package.compile()
+        for nights in range(1, calls + 1):
+            plan.evaluate(nights)
+    return Workload(package.invalidate_price_cache, run, calls, {'depth': args.depth, 'shared': True})
+
+
+def _package_quotes(catalog, args):
+    packages = [make_deep_package(args.depth // 10 + 1, seed=args.seed + i) for i in range(20)]
+    users = make_users(100, seed=args.seed)
+    calls = 10000
+
+    def run(_):
+        for i in range(calls):
+            users[i % len(users)].can_afford(packages[i % len(packages)], nights=i % 7 + 1)
+    return Workload(quote_cache.invalidate, run, calls,
+                    {'packages': len(packages), 'depth': args.depth // 10 + 1})
+
+
+def _large_complex(catalog, args):
+    complex_ = make_complex(args.complex_houses, seed=args.seed)
+    calls = 1000
+    step = max(1, args.complex_houses // calls)
+
+    def run(_):
+        for i in range(calls):
+            complex_.calculate_price(i % 30 + 1, (i * step) % args.complex_houses + 1)
+    return Workload(None, run, calls, {'houses': args.complex_houses})
+
+
+def _purchases(catalog, args):
+    def setup():
+        return make_users(max(1, len(catalog) // 100), seed=args.seed)
+
+    def run(users):
+        count = len(users)
+        for i, product in enumerate(catalog):
+            user = users[i % count]
+            if isinstance(product, Complex):
+                user.purchase_product(product, nights=2, units_to_rent=2)
+            elif isinstance(product, Accommodation):
+                user.purchase_product(product, nights=2)
+            else:
+                user.purchase_product(product)
+    return Workload(setup, run, len(catalog), {'users': max(1, len(catalog) // 100)})
+
+
+def _affordability_index(catalog, args):
+    def run(_):
+        CatalogIndex(catalog)
+    return Workload(None, run, len(catalog), {})
+
+
+def _affordability_query(catalog, args):
+    index = CatalogIndex(catalog)
+    users = make_users(20, seed=args.seed, min_budget=50000, max_budget=300000)
+
+    def run(_):
+        for user in users:
+            user.get_affordable_products(index)
+    return Workload(None, run, len(users), {'users': len(users)})
+
+
+def _ranking(catalog, args):
+    count = max(1, len(catalog) // 10)
+    users = make_users(count, seed=args.seed)
+    for i, product in enumerate(catalog[:count * 3]):
+        if not isinstance(product, Accommodation):
+            users[i % count].purchase_product(product)
+
+    def run(_):
+        sorted(users, key=lambda u: u.get_purchase_count(), reverse=True)
+        sorted(users, key=lambda u: u.get_total_spent(), reverse=True)
+    return Workload(None, run, count, {'users': count})
+
+
+def _ranking_top_k(catalog, args):
+    count = max(1, len(catalog) // 10)
+    stats = AgencyStats(make_users(count, seed=args.seed))
+    users = [ranked.user for ranked in stats.top_k(count)]
+    for i, product in enumerate(catalog[:count * 3]):
+        if not isinstance(product, Accommodation):
+            users[i % count].purchase_product(product)
+
+    def run(_):
+        stats.top_k(10)
+        stats.top_k(10, by=RANK_BY_SPENT)
+    return Workload(None, run, count, {'users': count, 'k': 10})
+
+
+CASES = [
+    Case('pricing.products', True, _price_products, "calculate_price de cada producto"),
+    Case('pricing.batch', True, _batch_pricing, "PriceCatalog de todo el catálogo"),
+    Case('pricing.package_cold', False, _package_cold, "paquete profundo sin caché"),
+    Case('pricing.package_compiled', False, _package_compiled, "plan compilado de un paquete profundo"),
+    Case('pricing.package_quotes', False, _package_quotes, "can_afford de paquetes entre usuarios"),
+    Case('pricing.large_complex', False, _large_complex, "cotizaciones de un complejo grande"),
+    Case('purchases.single', True, _purchases, "purchase_product repartido entre usuarios"),
+    Case('affordability.index', True, _affordability_index, "construcción del CatalogIndex"),
+    Case('affordability.query', True, _affordability_query, "get_affordable_products para 20 usuarios"),
+    Case('ranking.users', True, _ranking, "ranking por compras y por gasto"),
+    Case('ranking.top_k', True, _ranking_top_k, "top 10 con AgencyStats (heap)"),
+]
+
+
+def measure(workload, repeat):
+    """
+    Ejecuta un caso varias veces y retorna los tiempos de cada corrida.
+
+    Args:
+        workload (Workload): Caso preparado
+        repeat (int): Cantidad de corridas
+
+    Returns:
+        list: Segundos de cada corrida
+    """
+    timings = []
+    for _ in range(repeat):
+        state = workload.setup() if workload.setup is not None else None
+        gc.collect()
+        start = time.perf_counter()
+        workload.run(state)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_suite(args):
+    """
+    Corre los casos seleccionados.
+
+    Args:
+        args (Namespace): Opciones de la línea de comandos
+
+    Returns:
+        list: Un diccionario de resultados por caso y escala
+    """
+    cases = [case for case in CASES if _selected(case.name, args.cases)]
+    results = []
+
+    for case in [case for case in cases if not case.scaled]:
+        results.append(_run_case(case, None, [], args))
+
+    for scale in args.scales:
+        scaled = [case for case in cases if case.scaled]
+        if not scaled:
+            break
+        catalog = make_catalog(scale, seed=args.seed)
+        for case in scaled:
+            results.append(_run_case(case, scale, catalog, args))
+        del catalog
+    return results
+
+
+def _run_case(case, scale, catalog, args):
+    workload = case.build(catalog, args)
+    timings = measure(workload, args.repeat)
+    best = min(timings)
+    result = {
+        'case': case.name,
+        'scale': scale,
+        'params': workload.params,
+        'ops': workload.ops,
+        'best_s': best,
+        'median_s': statistics.median(timings),
+        'ops_per_s': workload.ops / best if best else float('inf'),
+    }
+    label = case.name if scale is None else f"{case.name} [{scale:,}]"
+    print(f"  {label:<40} {result['ops_per_s']:>14,.0f} op/s  (mejor {best * 1000:,.1f} ms)",
+          flush=True)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """
+    Compara resultados contra una corrida base.
+
+    Args:
+        results (list): Resultados actuales
+        baseline (list): Resultados de la base
+        threshold (float): Pérdida relativa tolerada (0.1 = 10%)
+
+    Returns:
+        list: Claves (caso, escala) más lentas que la base
+    """
+    base = {(item['case'], item['scale']): item for item in baseline}
+    regressions = []
+    print(f"\n  {'Caso':<40} {'Base op/s':>14} {'Actual op/s':>14} {'Cambio':>8}")
+    for item in results:
+        key = (item['case'], item['scale'])
+        previous = base.get(key)
+        if previous is None:
+            continue
+        ratio = item['ops_per_s'] / previous['ops_per_s']
+        mark = ""
+        if ratio < 1 - threshold:
+            regressions.append(key)
+            mark = "  ✗ más lento"
+        label = item['case'] if item['scale'] is None else f"{item['case']} [{item['scale']:,}]"
+        print(f"  {label:<40} {previous['ops_per_s']:>14,.0f} {item['ops_per_s']:>14,.0f} "
+              f"{(ratio - 1) * 100:>+7.1f}%{mark}")
+    return regressions
+
+
+def _selected(name, prefixes):
+    return not prefixes or any(name.startswith(prefix) for prefix in prefixes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Tamaños de catálogo (10^3 a 10^7)")
+    parser.add_argument('--cases', nargs='+', default=[],
+                        help="Prefijos de los casos a correr (ej: pricing purchases)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--depth', type=int, default=300, help="Niveles de los paquetes anidados")
+    parser.add_argument('--complex-houses', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--baseline', help="Archivo JSON de una corrida anterior")
+    parser.add_argument('--threshold', type=float, default=0.1)
+    parser.add_argument('--list', action='store_true', help="Lista los casos y termina")
+    parser.add_argument('--instrument', metavar='JSON',
+                        help="Registra llamadas y latencias por clase y las guarda en JSON")
+    args = parser.parse_args()
+
+    if args.list:
+        for case in CASES:
+            print(f"  {case.name:<28} {case.description}")
+        return
+
+    print(f"Python {platform.python_version()} - escalas {args.scales}\n")
+    if args.instrument:
+        with instrumentation.instrumented():
+            results = run_suite(args)
+        print("\n" + instrumentation.format_text())
+        instrumentation.export_json(args.instrument)
+    else:
+        results = run_suite(args)
+
+    if args.output:
+        document = {
+            'version': RESULTS_VERSION,
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if baseline.get('version') != RESULTS_VERSION:
+            sys.exit(f"Versión de resultados incompatible en {args.baseline}")
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} caso(s) más lentos que la base")
+            sys.exit(1)
+        print("\n✓ Sin regresiones respecto de la base")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Optimizador de viajes contra enumeración por fuerza bruta.
+
+Genera catálogos sintéticos, verifica que el optimizador encuentra un viaje
+tan bueno como el de la fuerza bruta y compara los tiempos. La fuerza bruta
+se limita a catálogos chicos; el optimizador se mide también a 10^5.
+
+Uso:
+    python -m benchmarks.trip_optimizer_bench --size 100000
+"""
+import argparse
+import random
+import time
+
+from models.complex import Complex
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+from services.trip_optimizer import TripOptimizer, OBJECTIVE_NIGHTS, OBJECTIVE_STARS
+
+
+def synthetic_catalog(size, rng):
+    """Catálogo con mitad de vuelos y mitad de alojamientos variados."""
+    products = []
+    for i in range(size):
+        kind = i % 6
+        if kind < 3:
+            return_date = "2025-03-10" if rng.random() < 0.5 else None
+            products.append(Flight("2025-03-01", return_date, "LATAM", rng.randint(50, 400) * 1000))
+        elif kind == 3:
+            products.append(Hotel(f"Calle {i}", f"Hotel {i}", rng.randint(1, 5)))
+        elif kind == 4:
+            products.append(House(f"Calle {i}", rng.randint(1, 6)))
+        else:
+            products.append(Complex(f"Barrio {i}", [House("A", rng.randint(1, 6)), House("B", 2)]))
+    return products
+
+
+def brute_force(products, budget, objective, min_nights, round_trip):
+    """Prueba cada par vuelo-alojamiento y retorna la mejor clave."""
+    flights = [p for p in products if isinstance(p, Flight)]
+    accommodations = [p for p in products if not isinstance(p, Flight)]
+    best = None
+    for flight in flights:
+        if round_trip is not None and flight.is_round_trip() != round_trip:
+            continue
+        remaining = budget - flight.calculate_price()
+        for accommodation in accommodations:
+            nights = int(remaining // accommodation.calculate_price(1)) if remaining > 0 else 0
+            if nights < min_nights:
+                continue
+            stars = accommodation.stars if isinstance(accommodation, Hotel) else 0
+            total = flight.calculate_price() + accommodation.calculate_price(nights)
+            key = (nights, stars, -total) if objective == OBJECTIVE_NIGHTS else (stars, nights, -total)
+            if best is None or key > best:
+                best = key
+    return best
+
+
+def plan_key(plan, objective):
+    if plan is None:
+        return None
+    if objective == OBJECTIVE_NIGHTS:
+        return (plan.nights, plan.stars, -plan.total_price)
+    return (plan.stars, plan.nights, -plan.total_price)
+
+
+def verify(rounds, size, rng):
+    """Compara optimizador y fuerza bruta en catálogos chicos."""
+    brute_time = optimizer_time = 0.0
+    for _ in range(rounds):
+        products = synthetic_catalog(size, rng)
+        optimizer = TripOptimizer(products)
+        for objective in (OBJECTIVE_NIGHTS, OBJECTIVE_STARS):
+            budget = rng.randint(0, 1500) * 1000
+            min_nights = rng.randint(1, 4)
+            round_trip = rng.choice([None, True, False])
+
+            start = time.perf_counter()
+            expected = brute_force(products, budget, objective, min_nights, round_trip)
+            brute_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            plan = optimizer.optimize(budget, objective, min_nights, round_trip)
+            optimizer_time += time.perf_counter() - start
+
+            assert plan_key(plan, objective) == expected, (objective, budget, plan, expected)
+    return brute_time, optimizer_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000, help="Productos del catálogo grande")
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    brute_time, optimizer_time = verify(rounds=20, size=300, rng=rng)
+    print("✓ Mismos resultados que la fuerza bruta (20 catálogos de 300 productos)")
+    print(f"  Fuerza bruta: {brute_time * 1000:.1f} ms  Optimizador: {optimizer_time * 1000:.1f} ms")
+
+    products = synthetic_catalog(args.size, rng)
+    start = time.perf_counter()
+    optimizer = TripOptimizer(products)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        optimizer.optimize(rng.randint(100, 3000) * 1000, rng.choice([OBJECTIVE_NIGHTS, OBJECTIVE_STARS]))
+    elapsed = time.perf_counter() - start
+    print(f"\nCatálogo de {args.size} productos: índice en {build:.2f}s")
+    print(f"  {args.queries} consultas en {elapsed * 1000:.1f} ms "
+          f"({elapsed / args.queries * 1e6:.1f} µs por consulta)")
+
+
+if __name__ == "__main__":
+    main()
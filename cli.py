@@ -0,0 +1,211 @@
+"""
+Línea de comandos de la agencia.
+
+Uso:
+    python cli.py quote --catalog catalogo.jsonl --product 3 --nights 2
+    python cli.py purchase --catalog catalogo.jsonl --user "Juan Pérez" --product 3 --nights 2
+    python cli.py affordable --catalog catalogo.jsonl --user "Juan Pérez"
+    python cli.py bench availability_bench --units 100000
+
+El catálogo puede ser un archivo JSONL o CSV (ver services/catalog_loader.py)
+o un snapshot .snap (ver services/snapshot.py), que solo construye los
+productos que se usan. `--product` es la posición del producto en el
+catálogo, sin contar los usuarios.
+
+Cada comando importa solo los módulos que necesita, así los comandos cortos
+arrancan rápido (ver benchmarks/startup_bench.py).
+"""
+import argparse
+import sys
+
+
+SNAPSHOT_SUFFIX = '.snap'
+
+
+def cmd_quote(args):
+    """Imprime el precio de un producto."""
+    from models import quote_cache
+    from models.money import Money
+
+    product = _product_at(args.catalog, args.product)
+    price = Money.of(quote_cache.quote(product, _purchase_params(product, args)))
+    print(f"{product}: ${price:,.2f}")
+    return 0
+
+
+def cmd_purchase(args):
+    """Compra un producto para un usuario; con `--db` la compra queda guardada."""
+    from models.events import ConsoleSink, attach_sink
+
+    product = _product_at(args.catalog, args.product)
+    ledger = None
+    user = None
+    if args.db:
+        from services.sqlite_ledger import SQLiteLedger
+        ledger = SQLiteLedger(args.db, group_commit_size=1)
+        user = ledger.load_user(args.user)
+    try:
+        if user is None:
+            user = _user_named(args.catalog, args.user)
+            if ledger is not None:
+                ledger.register_user(user)
+        attach_sink(user, ConsoleSink())
+        result = user.purchase_product(product, **_purchase_params(product, args))
+    finally:
+        if ledger is not None:
+            ledger.close()
+    return 0 if result else 1
+
+
+def cmd_affordable(args):
+    """Lista los productos que puede pagar un usuario."""
+    user = None
+    if args.db:
+        from services.sqlite_ledger import SQLiteLedger
+        ledger = SQLiteLedger(args.db)
+        try:
+            user = ledger.load_user(args.user)
+        finally:
+            ledger.close()
+    if user is None:
+        user = _user_named(args.catalog, args.user)
+    user.show_affordable_products_max_nights(_all_products(args.catalog))
+    return 0
+
+
+def cmd_bench(args):
+    """Ejecuta un benchmark de benchmarks/ con los argumentos restantes."""
+    import pkgutil
+    import runpy
+    import benchmarks
+
+    names = sorted(module.name for module in pkgutil.iter_modules(benchmarks.__path__)
+                   if module.name != 'generators')
+    if args.name not in names:
+        raise CommandError(f"Benchmark desconocido: {args.name}. Disponibles: {', '.join(names)}")
+    sys.argv = [f"benchmarks.{args.name}"] + args.args
+    runpy.run_module(f"benchmarks.{args.name}", run_name='__main__', alter_sys=True)
+    return 0
+
+
+class CommandError(Exception):
+    """Error de uso que se informa sin traza."""
+
+
+def _purchase_params(product, args):
+    """Parámetros de compra que usa el producto (igual que el servidor de cotizaciones)."""
+    from models.accommodation import Accommodation
+    from models.complex import Complex
+    from models.flight import Flight
+
+    params = {}
+    if isinstance(product, Accommodation):
+        if args.nights is None:
+            raise CommandError("Los alojamientos requieren --nights")
+        params['nights'] = args.nights
+        if isinstance(product, Complex) and args.units is not None:
+            params['units_to_rent'] = args.units
+    elif not isinstance(product, Flight) and args.nights is not None:
+        params['nights'] = args.nights
+    return params
+
+
+def _product_at(path, index):
+    """Producto en una posición del catálogo, leyendo solo lo necesario."""
+    if index < 0:
+        raise CommandError(f"Posición de producto inválida: {index}")
+    if path.endswith(SNAPSHOT_SUFFIX):
+        from services.snapshot import Snapshot
+        with Snapshot(path) as snapshot:
+            if index >= len(snapshot.products):
+                raise CommandError(f"El catálogo tiene {len(snapshot.products)} productos")
+            return snapshot.products[index]
+
+    from models.user import User
+    count = 0
+    for obj in _load(path):
+        if isinstance(obj, User):
+            continue
+        if count == index:
+            return obj
+        count += 1
+    raise CommandError(f"El catálogo tiene {count} productos")
+
+
+def _all_products(path):
+    """Todos los productos del catálogo."""
+    if path.endswith(SNAPSHOT_SUFFIX):
+        from services.snapshot import Snapshot
+        with Snapshot(path) as snapshot:
+            return list(snapshot.products)
+
+    from models.user import User
+    return [obj for obj in _load(path) if not isinstance(obj, User)]
+
+
+def _user_named(path, name):
+    """Usuario del catálogo con ese nombre."""
+    if not path.endswith(SNAPSHOT_SUFFIX):
+        from models.user import User
+        for obj in _load(path):
+            if isinstance(obj, User) and obj.name == name:
+                return obj
+    raise CommandError(f"No hay un usuario '{name}' en {path}")
+
+
+def _load(path):
+    from services.catalog_loader import CatalogLoader
+    return CatalogLoader(on_error=lambda error: None).load(path)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', metavar='comando')
+    commands.required = True
+
+    def add_product_args(command):
+        command.add_argument('--catalog', required=True,
+                             help="Archivo JSONL, CSV o snapshot .snap")
+        command.add_argument('--product', type=int, required=True,
+                             help="Posición del producto en el catálogo")
+        command.add_argument('--nights', type=int, help="Noches (alojamientos y paquetes)")
+        command.add_argument('--units', type=int, help="Unidades a alquilar (complejos)")
+
+    quote = commands.add_parser('quote', help="Cotiza un producto")
+    add_product_args(quote)
+    quote.set_defaults(handler=cmd_quote)
+
+    purchase = commands.add_parser('purchase', help="Compra un producto")
+    add_product_args(purchase)
+    purchase.add_argument('--user', required=True, help="Nombre del usuario")
+    purchase.add_argument('--db', help="Base SQLite donde guardar la compra")
+    purchase.set_defaults(handler=cmd_purchase)
+
+    affordable = commands.add_parser('affordable', help="Productos que puede pagar un usuario")
+    affordable.add_argument('--catalog', required=True, help="Archivo JSONL, CSV o snapshot .snap")
+    affordable.add_argument('--user', required=True, help="Nombre del usuario")
+    affordable.add_argument('--db', help="Base SQLite de donde leer el presupuesto")
+    affordable.set_defaults(handler=cmd_affordable)
+
+    bench = commands.add_parser('bench', help="Ejecuta un benchmark")
+    bench.add_argument('name', help="Módulo de benchmarks/ (ej: money_bench)")
+    bench.add_argument('args', nargs=argparse.REMAINDER, help="Argumentos del benchmark")
+    bench.set_defaults(handler=cmd_bench)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except CommandError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+    except (TypeError, ValueError) as error:
+        print(f"Error al cotizar: {error}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
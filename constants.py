@@ -1,4 +1,10 @@
 PRICE_PER_HOTEL_STAR = 10000
 
+# Precio por noche de casas según cantidad de ambientes
+PRICE_HOUSE_STUDIO = 15000
+PRICE_HOUSE_MEDIUM = 30000
+PRICE_HOUSE_LARGE = 50000
+MAX_ROOMS_HOUSE_MEDIUM = 4
+
 DISCOUNT_PER_UNIT_COMPLEX = 0.10
-MAX_DISCOUNT_COMPLEX = 0.50
\ No newline at end of file
+MAX_DISCOUNT_COMPLEX = 0.50
@@ -4,6 +4,8 @@ from models.house import House
 from models.complex import Complex
 from models.package import Package
 from models.user import User
+from models.events import ConsoleSink
+from services.aggregates import AgencyStats
 
 
 def print_separator(title=""):
@@ -64,9 +66,11 @@ def main():
     
     print_separator("2. USUARIOS Y COMPRAS")
     
-    user1 = User("Juan Pérez", 500000)
-    user2 = User("María López", 150000)
-    user3 = User("Carlos Gómez", 80000)
+    consola = ConsoleSink()
+    agencia = AgencyStats()
+    user1 = agencia.register(User("Juan Pérez", 500000, event_sink=consola))
+    user2 = agencia.register(User("María López", 150000, event_sink=consola))
+    user3 = agencia.register(User("Carlos Gómez", 80000, event_sink=consola))
     
     print(f"✓ Usuario creado: {user1.name}")
     print(f"  Presupuesto inicial: ${user1.budget:,.0f}\n")
@@ -77,7 +81,7 @@ def main():
     user1.purchase_product(casa_mediana, nights=3)
     
     print(f"\nResumen de {user1.name}:")
-    print(f"  Productos comprados: {len(user1.purchase_history)}")
+    print(f"  Productos comprados: {user1.get_purchase_count()}")
     print(f"  Presupuesto restante: ${user1.budget:,.0f}")
     
     print(f"\n--- Compras de María López ---")
@@ -86,7 +90,7 @@ def main():
     user2.purchase_product(monoambiente, nights=3)
     
     print(f"\nResumen de {user2.name}:")
-    print(f"  Productos comprados: {len(user2.purchase_history)}")
+    print(f"  Productos comprados: {user2.get_purchase_count()}")
     print(f"  Presupuesto restante: ${user2.budget:,.0f}")
     
     print(f"\n--- Compras de Carlos Gómez ---")
@@ -95,7 +99,7 @@ def main():
     
     print_separator("3. INTENTO DE COMPRA SIN FONDOS")
     
-    usuario_pobre = User("Ana Silva", 50000)
+    usuario_pobre = agencia.register(User("Ana Silva", 50000, event_sink=consola))
     print(f"Usuario: {usuario_pobre.name}")
     print(f"Presupuesto: ${usuario_pobre.budget:,.0f}\n")
     
@@ -107,12 +111,11 @@ def main():
      
     print_separator("5. RANKING DE USUARIOS POR COMPRAS")
     
-    usuarios = [user1, user2, user3, usuario_pobre]
-    usuarios_ordenados = sorted(usuarios, key=lambda u: len(u.purchase_history), reverse=True)
+    ranking = agencia.top_k(10)
     
     print("Ranking (mayor a menor cantidad de productos):\n")
-    for i, user in enumerate(usuarios_ordenados, 1):
-        print(f"  {i}. {user.name:<20} - {len(user.purchase_history)} producto(s) comprado(s)")
+    for i, puesto in enumerate(ranking, 1):
+        print(f"  {i}. {puesto.user.name:<20} - {puesto.purchases} producto(s) comprado(s)")
     
     print_separator("4. BONUS - PRODUCTOS QUE PUEDE COMPRAR")
 
@@ -127,9 +130,9 @@ def main():
     
     print_separator("6. RESUMEN FINAL")
     
-    total_usuarios = len(usuarios)
-    total_compras = sum(len(u.purchase_history) for u in usuarios)
-    presupuesto_total_gastado = sum(u.initial_budget - u.budget for u in usuarios)
+    total_usuarios = agencia.user_count
+    total_compras = agencia.total_purchases
+    presupuesto_total_gastado = agencia.total_spent
     
     print(f"Total de usuarios: {total_usuarios}")
     print(f"Total de compras realizadas: {total_compras}")
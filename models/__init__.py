@@ -1,19 +1,34 @@
-from .product import Product
-from .flight import Flight
-from .accommodation import Accommodation
-from .hotel import Hotel
-from .house import House
-from .complex import Complex
-from .package import Package
-from .user import User
+"""
+Modelos de la agencia.
 
-__all__ = [
-    'Product',
-    'Flight',
-    'Accommodation',
-    'Hotel',
-    'House',
-    'Complex',
-    'Package',
-    'User'
-]
\ No newline at end of file
+Las clases se importan recién cuando se usan (`__getattr__` de módulo):
+`import models` no carga ningún submódulo y `from models import User` carga
+solo lo que User necesita. Así arrancan rápido los comandos cortos.
+"""
+import importlib
+
+_EXPORTS = {
+    'Product': 'product',
+    'Flight': 'flight',
+    'Accommodation': 'accommodation',
+    'Hotel': 'hotel',
+    'House': 'house',
+    'Complex': 'complex',
+    'Package': 'package',
+    'User': 'user',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value  # Las próximas consultas no pasan por acá
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
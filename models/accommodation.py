@@ -1,5 +1,6 @@
 from abc import abstractmethod
 from models.product import Product
+from models.interning import intern_text
 
 
 class Accommodation(Product):
@@ -7,6 +8,8 @@ class Accommodation(Product):
     Clase base abstracta para todos los tipos de alojamiento.
     """
     
+    __slots__ = ('address',)
+    
     def __init__(self, address):
         """
         Inicializa un alojamiento.
@@ -14,7 +17,7 @@ class Accommodation(Product):
         Args:
             address (str): Dirección del alojamiento
         """
-        self.address = address
+        self.address = intern_text(address)
     
     @abstractmethod
     def calculate_price(self, nights):
@@ -25,7 +28,7 @@ class Accommodation(Product):
             nights (int): Cantidad de noches
             
         Returns:
-            float: Precio total del alojamiento
+            Money: Precio total del alojamiento
         """
         pass
     
@@ -0,0 +1,453 @@
+"""
+Disponibilidad de alojamientos por fecha con un bitset por unidad.
+
+Cada unidad reservable (un hotel, una casa o cada casa de un complejo) tiene
+una fila de bits en un único `bytearray`: el bit `d` indica si la noche
+`start + d` está ocupada. Un año son 46 bytes por unidad, así que 10^6
+unidades ocupan unos 46 MB.
+
+Las consultas convierten el tramo de bytes pedido en un entero y resuelven
+todo con operaciones de bits sobre palabras: "libre en este rango" es un
+AND con una máscara, y "primeras N noches libres seguidas" se obtiene con
+O(log N) desplazamientos y ANDs sobre la fila completa.
+
+Las reservas se hacen con `book`, que verifica y marca todas las noches de
+todas las unidades en una sola sección crítica. `User.purchase_product`
+reserva al comprar un alojamiento con `check_in` (ver models/user.py).
+
+Ejemplo:
+    inventario = Inventory(date(2025, 1, 1))
+    inventario.is_available(hotel, '2025-03-10', nights=3)
+    inventario.first_free(complejo, nights=5, units=2)
+    reserva = inventario.book(hotel, '2025-03-10', nights=3)
+"""
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+
+from models.accommodation import Accommodation
+from models.complex import Complex
+
+
+DAYS_PER_YEAR = 366
+
+Booking = namedtuple('Booking', ['units', 'first_day', 'nights'])
+Booking.__doc__ = """
+Reserva registrada en un inventario.
+
+Attributes:
+    units (tuple): Unidades reservadas
+    first_day (int): Primera noche, en días desde el inicio del calendario
+    nights (int): Cantidad de noches
+"""
+
+
+class Inventory:
+    """
+    Calendario de ocupación de muchas unidades, seguro entre hilos.
+
+    Los hoteles y las casas son una unidad; un complejo usa las unidades de
+    sus casas. Las casas no son intercambiables: `Complex.calculate_price`
+    cobra `k` unidades con la tarifa de las primeras `k` casas, así que
+    reservar `k` unidades reserva exactamente esas casas, y si alguna está
+    ocupada no hay lugar (aunque otras casas del complejo estén libres).
+    """
+
+    def __init__(self, start, days=DAYS_PER_YEAR):
+        """
+        Inicializa un calendario vacío.
+
+        Args:
+            start (date | str): Primera noche del calendario ('YYYY-MM-DD')
+            days (int): Cantidad de noches cubiertas
+
+        Raises:
+            ValueError: Si days no es positivo
+        """
+        if days < 1:
+            raise ValueError("El calendario debe cubrir al menos una noche")
+        self.start = _as_date(start)
+        self.days = days
+        self._stride = (days + 7) // 8
+        self._full = (1 << days) - 1
+        self._bits = bytearray()
+        self._units = {}
+        self._products = []
+        self._lock = threading.Lock()
+
+    @property
+    def unit_count(self):
+        """int: Unidades registradas"""
+        return len(self._bits) // self._stride
+
+    @property
+    def memory_bytes(self):
+        """int: Bytes ocupados por los bitsets"""
+        return len(self._bits)
+
+    def add_units(self, count=1):
+        """
+        Agrega unidades libres que no están asociadas a un producto.
+
+        Args:
+            count (int): Cantidad de unidades
+
+        Returns:
+            int: Índice de la primera unidad agregada
+        """
+        with self._lock:
+            return self._add_units(count)
+
+    def units_for(self, accommodation):
+        """
+        Unidades de un alojamiento; se registran la primera vez.
+
+        Args:
+            accommodation (Accommodation): Hotel, casa o complejo
+
+        Returns:
+            tuple: Índices de las unidades (las casas de un complejo, en orden)
+
+        Raises:
+            TypeError: Si no es un alojamiento
+        """
+        if not isinstance(accommodation, Accommodation):
+            raise TypeError(f"Solo los alojamientos tienen disponibilidad: "
+                            f"{type(accommodation).__name__}")
+        members = accommodation.houses if isinstance(accommodation, Complex) else (accommodation,)
+        units = []
+        with self._lock:
+            for member in members:
+                unit = self._units.get(id(member))
+                if unit is None:
+                    unit = self._units[id(member)] = self._add_units(1)
+                    self._products.append(member)
+                units.append(unit)
+        return tuple(units)
+
+    def day_of(self, when):
+        """
+        Posición de una fecha en el calendario.
+
+        Args:
+            when (date | str): Fecha ('YYYY-MM-DD')
+
+        Returns:
+            int: Días desde el inicio del calendario
+
+        Raises:
+            ValueError: Si la fecha está fuera del calendario
+        """
+        day = (_as_date(when) - self.start).days
+        if not 0 <= day < self.days:
+            raise ValueError(f"Fecha fuera del calendario: {when}")
+        return day
+
+    def date_of(self, day):
+        """
+        Fecha de una posición del calendario.
+
+        Args:
+            day (int): Días desde el inicio del calendario
+
+        Returns:
+            date: Fecha
+        """
+        return self.start + timedelta(days=day)
+
+    def is_free(self, unit, check_in, nights):
+        """
+        Verifica si una unidad está libre en un rango de noches.
+
+        Args:
+            unit (int): Índice de la unidad
+            check_in (date | str): Primera noche
+            nights (int): Cantidad de noches
+
+        Returns:
+            bool: True si todas las noches están libres
+
+        Raises:
+            ValueError: Si el rango sale del calendario
+        """
+        first = self._range(check_in, nights)
+        return not self._read(unit, first, nights)
+
+    def first_free_unit(self, unit, nights, after=None):
+        """
+        Primera fecha desde la que una unidad tiene `nights` noches libres
+        seguidas.
+
+        Args:
+            unit (int): Índice de la unidad
+            nights (int): Noches seguidas necesarias
+            after (date | str): Primera fecha a considerar (por defecto, el
+                inicio del calendario)
+
+        Returns:
+            date | None: Fecha de entrada, o None si no hay lugar en el calendario
+
+        Raises:
+            ValueError: Si nights es menor a 1 o `after` está fuera del calendario
+        """
+        if nights < 1:
+            raise ValueError("Se necesita al menos una noche")
+        offset = 0 if after is None else self.day_of(after)
+        day = _lowest_bit(self._runs(unit, nights) >> offset)
+        return None if day is None else self.date_of(offset + day)
+
+    def reserve(self, unit, check_in, nights):
+        """
+        Marca las noches de una unidad como ocupadas si estaban libres.
+
+        Args:
+            unit (int): Índice de la unidad
+            check_in (date | str): Primera noche
+            nights (int): Cantidad de noches
+
+        Returns:
+            bool: True si se reservó, False si alguna noche estaba ocupada
+
+        Raises:
+            ValueError: Si el rango sale del calendario
+        """
+        first = self._range(check_in, nights)
+        with self._lock:
+            if self._read(unit, first, nights):
+                return False
+            self._write(unit, first, nights, True)
+        return True
+
+    def free_units(self, accommodation, check_in, nights):
+        """
+        Unidades de un alojamiento libres en un rango de noches.
+
+        Args:
+            accommodation (Accommodation): Hotel, casa o complejo
+            check_in (date | str): Primera noche
+            nights (int): Cantidad de noches
+
+        Returns:
+            list: Índices de las unidades libres
+
+        Raises:
+            ValueError: Si el rango sale del calendario
+        """
+        first = self._range(check_in, nights)
+        return [unit for unit in self.units_for(accommodation)
+                if not self._read(unit, first, nights)]
+
+    def is_available(self, accommodation, check_in, nights, units=1):
+        """
+        Verifica si se pueden reservar unidades de un alojamiento.
+
+        Args:
+            accommodation (Accommodation): Hotel, casa o complejo
+            check_in (date | str): Primera noche
+            nights (int): Cantidad de noches
+            units (int): Unidades necesarias (las primeras casas de un complejo)
+
+        Returns:
+            bool: True si las unidades que se cobran están libres todas las noches
+
+        Raises:
+            ValueError: Si el rango sale del calendario
+        """
+        first = self._range(check_in, nights)
+        candidates = self._priced_units(accommodation, units)
+        return len(candidates) == units and not any(
+            self._read(unit, first, nights) for unit in candidates)
+
+    def first_free(self, accommodation, nights, units=1, after=None):
+        """
+        Primera fecha desde la que hay `nights` noches libres seguidas.
+
+        Args:
+            accommodation (Accommodation): Hotel, casa o complejo
+            nights (int): Noches seguidas necesarias
+            units (int): Unidades necesarias (las primeras casas de un complejo)
+            after (date | str): Primera fecha a considerar (por defecto, el
+                inicio del calendario)
+
+        Returns:
+            date | None: Fecha de entrada, o None si no hay lugar en el calendario
+
+        Raises:
+            ValueError: Si nights es menor a 1 o `after` está fuera del calendario
+        """
+        if nights < 1:
+            raise ValueError("Se necesita al menos una noche")
+        offset = 0 if after is None else self.day_of(after)
+        candidates = self._priced_units(accommodation, units)
+        if len(candidates) < units:
+            return None
+        shared = self._full
+        for unit in candidates:
+            shared &= self._runs(unit, nights)
+        day = _lowest_bit(shared >> offset)
+        return None if day is None else self.date_of(offset + day)
+
+    def book(self, accommodation, check_in, nights, units=1):
+        """
+        Reserva unidades de un alojamiento si están libres.
+
+        Args:
+            accommodation (Accommodation): Hotel, casa o complejo
+            check_in (date | str): Primera noche
+            nights (int): Cantidad de noches
+            units (int): Unidades a reservar (las primeras casas de un complejo)
+
+        Returns:
+            Booking | None: Reserva, o None si no había lugar
+
+        Raises:
+            ValueError: Si el rango sale del calendario
+        """
+        bookings = self.book_all([(accommodation, check_in, nights, units)])
+        return None if bookings is None else bookings[0]
+
+    def book_all(self, requests):
+        """
+        Reserva varios alojamientos de forma atómica: todos o ninguno.
+
+        De un complejo se reservan las casas que cobra el precio (las
+        primeras `unidades`); no se reemplazan por otras casas libres.
+
+        Args:
+            requests (iterable): Tuplas (alojamiento, check_in, noches, unidades)
+
+        Returns:
+            list | None: Booking de cada pedido, o None si alguno no tenía lugar
+
+        Raises:
+            ValueError: Si algún rango sale del calendario
+        """
+        plan = []
+        for accommodation, check_in, nights, units in requests:
+            first = self._range(check_in, nights)
+            plan.append((self._priced_units(accommodation, units), first, nights, units))
+
+        with self._lock:
+            bookings = []
+            for candidates, first, nights, units in plan:
+                if len(candidates) < units:
+                    return None
+                for unit in candidates:
+                    if self._read(unit, first, nights):
+                        return None
+                    # Otro pedido del mismo lote puede haber tomado la unidad
+                    if any(_overlaps(booking, unit, first, nights) for booking in bookings):
+                        return None
+                bookings.append(Booking(candidates, first, nights))
+            for booking in bookings:
+                for unit in booking.units:
+                    self._write(unit, booking.first_day, booking.nights, True)
+        return bookings
+
+    def release(self, booking):
+        """
+        Libera las noches de una reserva.
+
+        Args:
+            booking (Booking): Reserva a liberar
+        """
+        with self._lock:
+            for unit in booking.units:
+                self._write(unit, booking.first_day, booking.nights, False)
+
+    def _priced_units(self, accommodation, units):
+        """Unidades que cobra el precio: las primeras `units` del alojamiento."""
+        return self.units_for(accommodation)[:units]
+
+    def _add_units(self, count):
+        first = self.unit_count
+        self._bits.extend(bytes(self._stride * count))
+        return first
+
+    def _range(self, check_in, nights):
+        """Primera noche del rango, verificando que entre en el calendario."""
+        if nights < 1:
+            raise ValueError("Se necesita al menos una noche")
+        first = self.day_of(check_in)
+        if first + nights > self.days:
+            raise ValueError(f"Las {nights} noches desde {check_in} salen del calendario")
+        return first
+
+    def _read(self, unit, first, nights):
+        """Bits de ocupación de las noches [first, first + nights) de una unidad."""
+        base = unit * self._stride
+        word = int.from_bytes(self._bits[base + (first >> 3):base + ((first + nights + 7) >> 3)],
+                              'little')
+        return (word >> (first & 7)) & ((1 << nights) - 1)
+
+    def _write(self, unit, first, nights, occupied):
+        base = unit * self._stride
+        low = base + (first >> 3)
+        high = base + ((first + nights + 7) >> 3)
+        word = int.from_bytes(self._bits[low:high], 'little')
+        mask = ((1 << nights) - 1) << (first & 7)
+        word = word | mask if occupied else word & ~mask
+        self._bits[low:high] = word.to_bytes(high - low, 'little')
+
+    def _runs(self, unit, nights):
+        """
+        Bits de las noches desde las que la unidad tiene `nights` noches
+        libres seguidas.
+        """
+        base = unit * self._stride
+        free = ~int.from_bytes(self._bits[base:base + self._stride], 'little') & self._full
+        # Invariante: el bit d está marcado si las noches [d, d + span) están libres
+        span = 1
+        while span < nights and free:
+            step = min(span, nights - span)
+            free &= free >> step
+            span += step
+        return free
+
+
+def _overlaps(booking, unit, first, nights):
+    return (unit in booking.units and first < booking.first_day + booking.nights
+            and booking.first_day < first + nights)
+
+
+def _lowest_bit(value):
+    return (value & -value).bit_length() - 1 if value else None
+
+
+def _as_date(value):
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+_default_inventory = None
+_default_lock = threading.Lock()
+
+
+def get_inventory():
+    """
+    Inventario compartido que usan los usuarios al comprar con `check_in`.
+
+    Si no se configuró uno, se crea un calendario de un año desde hoy.
+
+    Returns:
+        Inventory: Inventario actual
+    """
+    global _default_inventory
+    if _default_inventory is None:
+        with _default_lock:
+            if _default_inventory is None:
+                _default_inventory = Inventory(date.today())
+    return _default_inventory
+
+
+def set_inventory(inventory):
+    """
+    Reemplaza el inventario compartido.
+
+    Args:
+        inventory (Inventory | None): Nuevo inventario (None = se crea uno
+            nuevo de un año desde hoy al próximo uso)
+    """
+    global _default_inventory
+    _default_inventory = inventory
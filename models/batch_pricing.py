@@ -0,0 +1,225 @@
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+from models.complex import Complex
+from models.pricing_rules import current_rules
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa la versión en Python puro
+    np = None
+
+
+TYPE_FLIGHT = 0
+TYPE_HOTEL = 1
+TYPE_HOUSE = 2
+TYPE_COMPLEX = 3
+
+
+class PriceCatalog:
+    """
+    Catálogo de productos almacenado por columnas para calcular precios en lote.
+
+    Cada producto se descompone en un código de tipo y en las columnas que
+    intervienen en su precio (estrellas, ambientes y precio fijo). Con eso el
+    precio de todo el catálogo para varias cantidades de noches se obtiene en
+    una sola operación vectorizada, con los mismos resultados que
+    `calculate_price` de cada objeto.
+
+    Todos los importes están en centavos enteros (int64 con NumPy), igual
+    que `Money.cents`: los cálculos son exactos y `Money(cents)` convierte
+    cualquier resultado al tipo que retornan los objetos.
+
+    Los complejos se cotizan como lo hace `Complex.calculate_price` por
+    defecto (una unidad, es decir, la primera casa).
+
+    Las tarifas salen de las tablas de las reglas vigentes
+    (models/pricing_rules.py), las mismas que usan los objetos.
+    """
+
+    def __init__(self, products):
+        """
+        Construye el catálogo a partir de una lista de productos.
+
+        Args:
+            products (iterable): Vuelos, hoteles, casas y complejos
+
+        Raises:
+            TypeError: Si algún producto no se puede cotizar en lote
+        """
+        self.products = list(products)
+
+        type_codes = []
+        stars = []
+        rooms = []
+        prices = []
+
+        for product in self.products:
+            if isinstance(product, Flight):
+                type_codes.append(TYPE_FLIGHT)
+                stars.append(0)
+                rooms.append(0)
+                prices.append(product.price.cents)
+            elif isinstance(product, Hotel):
+                type_codes.append(TYPE_HOTEL)
+                stars.append(product.stars)
+                rooms.append(0)
+                prices.append(0)
+            elif isinstance(product, House):
+                type_codes.append(TYPE_HOUSE)
+                stars.append(0)
+                rooms.append(product.rooms)
+                prices.append(0)
+            elif isinstance(product, Complex):
+                type_codes.append(TYPE_COMPLEX)
+                stars.append(0)
+                rooms.append(product.houses[0].rooms)
+                prices.append(0)
+            else:
+                raise TypeError(f"No se puede cotizar en lote: {type(product).__name__}")
+
+        self.type_codes = _column(type_codes)
+        self.stars = _column(stars)
+        self.rooms = _column(rooms)
+        self.prices = _column(prices)
+
+    def __len__(self):
+        return len(self.products)
+
+    def rates_per_night(self):
+        """
+        Calcula la tarifa por noche de cada producto.
+
+        Returns:
+            ndarray | list: Tarifa por noche en centavos (0 para vuelos)
+
+        Raises:
+            ValueError: Si algún hotel tiene estrellas sin tarifa
+        """
+        return _rates(self.type_codes, self.stars, self.rooms)
+
+    def fixed_prices(self):
+        """
+        Retorna la parte del precio que no depende de las noches.
+
+        Returns:
+            ndarray | list: Precio del vuelo en centavos o 0 para alojamientos
+        """
+        if np is not None:
+            return np.where(self.type_codes == TYPE_FLIGHT, self.prices, 0)
+        return [price if code == TYPE_FLIGHT else 0
+                for code, price in zip(self.type_codes, self.prices)]
+
+    def price_matrix(self, nights):
+        """
+        Calcula el precio de cada producto para cada cantidad de noches.
+
+        Args:
+            nights (iterable): Cantidades de noches a cotizar
+
+        Returns:
+            ndarray | list: Matriz productos x noches con los precios en centavos
+        """
+        nights = list(nights)
+        rates = self.rates_per_night()
+        fixed = self.fixed_prices()
+
+        if np is not None:
+            nights = np.asarray(nights, dtype=np.int64)
+            return fixed[:, None] + rates[:, None] * nights[None, :]
+
+        return [[base + rate * n for n in nights]
+                for base, rate in zip(fixed, rates)]
+
+    def prices_for(self, nights):
+        """
+        Calcula el precio de todo el catálogo para una cantidad de noches.
+
+        Args:
+            nights (int): Cantidad de noches
+
+        Returns:
+            ndarray | list: Precio de cada producto en centavos
+        """
+        if np is not None:
+            return self.price_matrix([nights])[:, 0]
+        return [row[0] for row in self.price_matrix([nights])]
+
+    def prices_at(self, rows, nights):
+        """
+        Calcula el precio de algunos productos, cada uno con sus noches.
+
+        Sirve para cotizar en lote pedidos sueltos: solo se consultan las
+        reglas para las filas pedidas, no para todo el catálogo.
+
+        Args:
+            rows (sequence): Posiciones de los productos en `products`
+            nights (sequence): Cantidad de noches de cada pedido (se ignora
+                para los vuelos)
+
+        Returns:
+            ndarray | list: Precio de cada pedido en centavos
+
+        Raises:
+            ValueError: Si algún hotel tiene estrellas sin tarifa
+        """
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+            codes = self.type_codes[rows]
+            rates = _rates(codes, self.stars[rows], self.rooms[rows])
+            fixed = np.where(codes == TYPE_FLIGHT, self.prices[rows], 0)
+            return fixed + rates * np.asarray(nights, dtype=np.int64)
+
+        codes = [self.type_codes[row] for row in rows]
+        rates = _rates(codes, [self.stars[row] for row in rows], [self.rooms[row] for row in rows])
+        return [self.prices[row] if code == TYPE_FLIGHT else rate * n
+                for row, code, rate, n in zip(rows, codes, rates, nights)]
+
+
+def _column(values):
+    """Convierte una lista de valores en una columna (ndarray si hay NumPy)."""
+    if np is not None:
+        return np.array(values, dtype=np.int64)
+    return values
+
+
+def _rates(codes, stars, rooms):
+    """Tarifa por noche en centavos de cada fila según su tipo."""
+    rules = current_rules()
+    if np is not None:
+        is_hotel = codes == TYPE_HOTEL
+        is_house = (codes == TYPE_HOUSE) | (codes == TYPE_COMPLEX)
+        rates = np.zeros(len(codes), dtype=np.int64)
+        rates[is_hotel] = _lookup(rules.hotel_rate, stars[is_hotel])
+        rates[is_house] = _lookup(rules.house_rate, rooms[is_house])
+        return rates
+
+    rates = []
+    for code, star_count, room_count in zip(codes, stars, rooms):
+        if code == TYPE_HOTEL:
+            rates.append(rules.hotel_rate(star_count))
+        elif code == TYPE_FLIGHT:
+            rates.append(0)
+        else:
+            rates.append(rules.house_rate(room_count))
+    return rates
+
+
+def _lookup(rate_for, keys):
+    """
+    Aplica una regla a una columna consultando cada valor distinto una vez.
+
+    Las estrellas y los ambientes toman pocos valores, así que se consulta
+    la tabla de reglas por cada valor distinto y se expande con índices.
+
+    Args:
+        rate_for (callable): Regla escalar (ej: PricingRules.house_rate)
+        keys (ndarray): Estrellas o ambientes
+
+    Returns:
+        ndarray: Tarifa en centavos para cada clave
+    """
+    if not len(keys):
+        return np.zeros(0, dtype=np.int64)
+    unique, inverse = np.unique(keys, return_inverse=True)
+    return np.array([rate_for(int(key)) for key in unique], dtype=np.int64)[inverse]
@@ -0,0 +1,160 @@
+from bisect import bisect_right
+from collections import namedtuple
+from heapq import merge
+from itertools import islice
+
+from models.accommodation import Accommodation
+from models.money import Money
+from models.pricing_rules import current_rules
+
+
+AffordableProduct = namedtuple('AffordableProduct', ['product', 'price', 'nights'])
+AffordableProduct.__doc__ = """
+Producto que entra en un presupuesto.
+
+Attributes:
+    product (Product): Producto encontrado
+    price (Money): Precio total cotizado
+    nights (int | None): Noches cotizadas (None para productos sin noches)
+"""
+
+
+class CatalogIndex:
+    """
+    Índice de precios de un catálogo para consultas de presupuesto.
+
+    Los productos de precio fijo (vuelos, paquetes) se guardan ordenados por
+    precio y los alojamientos ordenados por tarifa por noche, de modo que las
+    consultas se resuelven con búsqueda binaria en O(log n + k) en lugar de
+    cotizar todo el catálogo en cada pedido.
+
+    Los precios se toman al construir el índice: si se instalan otras reglas
+    de precios (models/pricing_rules.py) hay que reconstruirlo; `generation`
+    indica con qué reglas se armó.
+    """
+
+    def __init__(self, products):
+        """
+        Construye el índice cotizando cada producto una sola vez.
+
+        Args:
+            products (iterable): Productos del catálogo
+
+        Raises:
+            ValueError: Si un alojamiento tiene tarifa por noche no positiva
+        """
+        self.generation = current_rules().generation
+        fixed = []
+        nightly = []
+
+        for product in products:
+            if isinstance(product, Accommodation):
+                rate = product.calculate_price(1)
+                if rate <= 0:
+                    raise ValueError(f"Tarifa por noche inválida para {product}: {rate}")
+                nightly.append((rate, len(nightly), product))
+            else:
+                fixed.append((product.calculate_price(), len(fixed), product))
+
+        fixed.sort(key=lambda item: (item[0].cents, item[1]))
+        nightly.sort(key=lambda item: (item[0].cents, item[1]))
+
+        self.fixed_prices = [price for price, _, _ in fixed]
+        self.fixed_products = [product for _, _, product in fixed]
+        self.nightly_rates = [rate for rate, _, _ in nightly]
+        self.accommodations = [product for _, _, product in nightly]
+
+    def __len__(self):
+        return len(self.fixed_products) + len(self.accommodations)
+
+    def affordable_fixed(self, budget):
+        """
+        Productos de precio fijo que entran en el presupuesto.
+
+        Args:
+            budget (Money | float): Presupuesto disponible
+
+        Returns:
+            list: AffordableProduct ordenados de menor a mayor precio
+        """
+        budget = Money.of(budget)
+        end = bisect_right(self.fixed_prices, budget)
+        return [
+            AffordableProduct(product, price, None)
+            for price, product in zip(self.fixed_prices[:end], self.fixed_products[:end])
+        ]
+
+    def affordable_accommodations(self, budget):
+        """
+        Alojamientos que entran en el presupuesto con su máximo de noches.
+
+        Args:
+            budget (Money | float): Presupuesto disponible
+
+        Returns:
+            list: AffordableProduct con el precio por el máximo de noches,
+                  ordenados de menor a mayor tarifa por noche
+        """
+        budget = Money.of(budget)
+        end = bisect_right(self.nightly_rates, budget)
+        result = []
+        for rate, product in zip(self.nightly_rates[:end], self.accommodations[:end]):
+            nights = int(budget // rate)
+            result.append(AffordableProduct(product, product.calculate_price(nights), nights))
+        return result
+
+    def affordable(self, budget):
+        """
+        Todos los productos que entran en el presupuesto.
+
+        Args:
+            budget (Money | float): Presupuesto disponible
+
+        Returns:
+            list: Productos de precio fijo seguidos de los alojamientos
+        """
+        return self.affordable_fixed(budget) + self.affordable_accommodations(budget)
+
+    def max_nights(self, budget):
+        """
+        Máximo de noches que se pueden pagar en cada alojamiento accesible.
+
+        Args:
+            budget (Money | float): Presupuesto disponible
+
+        Returns:
+            list: Tuplas (alojamiento, noches)
+        """
+        budget = Money.of(budget)
+        end = bisect_right(self.nightly_rates, budget)
+        return [
+            (product, int(budget // rate))
+            for rate, product in zip(self.nightly_rates[:end], self.accommodations[:end])
+        ]
+
+    def cheapest(self, k, nights=1):
+        """
+        Los k productos más baratos para una cantidad de noches.
+
+        Args:
+            k (int): Cantidad de productos a retornar
+            nights (int): Noches a cotizar para los alojamientos
+
+        Returns:
+            list: AffordableProduct ordenados de menor a mayor precio
+        """
+        fixed = (
+            AffordableProduct(product, price, None)
+            for price, product in zip(self.fixed_prices, self.fixed_products)
+        )
+        # El orden por tarifa se mantiene al multiplicar por las noches
+        nightly = (
+            AffordableProduct(product, rate * nights, nights)
+            for rate, product in zip(self.nightly_rates, self.accommodations)
+        )
+        top = islice(merge(fixed, nightly, key=lambda item: item.price), k)
+        return [
+            item if item.nights is None
+            else item._replace(price=item.product.calculate_price(nights))
+            for item in top
+        ]
@@ -1,17 +1,30 @@
 from models.accommodation import Accommodation
-from constants import DISCOUNT_PER_UNIT_COMPLEX, MAX_DISCOUNT_COMPLEX
+from models.money import Money
+from models.pricing_rules import current_rules
+from models import quote_cache
 
 
 class Complex(Accommodation):
     """
     Representa un complejo compuesto por varias casas.
     
-    Reglas de descuento:
+    Reglas de descuento por defecto (ver models/pricing_rules.py):
     - Si se alquilan todas las unidades: 10% de descuento por cada unidad
     - Descuento máximo acumulado: 50%
     - Si se alquila solo una unidad: se cobra como casa normal (sin descuento)
+    
+    Las tarifas por noche de las casas se acumulan en sumas prefijas (en
+    centavos) al crear el complejo, así el precio para cualquier cantidad de
+    unidades es O(1). El precio con descuento se redondea al centavo con la
+    política de models/money.py.
+    Las sumas se recalculan solas si cambian las reglas de precios; si se
+    modifican las casas hay que llamar a `refresh_rates()`.
     """  
     
+    __slots__ = ('houses', 'total_units', '_prefix_rates', '_rates_generation')
+    
+    _cache_quotes = True  # Ver models/quote_cache.py
+    
     def __init__(self, address, houses):
         """
         Inicializa un complejo.
@@ -30,6 +43,34 @@ class Complex(Accommodation):
         
         self.houses = houses
         self.total_units = len(houses)
+        self._build_rates()
+    
+    def refresh_rates(self):
+        """
+        Recalcula las sumas prefijas de las tarifas por noche de las casas
+        y descarta las cotizaciones del complejo en la caché compartida.
+        
+        _prefix_rates[k] es la tarifa por noche de las primeras k casas, en
+        centavos.
+        """
+        self._build_rates()
+        quote_cache.invalidate(self)
+    
+    def _build_rates(self):
+        # Si las reglas cambian durante el recálculo, la generación anotada
+        # queda vieja y las sumas se vuelven a calcular en el próximo uso
+        generation = current_rules().generation
+        prefix = [0]
+        for house in self.houses:
+            prefix.append(prefix[-1] + house.price_cents(1))
+        self._prefix_rates = prefix
+        self._rates_generation = generation
+    
+    def _rates(self):
+        """Sumas prefijas vigentes, recalculadas si cambiaron las reglas."""
+        if self._rates_generation != current_rules().generation:
+            self._build_rates()
+        return self._prefix_rates
     
     def calculate_price(self, nights, units_to_rent=1):
         """
@@ -40,7 +81,7 @@ class Complex(Accommodation):
             units_to_rent (int): Cantidad de unidades a alquilar (por defecto 1)
             
         Returns:
-            float: Precio total con descuentos aplicados si corresponde
+            Money: Precio total con descuentos aplicados si corresponde
         """
         if units_to_rent < 1 or units_to_rent > self.total_units:
             raise ValueError(f"Debe alquilar entre 1 y {self.total_units} unidades")
@@ -51,10 +92,13 @@ class Complex(Accommodation):
         if units_to_rent == self.total_units:
             return self._calculate_with_discount(nights, units_to_rent)
         
-        total = 0
-        for i in range(units_to_rent):
-            total += self.houses[i].calculate_price(nights)
-        return total
+        return Money(self._rates()[units_to_rent] * nights)
+    
+    def price_cents(self, nights, units_to_rent=1):
+        """Precio del complejo en centavos enteros (ver Product.price_cents)"""
+        if units_to_rent == 1:
+            return self.houses[0].price_cents(nights)
+        return self.calculate_price(nights, units_to_rent).cents
     
     def _calculate_with_discount(self, nights, units_to_rent):
         """
@@ -65,15 +109,65 @@ class Complex(Accommodation):
             units_to_rent (int): Cantidad de unidades a alquilar
             
         Returns:
-            float: Precio total con descuento aplicado
+            Money: Precio total con descuento aplicado
+        """
+        base_price = Money(self._rates()[self.total_units] * nights)
+        
+        discount = self._discount_for(units_to_rent)
+        
+        return base_price.apply_discount(discount)
+    
+    def _discount_for(self, units_to_rent):
+        """
+        Descuento por alquilar todas las unidades.
+        
+        Args:
+            units_to_rent (int): Cantidad de unidades a alquilar
+            
+        Returns:
+            int: Descuento en puntos básicos según la tabla de las reglas vigentes
+        """
+        return current_rules().complex_discount(units_to_rent)
+    
+    def max_nights(self, budget, units_to_rent=1):
         """
-        base_price = sum(house.calculate_price(nights) for house in self.houses)
+        Calcula el máximo de noches que se pueden pagar con un presupuesto.
         
-        discount_percentage = min(units_to_rent * DISCOUNT_PER_UNIT_COMPLEX, MAX_DISCOUNT_COMPLEX)
+        Args:
+            budget (Money | float): Presupuesto disponible
+            units_to_rent (int): Cantidad de unidades a alquilar
+            
+        Returns:
+            int: Máximo de noches (0 si no alcanza para una noche)
+        """
+        budget = Money.of(budget)
+        price_per_night = self.calculate_price(1, units_to_rent=units_to_rent)
+        if price_per_night > budget:
+            return 0
         
-        final_price = base_price * (1 - discount_percentage)
+        nights = budget // price_per_night
+        # Con descuento el precio puede no ser exacto: se ajusta con el precio real
+        while self.calculate_price(nights + 1, units_to_rent) <= budget:
+            nights += 1
+        while nights > 0 and self.calculate_price(nights, units_to_rent) > budget:
+            nights -= 1
+        return nights
+    
+    def max_nights_by_units(self, budget):
+        """
+        Calcula el máximo de noches pagables para cada cantidad de unidades.
         
-        return final_price
+        Args:
+            budget (Money | float): Presupuesto disponible
+            
+        Returns:
+            dict: Unidades -> máximo de noches (aplicando el descuento al
+                  alquilar todas las unidades)
+        """
+        return {
+            units: self.max_nights(budget, units)
+            for units in range(1, self.total_units + 1)
+        }
     
     def get_discount_info(self, units_to_rent):
         """
@@ -86,11 +180,11 @@ class Complex(Accommodation):
             dict: Información del descuento (porcentaje y si aplica)
         """
         if units_to_rent == self.total_units:
-            discount = min(units_to_rent * DISCOUNT_PER_UNIT_COMPLEX, MAX_DISCOUNT_COMPLEX)
+            discount = self._discount_for(units_to_rent)
             return {
                 'applies': True,
-                'percentage': discount * 100,
-                'description': f'{int(discount * 100)}% de descuento'
+                'percentage': discount / 100,
+                'description': f'{discount // 100}% de descuento'
             }
         return {
             'applies': False,
@@ -0,0 +1,213 @@
+import sys
+import threading
+
+from models.purchase import PURCHASE_INVALID_PRODUCT, PURCHASE_MISSING_PARAMS, PURCHASE_UNAVAILABLE
+
+
+class EventSink:
+    """
+    Destino de los eventos de compra de los usuarios.
+
+    Las subclases implementan `emit_batch`; `emit` envía un único evento.
+    """
+
+    def emit(self, event):
+        """
+        Envía un evento.
+
+        Args:
+            event (PurchaseEvent): Evento a enviar
+        """
+        self.emit_batch([event])
+
+    def emit_batch(self, events):
+        """
+        Envía una lista de eventos.
+
+        Args:
+            events (list): Eventos a enviar
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Envía los eventos pendientes, si los hay."""
+
+    def close(self):
+        """Libera el destino enviando antes los eventos pendientes."""
+        self.flush()
+
+
+class ConsoleSink(EventSink):
+    """
+    Imprime cada compra con el formato de la consola de la agencia.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Inicializa el destino.
+
+        Args:
+            stream (file): Archivo donde escribir (por defecto, sys.stdout)
+        """
+        self.stream = stream
+
+    def emit_batch(self, events):
+        lines = []
+        for event in events:
+            lines.extend(format_purchase_event(event))
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write("\n".join(lines) + "\n")
+
+    def flush(self):
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.flush()
+
+
+class ListSink(EventSink):
+    """
+    Guarda los eventos en una lista (útil para inspeccionarlos después).
+    """
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def emit_batch(self, events):
+        with self._lock:
+            self.events.extend(events)
+
+
+class BufferedSink(EventSink):
+    """
+    Acumula eventos y los envía en lotes a otro destino.
+
+    El envío ocurre cuando el buffer alcanza `batch_size` o al llamar a
+    `flush`, fuera del lock, para no demorar a los hilos que compran.
+    """
+
+    def __init__(self, target, batch_size=256):
+        """
+        Inicializa el buffer.
+
+        Args:
+            target (EventSink): Destino que recibe los lotes
+            batch_size (int): Cantidad de eventos por lote
+        """
+        self.target = target
+        self.batch_size = batch_size
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        with self._lock:
+            self._buffer.append(event)
+            if len(self._buffer) < self.batch_size:
+                return
+            batch, self._buffer = self._buffer, []
+        self.target.emit_batch(batch)
+
+    def emit_batch(self, events):
+        for event in events:
+            self.emit(event)
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self.target.emit_batch(batch)
+        self.target.flush()
+
+    def close(self):
+        self.flush()
+        self.target.close()
+
+
+class FanOutSink(EventSink):
+    """
+    Reenvía cada lote de eventos a varios destinos.
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+
+    def emit_batch(self, events):
+        for sink in self.sinks:
+            sink.emit_batch(events)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def attach_sink(user, sink):
+    """
+    Agrega un destino de eventos a un usuario sin quitar el que ya tenía.
+
+    Args:
+        user (User): Usuario
+        sink (EventSink): Destino a agregar
+    """
+    current = user.event_sink
+    if current is None:
+        user.event_sink = sink
+    elif current is sink:
+        return
+    elif isinstance(current, FanOutSink):
+        if sink not in current.sinks:
+            # El FanOutSink puede ser compartido: se crea uno nuevo
+            user.event_sink = FanOutSink(*current.sinks, sink)
+    else:
+        user.event_sink = FanOutSink(current, sink)
+
+
+def format_purchase_event(event):
+    """
+    Genera las líneas de consola que describen una compra.
+
+    Args:
+        event (PurchaseEvent): Evento de compra
+
+    Returns:
+        list: Líneas de texto
+    """
+    product, result = event.product, event.result
+
+    if result.reason == PURCHASE_INVALID_PRODUCT:
+        name = type(product).__name__ if not isinstance(product, list) else "El carrito"
+        return [f"✗ Error: {name} no es un producto válido"]
+    if result.reason == PURCHASE_MISSING_PARAMS:
+        return ["✗ Error: El producto requiere parámetros adicionales (ej: nights)"]
+    if result.reason == PURCHASE_UNAVAILABLE:
+        name = f"{len(product)} producto(s)" if isinstance(product, list) else product
+        return [f"✗ Sin disponibilidad en las fechas pedidas para: {name}"]
+
+    if isinstance(product, list):
+        if result.success:
+            return [
+                f"✓ Compra exitosa de {len(product)} producto(s)",
+                f"  Total: ${result.price:,.0f}",
+                f"  Presupuesto restante: ${result.remaining_budget:,.0f}",
+            ]
+        return [
+            f"✗ Fondos insuficientes para comprar {len(product)} producto(s)",
+            f"  Total: ${result.price:,.0f}",
+            f"  Presupuesto disponible: ${result.remaining_budget:,.0f}",
+            f"  Faltante: ${result.shortfall:,.0f}",
+        ]
+
+    if result.success:
+        return [
+            f"✓ Compra exitosa: {product}",
+            f"  Precio: ${result.price:,.0f}",
+            f"  Presupuesto restante: ${result.remaining_budget:,.0f}",
+        ]
+    return [
+        f"✗ Fondos insuficientes para comprar: {product}",
+        f"  Precio: ${result.price:,.0f}",
+        f"  Presupuesto disponible: ${result.remaining_budget:,.0f}",
+        f"  Faltante: ${result.shortfall:,.0f}",
+    ]
@@ -1,5 +1,7 @@
 from datetime import datetime
 from models.product import Product
+from models.interning import intern_text
+from models.money import Money
 
 
 class Flight(Product):
@@ -7,6 +9,8 @@ class Flight(Product):
     Representa un vuelo con información de fechas y aerolínea.
     """
     
+    __slots__ = ('departure_date', 'return_date', 'airline', 'price')
+    
     def __init__(self, departure_date, return_date, airline, price):
         """
         Inicializa un vuelo.
@@ -15,22 +19,26 @@ class Flight(Product):
             departure_date (str): Fecha de salida en formato 'YYYY-MM-DD'
             return_date (str): Fecha de regreso en formato 'YYYY-MM-DD' o None para solo ida
             airline (str): Nombre de la aerolínea
-            price (float): Precio del vuelo
+            price (Money | float): Precio del vuelo
         """
-        self.departure_date = departure_date
-        self.return_date = return_date
-        self.airline = airline
-        self.price = price
+        self.departure_date = intern_text(departure_date)
+        self.return_date = intern_text(return_date)
+        self.airline = intern_text(airline)
+        self.price = Money.of(price)
     
     def calculate_price(self):
         """
         Calcula el precio del vuelo.
         
         Returns:
-            float: Precio del vuelo
+            Money: Precio del vuelo
         """
         return self.price
     
+    def price_cents(self):
+        """Precio del vuelo en centavos enteros (ver Product.price_cents)"""
+        return self.price.cents
+    
     def is_round_trip(self):
         """
         Verifica si es un vuelo de ida y vuelta.
@@ -0,0 +1,237 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+
+class SortedColumn:
+    """
+    Columna de claves enteras ordenadas, con inserción incremental.
+
+    Las claves se guardan en bloques ordenados de tamaño acotado: insertar
+    cuesta una búsqueda binaria sobre los máximos de cada bloque más la
+    inserción dentro de un bloque chico, sin mover millones de elementos.
+    """
+
+    CHUNK_SIZE = 1024
+
+    def __init__(self):
+        self._keys = []
+        self._values = []
+        self._maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def insert(self, key, value):
+        """
+        Inserta un valor con su clave; los valores con igual clave quedan
+        en orden de inserción.
+
+        Args:
+            key (int): Clave de ordenamiento
+            value (object): Valor asociado
+        """
+        if not self._maxes:
+            self._keys.append([key])
+            self._values.append([value])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        chunk = bisect_right(self._maxes, key)
+        if chunk == len(self._maxes):
+            chunk -= 1
+        keys = self._keys[chunk]
+        values = self._values[chunk]
+        position = bisect_right(keys, key)
+        keys.insert(position, key)
+        values.insert(position, value)
+        self._maxes[chunk] = keys[-1]
+        self._len += 1
+
+        if len(keys) > 2 * self.CHUNK_SIZE:
+            half = len(keys) // 2
+            self._keys[chunk:chunk + 1] = [keys[:half], keys[half:]]
+            self._values[chunk:chunk + 1] = [values[:half], values[half:]]
+            self._maxes[chunk:chunk + 1] = [keys[half - 1], keys[-1]]
+
+    def update(self, items):
+        """
+        Inserta muchos pares (clave, valor) de una vez.
+
+        Si el lote es grande respecto de la columna, se reconstruye ordenando
+        todo una sola vez en lugar de insertar uno por uno.
+
+        Args:
+            items (iterable): Pares (clave, valor)
+        """
+        items = list(items)
+        if len(items) * 8 < self._len:
+            for key, value in items:
+                self.insert(key, value)
+            return
+
+        merged = list(zip(self._iter_keys(), self._iter_values())) + items
+        merged.sort(key=lambda item: item[0])
+        size = self.CHUNK_SIZE
+        self._keys = [[key for key, _ in merged[i:i + size]] for i in range(0, len(merged), size)]
+        self._values = [[value for _, value in merged[i:i + size]] for i in range(0, len(merged), size)]
+        self._maxes = [keys[-1] for keys in self._keys]
+        self._len = len(merged)
+
+    def range(self, low, high):
+        """
+        Recorre los valores con clave entre low y high (inclusive), en orden.
+
+        Args:
+            low (int): Clave mínima
+            high (int): Clave máxima
+
+        Yields:
+            object: Valores en el rango
+        """
+        chunk = bisect_left(self._maxes, low)
+        if chunk == len(self._maxes):
+            return
+        position = bisect_left(self._keys[chunk], low)
+        while chunk < len(self._keys):
+            keys = self._keys[chunk]
+            values = self._values[chunk]
+            end = bisect_right(keys, high)
+            yield from values[position:end]
+            if end < len(keys):
+                return
+            chunk += 1
+            position = 0
+
+    def _iter_keys(self):
+        for keys in self._keys:
+            yield from keys
+
+    def _iter_values(self):
+        for values in self._values:
+            yield from values
+
+
+class FlightIndex:
+    """
+    Índice de vuelos por fecha de salida y de regreso.
+
+    Las fechas ISO de cada vuelo se convierten una sola vez a ordinales
+    enteros y se guardan en columnas ordenadas, una por combinación de
+    aerolínea y tipo de viaje. Así las consultas por rango de fechas,
+    aerolínea e ida/vuelta son búsquedas binarias: O(log n + k).
+    """
+
+    def __init__(self, flights=()):
+        """
+        Construye el índice.
+
+        Args:
+            flights (iterable): Vuelos iniciales
+        """
+        self._departures = {}
+        self._returns = {}
+        self._count = 0
+        self.add_many(flights)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, flight):
+        """
+        Agrega un vuelo al índice.
+
+        Args:
+            flight (Flight): Vuelo a agregar
+
+        Raises:
+            ValueError: Si alguna fecha no tiene formato 'YYYY-MM-DD'
+        """
+        self.add_many([flight])
+
+    def add_many(self, flights):
+        """
+        Agrega muchos vuelos de una vez.
+
+        Args:
+            flights (iterable): Vuelos a agregar
+
+        Raises:
+            ValueError: Si alguna fecha no tiene formato 'YYYY-MM-DD'
+        """
+        departures = {}
+        returns = {}
+        count = 0
+        for flight in flights:
+            departure = _to_ordinal(flight.departure_date)
+            round_trip = flight.is_round_trip()
+            for key in ((None, None), (flight.airline, None),
+                        (None, round_trip), (flight.airline, round_trip)):
+                departures.setdefault(key, []).append((departure, flight))
+            if round_trip:
+                returned = _to_ordinal(flight.return_date)
+                for key in (None, flight.airline):
+                    returns.setdefault(key, []).append((returned, flight))
+            count += 1
+
+        for key, items in departures.items():
+            self._departures.setdefault(key, SortedColumn()).update(items)
+        for key, items in returns.items():
+            self._returns.setdefault(key, SortedColumn()).update(items)
+        self._count += count
+
+    def departing_between(self, start, end, airline=None, round_trip=None):
+        """
+        Vuelos que salen entre dos fechas (inclusive).
+
+        Args:
+            start (str | date): Fecha mínima de salida
+            end (str | date): Fecha máxima de salida
+            airline (str): Filtra por aerolínea
+            round_trip (bool): True solo ida y vuelta, False solo ida
+
+        Returns:
+            list: Vuelos ordenados por fecha de salida
+        """
+        column = self._departures.get((airline, round_trip))
+        if column is None:
+            return []
+        return list(column.range(_to_ordinal(start), _to_ordinal(end)))
+
+    def returning_between(self, start, end, airline=None):
+        """
+        Vuelos de ida y vuelta que regresan entre dos fechas (inclusive).
+
+        Args:
+            start (str | date): Fecha mínima de regreso
+            end (str | date): Fecha máxima de regreso
+            airline (str): Filtra por aerolínea
+
+        Returns:
+            list: Vuelos ordenados por fecha de regreso
+        """
+        column = self._returns.get(airline)
+        if column is None:
+            return []
+        return list(column.range(_to_ordinal(start), _to_ordinal(end)))
+
+    def airlines(self):
+        """
+        Aerolíneas presentes en el índice.
+
+        Returns:
+            list: Nombres de aerolíneas
+        """
+        return sorted(airline for airline, round_trip in self._departures
+                      if airline is not None and round_trip is None)
+
+
+def _to_ordinal(value):
+    """Convierte una fecha ISO (o un date) a su ordinal entero."""
+    if isinstance(value, date):
+        return value.toordinal()
+    try:
+        return date.fromisoformat(value).toordinal()
+    except (TypeError, ValueError):
+        raise ValueError(f"Fecha inválida: {value!r} (se espera 'YYYY-MM-DD')")
@@ -1,11 +1,15 @@
 from models.accommodation import Accommodation
-from constants import PRICE_PER_HOTEL_STAR
+from models.interning import intern_text
+from models.money import Money
+from models.pricing_rules import current_rules
 
 class Hotel(Accommodation):
     """
     Representa un hotel con nombre y clasificación por estrellas.
     """
     
+    __slots__ = ('name', 'stars')
+    
     def __init__(self, address, name, stars):
         """
         Inicializa un hotel.
@@ -16,21 +20,26 @@ class Hotel(Accommodation):
             stars (int): Clasificación por estrellas (1-5)
         """
         super().__init__(address)
-        self.name = name
+        self.name = intern_text(name)
         self.stars = stars
     
     def calculate_price(self, nights):
         """
         Calcula el precio del hotel.
-        Fórmula: estrellas * $10,000 * noches
+        Fórmula por defecto: estrellas * $10,000 * noches (la tarifa por
+        estrellas sale de las reglas vigentes, ver models/pricing_rules.py)
         
         Args:
             nights (int): Cantidad de noches
             
         Returns:
-            float: Precio total del hotel
+            Money: Precio total del hotel
         """
-        return self.stars * PRICE_PER_HOTEL_STAR * nights
+        return Money(current_rules().hotel_rate(self.stars) * nights)
+    
+    def price_cents(self, nights):
+        """Precio del hotel en centavos enteros (ver Product.price_cents)"""
+        return current_rules().hotel_rate(self.stars) * nights
     
     def __str__(self):
         """
@@ -1,15 +1,19 @@
 from models.accommodation import Accommodation
+from models.money import Money
+from models.pricing_rules import current_rules
 
 
 class House(Accommodation):
     """
     Representa una casa o departamento.
-    Precios por noche:
+    Precios por noche por defecto (ver models/pricing_rules.py):
     - Monoambiente (1): $15,000
     - Entre 2 y 4 ambientes: $30,000
     - Más de 4 ambientes: $50,000
     """
     
+    __slots__ = ('rooms',)
+    
     def __init__(self, address, rooms):
         """
         Inicializa una casa.
@@ -29,24 +33,23 @@ class House(Accommodation):
             nights (int): Cantidad de noches
             
         Returns:
-            float: Precio total de la casa
+            Money: Precio total de la casa
         """
-        price_per_night = self._get_price_per_night()
-        return price_per_night * nights
+        return Money(current_rules().house_rate(self.rooms) * nights)
+    
+    def price_cents(self, nights):
+        """Precio de la casa en centavos enteros (ver Product.price_cents)"""
+        return current_rules().house_rate(self.rooms) * nights
     
     def _get_price_per_night(self):
         """
-        Determina el precio por noche según la cantidad de ambientes.
+        Determina el precio por noche según la cantidad de ambientes,
+        con la tabla de tramos de las reglas vigentes.
         
         Returns:
-            int: Precio por noche
-        """
-        if self.rooms == 1:
-            return 15000 
-        elif 2 <= self.rooms <= 4:
-            return 30000 
-        else: 
-            return 50000
+            Money: Precio por noche
+        """
+        return Money(current_rules().house_rate(self.rooms))
     
     def __str__(self):
         """
@@ -0,0 +1,20 @@
+import sys
+
+
+def intern_text(value):
+    """
+    Retorna la instancia compartida de un texto repetido.
+    
+    Los productos guardan muchos textos que se repiten (aerolíneas,
+    direcciones, fechas ISO). Internarlos hace que todas las instancias
+    apunten a la misma cadena en lugar de guardar una copia cada una.
+    
+    Args:
+        value (str | None): Texto a internar
+        
+    Returns:
+        str | None: La cadena compartida, o el valor sin cambios si no es texto
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
@@ -0,0 +1,231 @@
+import time
+from array import array
+from collections import namedtuple
+
+from models.money import to_cents, from_cents
+
+
+COLUMNS = ('product_ids', 'prices', 'nights', 'units', 'timestamps')
+
+PurchaseRecord = namedtuple('PurchaseRecord', ['product', 'price', 'nights', 'units', 'timestamp'])
+
+
+class PurchaseLedger:
+    """
+    Historial de compras almacenado por columnas tipadas.
+
+    En lugar de un diccionario por compra se guardan arreglos compactos
+    (`array`) con el id del producto, el precio en centavos, las noches, las
+    unidades y la fecha de cada compra. Los productos se guardan una sola vez
+    en una tabla interna. Cantidad, total y total por tipo de producto se
+    mantienen al registrar cada compra, así que consultarlos es O(1).
+    """
+
+    def __init__(self):
+        self.product_ids = array('q')
+        self.prices = array('q')
+        self.nights = array('q')
+        self.units = array('q')
+        self.timestamps = array('d')
+        self._products = []
+        self._product_ids = {}
+        self._total_cents = 0
+        self._cents_by_type = {}
+
+    def append(self, product, price, nights=0, units=1, timestamp=None, type_name=None):
+        """
+        Registra una compra.
+
+        Si algún valor es inválido (ej: noches que no son enteras) no se
+        registra nada: las columnas nunca quedan con largos distintos.
+
+        Args:
+            product (Product): Producto comprado
+            price (Money): Precio pagado
+            nights (int): Noches compradas (0 si no aplica)
+            units (int): Unidades compradas (ej: casas de un complejo)
+            timestamp (float): Momento de la compra (por defecto, ahora)
+            type_name (str): Tipo del producto para los totales (por defecto,
+                el nombre de su clase)
+        """
+        length = len(self.prices)
+        known = len(self._products)
+        try:
+            cents = self._append_row(product, price, nights, units, timestamp)
+        except BaseException:
+            self._truncate(length, known)
+            raise
+        self._count(product, cents, type_name)
+
+    def extend(self, records):
+        """
+        Registra varias compras: todas o ninguna.
+
+        Args:
+            records (iterable): Tuplas (producto, precio, noches, unidades)
+
+        Raises:
+            TypeError, ValueError, OverflowError: Si algún valor es inválido;
+                en ese caso el historial queda como estaba
+        """
+        length = len(self.prices)
+        known = len(self._products)
+        counted = []
+        try:
+            for product, price, nights, units in records:
+                counted.append((product, self._append_row(product, price, nights, units, None)))
+        except BaseException:
+            self._truncate(length, known)
+            raise
+        for product, cents in counted:
+            self._count(product, cents, None)
+
+    def _append_row(self, product, price, nights, units, timestamp):
+        """Agrega una fila a las columnas y retorna su precio en centavos."""
+        product_id = self._product_ids.get(id(product))
+        if product_id is None:
+            product_id = self._product_ids[id(product)] = len(self._products)
+            self._products.append(product)
+
+        cents = to_cents(price)
+        self.product_ids.append(product_id)
+        self.prices.append(cents)
+        self.nights.append(nights)
+        self.units.append(units)
+        self.timestamps.append(time.time() if timestamp is None else timestamp)
+        return cents
+
+    def _count(self, product, cents, type_name):
+        """Suma una compra ya registrada a los totales."""
+        self._total_cents += cents
+        if type_name is None:
+            type_name = type(product).__name__
+        self._cents_by_type[type_name] = self._cents_by_type.get(type_name, 0) + cents
+
+    def _truncate(self, length, known):
+        """Descarta las filas y productos agregados desde `length` y `known`."""
+        for name in COLUMNS:
+            del getattr(self, name)[length:]
+        for product in self._products[known:]:
+            del self._product_ids[id(product)]
+        del self._products[known:]
+
+    def __len__(self):
+        return len(self.prices)
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("El historial solo admite rebanadas contiguas")
+            return self.view(start, stop)
+        if index < 0:
+            index += len(self)
+        return PurchaseRecord(
+            self._products[self.product_ids[index]],
+            from_cents(self.prices[index]),
+            self.nights[index],
+            self.units[index],
+            self.timestamps[index]
+        )
+
+    def view(self, start=0, stop=None):
+        """
+        Retorna una vista de un rango de compras sin copiar las columnas.
+
+        Args:
+            start (int): Primera compra incluida
+            stop (int): Compra final (excluida); por defecto, la última
+
+        Returns:
+            LedgerView: Vista del rango
+        """
+        return LedgerView(self, start, len(self) if stop is None else stop)
+
+    @property
+    def count(self):
+        """int: Cantidad de compras registradas"""
+        return len(self.prices)
+
+    @property
+    def total_spent(self):
+        """Money: Total gastado en todas las compras"""
+        return from_cents(self._total_cents)
+
+    def total_by_type(self, product_type):
+        """
+        Total gastado en un tipo de producto.
+
+        Args:
+            product_type (type | str): Clase del producto o su nombre
+
+        Returns:
+            Money: Total gastado en ese tipo
+        """
+        if isinstance(product_type, type):
+            product_type = product_type.__name__
+        return from_cents(self._cents_by_type.get(product_type, 0))
+
+    def totals_by_type(self):
+        """
+        Total gastado por cada tipo de producto.
+
+        Returns:
+            dict: Nombre del tipo -> total gastado
+        """
+        return {name: from_cents(cents) for name, cents in self._cents_by_type.items()}
+
+    def products(self):
+        """
+        Retorna los productos distintos comprados, en orden de primera compra.
+
+        Returns:
+            list: Productos
+        """
+        return list(self._products)
+
+
+class LedgerView:
+    """
+    Vista de un rango contiguo del historial, sin copia de datos.
+    """
+
+    def __init__(self, ledger, start, stop):
+        self.ledger = ledger
+        self.start = max(0, start)
+        self.stop = min(stop, len(ledger))
+
+    def __len__(self):
+        return max(0, self.stop - self.start)
+
+    def __iter__(self):
+        ledger = self.ledger
+        for index in range(self.start, self.stop):
+            yield ledger[index]
+
+    def column(self, name):
+        """
+        Retorna una copia de una columna del rango.
+
+        Es una copia (un `array` del mismo tipo) y no una vista sobre el
+        historial: una vista exportada impediría que el historial siga
+        creciendo mientras alguien la tiene.
+
+        Args:
+            name (str): 'product_ids', 'prices', 'nights', 'units' o 'timestamps'
+
+        Returns:
+            array: Valores de la columna en el rango
+        """
+        if name not in COLUMNS:
+            raise ValueError(f"Columna desconocida: {name}")
+        return getattr(self.ledger, name)[self.start:self.stop]
+
+    @property
+    def total_spent(self):
+        """Money: Total gastado en el rango"""
+        return from_cents(sum(self.column('prices')))
+
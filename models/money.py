@@ -0,0 +1,390 @@
+"""
+Importes de dinero en centavos enteros.
+
+Todos los precios, presupuestos y totales se representan con `Money`, que
+guarda un entero de centavos: sumar, restar y multiplicar por noches o
+unidades es exacto y los valores pasan directo a columnas int64.
+
+Política de redondeo (la única fuente de redondeo del sistema):
+- Al convertir un número a Money se redondea al centavo, con las mitades
+  hacia arriba (0.005 -> 0.01).
+- Los descuentos se expresan en puntos básicos (1% = 100 pb) y el precio
+  con descuento se redondea al centavo con las mitades hacia arriba.
+- Dividir Money por un entero con `/` redondea igual; con `//` trunca hacia
+  abajo (sirve para "cuánto entra en un presupuesto").
+
+Money se compara y opera con números comunes, interpretados en la unidad de
+la moneda (1500 es $1.500, no 1500 centavos), y se formatea igual que un
+número: f"{precio:,.0f}". Operar redondea el número al centavo; comparar no
+redondea: la comparación es exacta, como entre Decimal y float. Así la
+igualdad es transitiva y coincide con el hash, pero Money.of(19.99) no es
+igual al float 19.99 (que vale 19.989999...). Para comparar con un importe
+en float, convertirlo antes con Money.of (las funciones que reciben un
+presupuesto "Money | float" lo hacen).
+"""
+import math
+import operator
+from decimal import Decimal, ROUND_HALF_UP
+
+
+CENTS_PER_UNIT = 100
+BASIS_POINTS = 10000  # 100% en puntos básicos
+
+# Por debajo de este valor un float conserva los centavos con holgura
+_FAST_FLOAT_LIMIT = 2 ** 40
+_HALF_TOLERANCE = 1e-6
+
+
+class Money:
+    """
+    Importe inmutable guardado como un entero de centavos.
+    """
+
+    __slots__ = ('cents',)
+
+    def __init__(self, cents=0):
+        """
+        Crea un importe a partir de centavos.
+
+        Args:
+            cents (int): Importe en centavos
+
+        Raises:
+            TypeError: Si los centavos no son un entero (ej: 2.5 noches
+                multiplicadas por una tarifa)
+
+        Para convertir desde pesos (o desde un float o Decimal) usar `Money.of`.
+        """
+        if type(cents) is not int:
+            cents = _int_cents(cents)
+        self.cents = cents
+
+    @classmethod
+    def of(cls, amount):
+        """
+        Convierte un importe en unidades de la moneda.
+
+        Args:
+            amount (Money | int | float | Decimal | str): Importe
+
+        Returns:
+            Money: Importe redondeado al centavo (mitades hacia arriba)
+
+        Raises:
+            TypeError: Si el valor no es un importe
+        """
+        if isinstance(amount, Money):
+            return amount
+        return cls(_to_cents(amount))
+
+    def to_decimal(self):
+        """
+        Retorna el importe como Decimal exacto.
+
+        Returns:
+            Decimal: Importe en unidades de la moneda
+        """
+        return Decimal(self.cents).scaleb(-2)
+
+    def apply_discount(self, basis_points):
+        """
+        Aplica un descuento con la política de redondeo del módulo.
+
+        Args:
+            basis_points (int): Descuento en puntos básicos (1000 = 10%)
+
+        Returns:
+            Money: Importe con el descuento aplicado
+        """
+        scaled = self.cents * (BASIS_POINTS - basis_points)
+        if scaled >= 0:
+            return Money((scaled + BASIS_POINTS // 2) // BASIS_POINTS)
+        return Money(_div_half_up(scaled, BASIS_POINTS))
+
+    # Aritmética (con Money se evita toda conversión: es el camino caliente)
+
+    def __add__(self, other):
+        if type(other) is Money:
+            return Money(self.cents + other.cents)
+        cents = _cents_or_none(other)
+        if cents is None:
+            return NotImplemented
+        return Money(self.cents + cents)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if type(other) is Money:
+            return Money(self.cents - other.cents)
+        cents = _cents_or_none(other)
+        if cents is None:
+            return NotImplemented
+        return Money(self.cents - cents)
+
+    def __rsub__(self, other):
+        cents = _cents_or_none(other)
+        if cents is None:
+            return NotImplemented
+        return Money(cents - self.cents)
+
+    def __mul__(self, factor):
+        if isinstance(factor, int) and not isinstance(factor, bool):
+            return Money(self.cents * factor)
+        if isinstance(factor, (float, Decimal)):
+            return Money(_round_half_up(Decimal(self.cents) * _as_decimal(factor)))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Money):
+            return self.cents / other.cents
+        if isinstance(other, int) and not isinstance(other, bool):
+            return Money(_div_half_up(self.cents, other))
+        if isinstance(other, (float, Decimal)):
+            return Money(_round_half_up(Decimal(self.cents) / _as_decimal(other)))
+        return NotImplemented
+
+    def __floordiv__(self, other):
+        if isinstance(other, Money):
+            return self.cents // other.cents
+        if isinstance(other, int) and not isinstance(other, bool):
+            return Money(self.cents // other)
+        cents = _cents_or_none(other)
+        if cents is None:
+            return NotImplemented
+        return self.cents // cents
+
+    def __rfloordiv__(self, other):
+        cents = _cents_or_none(other)
+        if cents is None:
+            return NotImplemented
+        return cents // self.cents
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    # Comparaciones (con Money o con números en unidades de la moneda, exactas)
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        pair = _comparable(self, other)
+        if pair is None:
+            return NotImplemented
+        return pair[0] == pair[1]
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        pair = _comparable(self, other)
+        if pair is None:
+            return NotImplemented
+        return pair[0] < pair[1]
+
+    def __le__(self, other):
+        if isinstance(other, Money):
+            return self.cents <= other.cents
+        pair = _comparable(self, other)
+        if pair is None:
+            return NotImplemented
+        return pair[0] <= pair[1]
+
+    def __gt__(self, other):
+        if isinstance(other, Money):
+            return self.cents > other.cents
+        pair = _comparable(self, other)
+        if pair is None:
+            return NotImplemented
+        return pair[0] > pair[1]
+
+    def __ge__(self, other):
+        if isinstance(other, Money):
+            return self.cents >= other.cents
+        pair = _comparable(self, other)
+        if pair is None:
+            return NotImplemented
+        return pair[0] >= pair[1]
+
+    def __hash__(self):
+        # Igual que el hash del número equivalente (int, float, Decimal)
+        if self.cents % CENTS_PER_UNIT == 0:
+            return hash(self.cents // CENTS_PER_UNIT)
+        return hash(self.to_decimal())
+
+    def __bool__(self):
+        return self.cents != 0
+
+    # Conversiones
+
+    def __int__(self):
+        return int(self.to_decimal())
+
+    def __float__(self):
+        return self.cents / CENTS_PER_UNIT
+
+    def __format__(self, spec):
+        if not spec:
+            return str(self)
+        return format(self.to_decimal(), spec)
+
+    def __str__(self):
+        if self.cents % CENTS_PER_UNIT == 0:
+            return str(self.cents // CENTS_PER_UNIT)
+        return str(self.to_decimal())
+
+    def __repr__(self):
+        return f"Money('{self.to_decimal()}')"
+
+    def __reduce__(self):
+        return (Money, (self.cents,))
+
+
+ZERO = Money(0)
+
+
+def to_cents(amount):
+    """
+    Convierte un importe a centavos enteros (mitades hacia arriba).
+
+    Args:
+        amount (Money | int | float | Decimal): Importe
+
+    Returns:
+        int: Centavos
+    """
+    if isinstance(amount, Money):
+        return amount.cents
+    return _to_cents(amount)
+
+
+def from_cents(cents):
+    """
+    Convierte centavos enteros a Money.
+
+    Args:
+        cents (int): Centavos
+
+    Returns:
+        Money: Importe
+    """
+    return Money(int(cents))
+
+
+def discounted_cents(cents, basis_points):
+    """
+    Aplica un descuento a un importe en centavos, sin crear Money.
+
+    Mismo redondeo que `Money.apply_discount`; sirve para sumar muchos
+    precios con descuento y construir un solo Money con el total.
+
+    Args:
+        cents (int): Importe en centavos
+        basis_points (int): Descuento en puntos básicos (1000 = 10%)
+
+    Returns:
+        int: Centavos con el descuento aplicado
+    """
+    scaled = cents * (BASIS_POINTS - basis_points)
+    if scaled >= 0:
+        return (scaled + BASIS_POINTS // 2) // BASIS_POINTS
+    return _div_half_up(scaled, BASIS_POINTS)
+
+
+def to_basis_points(fraction):
+    """
+    Convierte una fracción (0.15 = 15%) a puntos básicos enteros.
+
+    Args:
+        fraction (int | float | Decimal): Fracción
+
+    Returns:
+        int: Puntos básicos (mitades hacia arriba)
+    """
+    return _round_half_up(_as_decimal(fraction) * BASIS_POINTS)
+
+
+def _to_cents(amount):
+    if isinstance(amount, bool):
+        raise TypeError(f"Importe inválido: {amount!r}")
+    if isinstance(amount, int):
+        return amount * CENTS_PER_UNIT
+    if isinstance(amount, float) and math.isfinite(amount) and abs(amount) < _FAST_FLOAT_LIMIT:
+        # Camino rápido: solo los valores cercanos a medio centavo dependen
+        # de la representación decimal y se resuelven con Decimal
+        scaled = amount * CENTS_PER_UNIT
+        cents = math.floor(scaled + 0.5)
+        if _HALF_TOLERANCE < scaled + 0.5 - cents < 1 - _HALF_TOLERANCE:
+            return cents
+    if isinstance(amount, (float, Decimal, str)):
+        return _round_half_up(_as_decimal(amount) * CENTS_PER_UNIT)
+    raise TypeError(f"Importe inválido: {amount!r}")
+
+
+def _int_cents(value):
+    """Centavos de un entero de otro tipo (ej: numpy.int64); rechaza float y Decimal."""
+    try:
+        return operator.index(value)
+    except TypeError:
+        raise TypeError(f"Los centavos deben ser un entero: {value!r}") from None
+
+
+def _cents_or_none(value):
+    if isinstance(value, Money):
+        return value.cents
+    try:
+        return _to_cents(value)
+    except (TypeError, ArithmeticError, ValueError):
+        return None
+
+
+def _comparable(money, value):
+    """
+    Par de valores a comparar para Money y un número, o None si no es un
+    número.
+
+    La comparación es exacta: con enteros se comparan centavos y con float o
+    Decimal se usa el Decimal exacto del número (Decimal(0.1) no es 0.1), así
+    el resultado coincide con el del hash. Los infinitos y NaN se comparan
+    como float.
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return money.cents, value * CENTS_PER_UNIT
+    if isinstance(value, float):
+        if math.isfinite(value):
+            return money.to_decimal(), Decimal(value)
+        return money.cents, value
+    if isinstance(value, Decimal):
+        if value.is_finite():
+            return money.to_decimal(), value
+        return money.cents, float(value)
+    return None
+
+
+def _as_decimal(value):
+    # repr da el float más corto que lo representa: 0.1 -> Decimal('0.1')
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+
+def _round_half_up(value):
+    return int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _div_half_up(numerator, denominator):
+    """División entera redondeando las mitades hacia arriba (alejándose de cero)."""
+    if numerator >= 0 and denominator > 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
@@ -1,4 +1,15 @@
+import threading
+from weakref import WeakSet
 from models.product import Product
+from models.accommodation import Accommodation
+from models.price_plan import PlanEntry, PricePlan
+from models.pricing_rules import current_rules
+from models import quote_cache
+
+
+# Protege la verificación de la época y el guardado de totales y planes
+# frente a invalidaciones concurrentes (el cálculo se hace sin el lock)
+_cache_lock = threading.Lock()
 
 
 class Package(Product):
@@ -6,8 +17,22 @@ class Package(Product):
     Representa un paquete turístico compuesto por múltiples productos.
     Puede contener vuelos, alojamientos e incluso otros paquetes.
     El precio total es la suma de todos los productos incluidos.
+    
+    Los totales se memorizan por cantidad de noches. Al agregar o quitar
+    productos se invalida el paquete y todos los paquetes que lo contienen,
+    de modo que solo se vuelve a cotizar el camino que cambió. Si cambian las
+    reglas de precios (models/pricing_rules.py) los totales se descartan.
+    
+    Cada invalidación incrementa `_epoch`; un total o un plan calculado
+    mientras otro hilo modificaba el paquete no se guarda (igual que en
+    `QuoteCache.quote`).
     """
     
+    __slots__ = ('name', 'description', 'products', '_price_cache', '_cache_generation',
+                 '_parents', '_plan', '_epoch')
+    
+    _cache_quotes = True  # Ver models/quote_cache.py
+    
     def __init__(self, name, description=""):
         """
         Inicializa un paquete.
@@ -19,6 +44,11 @@ class Package(Product):
         self.name = name
         self.description = description
         self.products = []
+        self._price_cache = {}
+        self._cache_generation = current_rules().generation
+        self._parents = WeakSet()
+        self._plan = None
+        self._epoch = 0
     
     def add_product(self, product):
         """
@@ -34,6 +64,9 @@ class Package(Product):
             raise TypeError(f"Solo se pueden agregar productos. Recibido: {type(product).__name__}")
         
         self.products.append(product)
+        if isinstance(product, Package):
+            product._parents.add(self)
+        self.invalidate_price_cache()
     
     def remove_product(self, product):
         """
@@ -47,9 +80,36 @@ class Package(Product):
         """
         try:
             self.products.remove(product)
-            return True
         except ValueError:
             return False
+        
+        if isinstance(product, Package) and product not in self.products:
+            product._parents.discard(self)
+        self.invalidate_price_cache()
+        return True
+    
+    def invalidate_price_cache(self):
+        """
+        Descarta los totales memorizados del paquete y de todos sus ancestros,
+        también en la caché compartida de cotizaciones.
+        
+        Se llama automáticamente al agregar o quitar productos. Si se modifica
+        un producto ya incluido (por ejemplo, las estrellas de un hotel) hay
+        que llamarlo manualmente sobre el paquete que lo contiene.
+        """
+        pending = [self]
+        visited = set()
+        while pending:
+            package = pending.pop()
+            if id(package) in visited:
+                continue
+            visited.add(id(package))
+            with _cache_lock:
+                package._epoch += 1
+                package._price_cache.clear()
+                package._plan = None
+            quote_cache.invalidate(package)
+            pending.extend(package._parents)
     
     def calculate_price(self, **kwargs):
         """
@@ -61,27 +121,114 @@ class Package(Product):
                      (por ejemplo, nights para alojamientos)
         
         Returns:
-            float: Precio total del paquete
+            Money: Precio total del paquete
             
         Note:
             Para alojamientos, debes especificar 'nights' en kwargs.
             Ejemplo: package.calculate_price(nights=5)
         """
-        total = 0
+        generation = current_rules().generation
+        if generation != self._cache_generation:
+            with _cache_lock:
+                self._epoch += 1
+                self._price_cache.clear()
+                self._plan = None
+                self._cache_generation = generation
         
-        for product in self.products:
-            if hasattr(product, 'airline'):
-                total += product.calculate_price()
-            elif hasattr(product, 'address'): 
-                nights = kwargs.get('nights', 1)
-                total += product.calculate_price(nights)
-            elif isinstance(product, Package):
-                total += product.calculate_price(**kwargs)
-            else:
-                total += product.calculate_price()
+        nights = kwargs.get('nights', 1)
+        cached = self._price_cache.get(nights)
+        if cached is not None:
+            return cached
         
+        # El plan compilado recorre el árbol sin recursión: la profundidad
+        # de los sub-paquetes no está limitada por el límite de recursión
+        epoch = self._epoch
+        total = self.compile().evaluate(nights)
+        with _cache_lock:
+            # Si el paquete cambió mientras se calculaba, el total puede ser viejo
+            if epoch == self._epoch:
+                self._price_cache[nights] = total
         return total
     
+    def compile(self):
+        """
+        Aplana el paquete y sus sub-paquetes en un plan de precio lineal.
+        
+        Los sub-paquetes compartidos se procesan una sola vez: su multiplicidad
+        es la suma de las multiplicidades de los paquetes que los contienen.
+        El recorrido usa una pila explícita, por lo que no depende del límite
+        de recursión. El plan se conserva hasta que el paquete se modifica.
+        
+        Returns:
+            PricePlan: Plan equivalente a `calculate_price`
+            
+        Raises:
+            ValueError: Si un paquete se contiene a sí mismo
+        """
+        plan = self._plan
+        if plan is not None:
+            return plan
+        
+        epoch = self._epoch
+        multiplicity = {id(self): 1}
+        # Nivel de cada paquete: el camino más largo desde este (el orden
+        # topológico procesa a todos los que contienen un paquete antes que a él)
+        level = {id(self): 1}
+        leaves = {}
+        for package in self._topological_order():
+            factor = multiplicity[id(package)]
+            child_level = level[id(package)] + 1
+            for product in package.products:
+                if isinstance(product, Package):
+                    multiplicity[id(product)] = multiplicity.get(id(product), 0) + factor
+                    if level.get(id(product), 0) < child_level:
+                        level[id(product)] = child_level
+                elif id(product) in leaves:
+                    leaves[id(product)][1] += factor
+                else:
+                    leaves[id(product)] = [product, factor]
+        
+        plan = PricePlan([
+            PlanEntry(product, count, isinstance(product, Accommodation))
+            for product, count in leaves.values()
+        ], max(level.values()))
+        with _cache_lock:
+            if epoch == self._epoch:
+                self._plan = plan
+        return plan
+    
+    def _topological_order(self):
+        """
+        Ordena los paquetes alcanzables de modo que cada uno aparezca antes
+        que los sub-paquetes que contiene.
+        
+        Returns:
+            list: Paquetes en orden topológico, empezando por este
+        """
+        in_progress = {id(self)}
+        done = set()
+        postorder = []
+        stack = [(self, iter(self.products))]
+        
+        while stack:
+            package, children = stack[-1]
+            for product in children:
+                if not isinstance(product, Package) or id(product) in done:
+                    continue
+                if id(product) in in_progress:
+                    raise ValueError(f"El paquete '{product.name}' se contiene a sí mismo")
+                in_progress.add(id(product))
+                stack.append((product, iter(product.products)))
+                break
+            else:
+                stack.pop()
+                in_progress.discard(id(package))
+                done.add(id(package))
+                postorder.append(package)
+        
+        postorder.reverse()
+        return postorder
+    
     def get_products_count(self):
         """
         Retorna la cantidad de productos en el paquete.
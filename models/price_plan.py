@@ -0,0 +1,60 @@
+from collections import namedtuple
+
+from models.money import Money
+
+
+PlanEntry = namedtuple('PlanEntry', ['product', 'multiplicity', 'needs_nights'])
+
+
+class PricePlan:
+    """
+    Plan de precio lineal obtenido al compilar un paquete.
+
+    Cada producto hoja aparece una sola vez con la cantidad de veces que
+    figura en el árbol (multiplicidad). Los productos cuyo precio no depende
+    de las noches se suman de antemano en una constante, así que evaluar el
+    plan es un único recorrido sin recursión. La suma se hace en centavos
+    enteros y se convierte a Money una sola vez al final.
+
+    Los precios por noche se piden a cada producto al evaluar (no se guardan
+    métodos ligados), así un plan usa siempre los métodos vigentes de la
+    clase, estén o no instrumentados (ver services/instrumentation.py).
+    """
+
+    def __init__(self, entries, depth=1):
+        """
+        Inicializa el plan.
+
+        Args:
+            entries (list): Lista de PlanEntry (producto, multiplicidad, usa noches)
+            depth (int): Niveles de paquetes anidados del árbol compilado
+        """
+        self.entries = entries
+        self.depth = depth
+        self.constant = sum(
+            entry.product.price_cents() * entry.multiplicity
+            for entry in entries if not entry.needs_nights
+        )
+        self._nightly = [
+            (entry.product, entry.multiplicity)
+            for entry in entries if entry.needs_nights
+        ]
+
+    def evaluate(self, nights=1):
+        """
+        Calcula el precio total del plan para una cantidad de noches.
+
+        Args:
+            nights (int): Cantidad de noches para los alojamientos
+
+        Returns:
+            Money: Precio total
+        """
+        total = self.constant
+        for product, multiplicity in self._nightly:
+            total += product.price_cents(nights) * multiplicity
+        return Money(total)
+
+    def __len__(self):
+        return len(self.entries)
+
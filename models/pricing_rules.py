@@ -0,0 +1,303 @@
+"""
+Reglas de precios de alojamientos compiladas en tablas de consulta.
+
+Las reglas (tarifas por estrella, tramos de ambientes de las casas y
+descuentos de los complejos) se definen en un diccionario o en un archivo
+JSON y se compilan en tuplas indexadas por estrellas, ambientes o unidades,
+así cotizar es una consulta por índice en lugar de evaluar condiciones.
+Las tablas guardan las tarifas en centavos y los descuentos en puntos
+básicos (ver models/money.py), de modo que los precios son enteros exactos.
+
+Las reglas vigentes se reemplazan de forma atómica con `install_rules`: los
+lectores toman la referencia actual con `current_rules()` y nunca ven una
+tabla a medio armar. Cada instalación incrementa `generation`, que usan los
+paquetes y complejos para descartar los precios que tenían en caché.
+
+Formato (las secciones que falten toman los valores de constants.py):
+    {
+        "hotel": {"price_per_star": 10000, "star_rates": {"5": 60000}},
+        "house": {
+            "room_tiers": [{"max_rooms": 1, "price": 15000},
+                           {"max_rooms": 4, "price": 30000}],
+            "default_price": 50000
+        },
+        "complex": {"discount_per_unit": 0.10, "max_discount": 0.50,
+                    "discounts": {"2": 0.15}}
+    }
+"""
+import threading
+
+from models.money import BASIS_POINTS, to_cents, from_cents, to_basis_points
+from constants import (
+    PRICE_PER_HOTEL_STAR,
+    PRICE_HOUSE_STUDIO, PRICE_HOUSE_MEDIUM, PRICE_HOUSE_LARGE, MAX_ROOMS_HOUSE_MEDIUM,
+    DISCOUNT_PER_UNIT_COMPLEX, MAX_DISCOUNT_COMPLEX
+)
+
+
+# Las tablas de estrellas cubren al menos este rango
+MIN_STAR_TABLE = 5
+
+DEFAULT_SPEC = {
+    'hotel': {'price_per_star': PRICE_PER_HOTEL_STAR},
+    'house': {
+        'room_tiers': [
+            {'max_rooms': 1, 'price': PRICE_HOUSE_STUDIO},
+            {'max_rooms': MAX_ROOMS_HOUSE_MEDIUM, 'price': PRICE_HOUSE_MEDIUM},
+        ],
+        'default_price': PRICE_HOUSE_LARGE,
+    },
+    'complex': {
+        'discount_per_unit': DISCOUNT_PER_UNIT_COMPLEX,
+        'max_discount': MAX_DISCOUNT_COMPLEX,
+    },
+}
+
+
+class PricingRules:
+    """
+    Conjunto de reglas de precios compilado e inmutable.
+    
+    `spec` conserva las reglas tal como se escribieron (en pesos y
+    fracciones); las tablas compiladas están en centavos y puntos básicos.
+    """
+
+    __slots__ = ('spec', 'star_rates', 'price_per_star', 'room_rates', 'default_room_rate',
+                 'discounts', 'discount_per_unit', 'max_discount', 'generation')
+
+    def __init__(self, spec=None):
+        """
+        Compila las reglas.
+
+        Args:
+            spec (dict): Reglas en el formato del módulo; las secciones que
+                falten toman los valores de constants.py
+
+        Raises:
+            ValueError: Si falta un campo, alguna tarifa es negativa, un
+                descuento está fuera de [0, 1) o los tramos de ambientes se
+                superponen
+        """
+        spec = spec or {}
+        self.spec = {section: dict(spec.get(section) or DEFAULT_SPEC[section])
+                     for section in DEFAULT_SPEC}
+        self.generation = 0
+        try:
+            self._compile_hotel(self.spec['hotel'])
+            self._compile_house(self.spec['house'])
+            self._compile_complex(self.spec['complex'])
+        except KeyError as error:
+            raise ValueError(f"Falta el campo {error.args[0]!r} en las reglas de precios")
+        except (TypeError, ArithmeticError) as error:
+            raise ValueError(f"Reglas de precios inválidas: {error}")
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Lee y compila reglas desde un archivo JSON.
+
+        Args:
+            path (str): Archivo de reglas
+
+        Returns:
+            PricingRules: Reglas compiladas
+
+        Raises:
+            ValueError: Si el archivo no es JSON válido o las reglas son inválidas
+        """
+        import json  # Solo se usa acá: no se paga al importar el módulo
+
+        with open(path, encoding='utf-8') as file:
+            spec = json.load(file)
+        if not isinstance(spec, dict):
+            raise ValueError(f"{path}: las reglas deben ser un objeto JSON")
+        return cls(spec)
+
+    def hotel_rate(self, stars):
+        """
+        Tarifa por noche de un hotel.
+
+        Args:
+            stars (int): Estrellas del hotel
+
+        Returns:
+            int: Tarifa por noche en centavos
+
+        Raises:
+            ValueError: Si las estrellas no tienen tarifa
+        """
+        if 0 <= stars < len(self.star_rates):
+            rate = self.star_rates[stars]
+            if rate is not None:
+                return rate
+        if self.price_per_star is None:
+            raise ValueError(f"No hay tarifa para hoteles de {stars} estrellas")
+        return stars * self.price_per_star
+
+    def house_rate(self, rooms):
+        """
+        Tarifa por noche de una casa según sus ambientes.
+
+        Args:
+            rooms (int): Cantidad de ambientes
+
+        Returns:
+            int: Tarifa por noche en centavos
+        """
+        if 0 <= rooms < len(self.room_rates):
+            return self.room_rates[rooms]
+        return self.default_room_rate
+
+    def complex_discount(self, units):
+        """
+        Descuento por alquilar todas las unidades de un complejo.
+
+        Args:
+            units (int): Cantidad de unidades alquiladas
+
+        Returns:
+            int: Descuento en puntos básicos (1500 = 15%)
+        """
+        if 0 <= units < len(self.discounts):
+            return self.discounts[units]
+        return min(units * self.discount_per_unit, self.max_discount)
+
+    def to_dict(self):
+        """
+        Reglas en el formato de entrada (para guardarlas en un archivo).
+
+        Returns:
+            dict: Reglas
+        """
+        return {section: dict(values) for section, values in self.spec.items()}
+
+    def _compile_hotel(self, spec):
+        price_per_star = spec.get('price_per_star')
+        self.price_per_star = None if price_per_star is None else to_cents(price_per_star)
+        explicit = {int(stars): to_cents(rate) for stars, rate in spec.get('star_rates', {}).items()}
+        if self.price_per_star is None and not explicit:
+            raise ValueError("Las reglas de hotel necesitan price_per_star o star_rates")
+
+        size = max([MIN_STAR_TABLE] + list(explicit)) + 1
+        table = []
+        for stars in range(size):
+            if stars in explicit:
+                table.append(explicit[stars])
+            elif self.price_per_star is not None:
+                table.append(stars * self.price_per_star)
+            else:
+                table.append(None)
+        # Sin tarifa por estrella, las estrellas sin tarifa explícita quedan en None
+        _check_rates(rate for rate in table if rate is not None)
+        self.star_rates = tuple(table)
+
+    def _compile_house(self, spec):
+        self.default_room_rate = to_cents(spec['default_price'])
+        tiers = sorted(spec.get('room_tiers', []), key=lambda tier: tier['max_rooms'])
+        size = tiers[-1]['max_rooms'] + 1 if tiers else 0
+        table = [self.default_room_rate] * size
+        previous = -1
+        for tier in tiers:
+            # Sin min_rooms, el tramo empieza después del anterior (y desde 1)
+            low = tier.get('min_rooms', max(previous + 1, 1))
+            high = tier['max_rooms']
+            if low <= previous or low > high:
+                raise ValueError(f"Tramo de ambientes inválido o superpuesto: {tier}")
+            table[low:high + 1] = [to_cents(tier['price'])] * (high - low + 1)
+            previous = high
+        _check_rates(table + [self.default_room_rate])
+        self.room_rates = tuple(table)
+
+    def _compile_complex(self, spec):
+        self.discount_per_unit = to_basis_points(spec.get('discount_per_unit', 0))
+        self.max_discount = to_basis_points(spec.get('max_discount', 0))
+        explicit = {int(units): to_basis_points(discount)
+                    for units, discount in spec.get('discounts', {}).items()}
+
+        # La tabla llega hasta donde el descuento por unidad alcanza el máximo
+        saturation = 0
+        if self.discount_per_unit > 0:
+            saturation = self.max_discount // self.discount_per_unit + 1
+        size = max([saturation] + list(explicit)) + 1
+        table = tuple(
+            explicit[units] if units in explicit
+            else min(units * self.discount_per_unit, self.max_discount)
+            for units in range(size)
+        )
+        for discount in table + (self.max_discount,):
+            if not 0 <= discount < BASIS_POINTS:
+                raise ValueError(f"Descuento inválido: {discount / BASIS_POINTS} "
+                                 f"(debe estar entre 0 y 1)")
+        self.discounts = table
+
+
+def _check_rates(rates):
+    for rate in rates:
+        if rate < 0:
+            raise ValueError(f"Tarifa inválida: {from_cents(rate)} (no puede ser negativa)")
+
+
+_swap_lock = threading.Lock()
+_current = PricingRules()
+
+
+def current_rules():
+    """
+    Reglas vigentes.
+
+    Quien cotiza varios productos debe tomar la referencia una vez y usarla
+    en todo el cálculo, así un reemplazo simultáneo no mezcla dos tablas.
+
+    Returns:
+        PricingRules: Reglas instaladas
+    """
+    return _current
+
+
+def install_rules(rules):
+    """
+    Reemplaza las reglas vigentes de forma atómica.
+
+    Los cálculos en curso terminan con las reglas que tomaron; los
+    siguientes usan las nuevas. Los precios en caché de paquetes y
+    complejos se descartan al próximo uso.
+
+    Args:
+        rules (PricingRules | dict): Reglas compiladas o su especificación
+
+    Returns:
+        PricingRules: Reglas instaladas
+    """
+    global _current
+    if not isinstance(rules, PricingRules):
+        rules = PricingRules(rules)
+    with _swap_lock:
+        rules.generation = _current.generation + 1
+        _current = rules
+    return rules
+
+
+def load_rules(path):
+    """
+    Compila las reglas de un archivo JSON y las instala.
+
+    Si el archivo es inválido se lanza la excepción y las reglas vigentes
+    no cambian.
+
+    Args:
+        path (str): Archivo de reglas
+
+    Returns:
+        PricingRules: Reglas instaladas
+    """
+    return install_rules(PricingRules.from_file(path))
+
+
+def reset_rules():
+    """
+    Vuelve a instalar las reglas por defecto de constants.py.
+
+    Returns:
+        PricingRules: Reglas instaladas
+    """
+    return install_rules(PricingRules())
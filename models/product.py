@@ -1,17 +1,42 @@
 from abc import ABC, abstractmethod
 
+from models.money import to_cents
+
 
 class Product(ABC):
     """
     Clase abstracta base para todos los productos de la agencia.
+    
+    Todas las clases de productos declaran `__slots__` para que cada
+    instancia ocupe poca memoria (no tienen `__dict__`).
     """
     
+    __slots__ = ('__weakref__',)
+    
     @abstractmethod
     def calculate_price(self):
         """
         Calcula y retorna el precio del producto.
+        
+        Returns:
+            Money: Precio en centavos enteros (ver models/money.py)
         """
         pass
     
+    def price_cents(self, *args, **kwargs):
+        """
+        Precio en centavos enteros, con los mismos parámetros que
+        `calculate_price`.
+        
+        Lo usan los cálculos que suman muchos precios (paquetes, planes,
+        complejos) para no crear un Money por cada término: el Money se
+        construye una sola vez con el total. Las subclases lo redefinen
+        para no pasar por Money.
+        
+        Returns:
+            int: Precio en centavos
+        """
+        return to_cents(self.calculate_price(*args, **kwargs))
+    
     def __str__(self):
         return f"{self.__class__.__name__}"
\ No newline at end of file
@@ -0,0 +1,57 @@
+from collections import namedtuple
+
+
+PURCHASE_OK = 'ok'
+PURCHASE_INVALID_PRODUCT = 'invalid_product'
+PURCHASE_MISSING_PARAMS = 'missing_params'
+PURCHASE_INSUFFICIENT_FUNDS = 'insufficient_funds'
+PURCHASE_UNAVAILABLE = 'unavailable'
+
+
+class PurchaseResult:
+    """
+    Resultado de una compra (o de su simulación).
+    
+    Se evalúa como booleano según si la compra fue exitosa, así que puede
+    usarse igual que el valor de retorno anterior de `purchase_product`.
+    
+    Attributes:
+        success (bool): True si la compra se realizó (o se podría realizar)
+        price (Money): Precio calculado, o None si no se pudo calcular
+        remaining_budget (Money | float): Presupuesto del usuario tras la operación
+        shortfall (Money): Monto faltante si no alcanzaron los fondos, si no 0
+        reason (str): Código del resultado (constantes PURCHASE_*)
+    """
+    
+    __slots__ = ('success', 'price', 'remaining_budget', 'shortfall', 'reason')
+    
+    def __init__(self, success, price, remaining_budget, reason):
+        self.success = success
+        self.price = price
+        self.remaining_budget = remaining_budget
+        self.reason = reason
+        if reason == PURCHASE_INSUFFICIENT_FUNDS:
+            self.shortfall = price - remaining_budget
+        else:
+            self.shortfall = 0
+    
+    def __bool__(self):
+        return self.success
+    
+    def __repr__(self):
+        return (f"PurchaseResult(success={self.success}, price={self.price}, "
+                f"remaining_budget={self.remaining_budget}, reason='{self.reason}')")
+
+
+PurchaseEvent = namedtuple('PurchaseEvent', ['user', 'product', 'result', 'entries'],
+                           defaults=(None,))
+PurchaseEvent.__doc__ = """
+Evento emitido por `User` en cada compra.
+
+Attributes:
+    user (User): Usuario que compró
+    product (Product | list): Producto comprado, o lista de productos para un carrito
+    result (PurchaseResult): Resultado de la compra
+    entries (list): Compras registradas, como tuplas (producto, precio, kwargs);
+        None si la compra falló
+"""
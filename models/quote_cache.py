@@ -0,0 +1,232 @@
+"""
+Caché LRU compartida de cotizaciones (producto + parámetros -> precio).
+
+Los usuarios cotizan una y otra vez los mismos productos: al verificar si
+pueden pagarlos, al comprarlos y al calcular noches máximas. La caché guarda
+esos precios por identidad del producto y parámetros de la cotización, con
+tamaño acotado (se descarta el menos usado) y vencimiento opcional.
+
+Solo se guardan los productos caros de cotizar, los que declaran
+`_cache_quotes = True` (paquetes y complejos): para vuelos, hoteles y casas
+el precio es una multiplicación y buscarlo en la caché costaría más que
+calcularlo.
+
+Las entradas se invalidan solas al cambiar las reglas de precios (se
+compara `generation`) y al modificar un paquete o un complejo. Si se
+modifica otro producto en el lugar hay que llamar a `invalidate(product)`.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from models.pricing_rules import current_rules
+
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'evictions', 'expirations',
+                                       'invalidations', 'size'])
+CacheStats.__doc__ = """
+Contadores de la caché de cotizaciones.
+
+Attributes:
+    hits (int): Cotizaciones encontradas en la caché
+    misses (int): Cotizaciones calculadas
+    evictions (int): Entradas descartadas por falta de lugar
+    expirations (int): Entradas descartadas por vencidas
+    invalidations (int): Entradas descartadas por cambios en los productos
+    size (int): Entradas actuales
+"""
+
+_Entry = namedtuple('_Entry', ['product', 'price', 'generation', 'expires_at'])
+
+
+class QuoteCache:
+    """
+    Caché LRU de cotizaciones, segura entre hilos.
+
+    Ejemplo:
+        cache = QuoteCache(max_size=10000, ttl=60)
+        price = cache.quote(paquete, {'nights': 3})
+        cache.stats()
+    """
+
+    def __init__(self, max_size=100000, ttl=None, clock=time.monotonic):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_size (int): Cantidad máxima de cotizaciones guardadas
+            ttl (float): Segundos de validez de cada cotización (None = sin vencimiento)
+            clock (callable): Reloj en segundos (para pruebas)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._keys_by_product = {}
+        self._epoch = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def quote(self, product, kwargs):
+        """
+        Precio de un producto con los parámetros dados, desde la caché si se
+        puede.
+
+        Args:
+            product (Product): Producto a cotizar
+            kwargs (dict): Parámetros de `calculate_price` (ej: {'nights': 3})
+
+        Returns:
+            Money: Precio
+
+        Raises:
+            TypeError: Si faltan parámetros necesarios (ej: nights)
+        """
+        if not getattr(product, '_cache_quotes', False):
+            return _calculate(product, kwargs)
+        try:
+            key = (id(product), tuple(sorted(kwargs.items())))
+            hash(key)
+        except TypeError:
+            return _calculate(product, kwargs)
+
+        generation = current_rules().generation
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.product is product and entry.generation == generation:
+                if entry.expires_at is None or entry.expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return entry.price
+                self._expirations += 1
+            if entry is not None:
+                self._remove(key)
+            self._misses += 1
+            epoch = self._epoch
+
+        price = _calculate(product, kwargs)
+
+        with self._lock:
+            # Si hubo una invalidación mientras se calculaba, el precio puede ser viejo
+            if epoch == self._epoch:
+                expires_at = None if self.ttl is None else self._clock() + self.ttl
+                self._entries[key] = _Entry(product, price, generation, expires_at)
+                self._entries.move_to_end(key)
+                self._keys_by_product.setdefault(id(product), set()).add(key)
+                while len(self._entries) > self.max_size:
+                    oldest = next(iter(self._entries))
+                    self._remove(oldest)
+                    self._evictions += 1
+        return price
+
+    def invalidate(self, product=None):
+        """
+        Descarta las cotizaciones de un producto, o todas.
+
+        Args:
+            product (Product): Producto modificado (None = toda la caché)
+        """
+        with self._lock:
+            self._epoch += 1
+            if product is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                self._keys_by_product.clear()
+                return
+            for key in self._keys_by_product.pop(id(product), ()):
+                if self._entries.pop(key, None) is not None:
+                    self._invalidations += 1
+
+    def stats(self):
+        """
+        Contadores de uso de la caché.
+
+        Returns:
+            CacheStats: Aciertos, fallos, descartes y tamaño actual
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._expirations,
+                              self._invalidations, len(self._entries))
+
+    def reset_stats(self):
+        """Pone en cero los contadores (las entradas se conservan)."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+            self._expirations = self._invalidations = 0
+
+    def _remove(self, key):
+        del self._entries[key]
+        keys = self._keys_by_product.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_product[key[0]]
+
+
+_default_cache = QuoteCache()
+
+
+def get_quote_cache():
+    """
+    Caché compartida que usan los usuarios.
+
+    Returns:
+        QuoteCache | None: Caché actual (None si está desactivada)
+    """
+    return _default_cache
+
+
+def set_quote_cache(cache):
+    """
+    Reemplaza la caché compartida.
+
+    Args:
+        cache (QuoteCache | None): Nueva caché, o None para desactivarla
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+def quote(product, kwargs):
+    """
+    Cotiza un producto usando la caché compartida si está activa.
+
+    Args:
+        product (Product): Producto a cotizar
+        kwargs (dict): Parámetros de `calculate_price`
+
+    Returns:
+        Money: Precio
+
+    Raises:
+        TypeError: Si faltan parámetros necesarios (ej: nights)
+    """
+    cache = _default_cache
+    if cache is None:
+        return _calculate(product, kwargs)
+    return cache.quote(product, kwargs)
+
+
+def invalidate(product=None):
+    """
+    Descarta las cotizaciones de un producto (o todas) en la caché compartida.
+
+    Args:
+        product (Product): Producto modificado (None = toda la caché)
+    """
+    cache = _default_cache
+    if cache is not None:
+        cache.invalidate(product)
+
+
+def _calculate(product, kwargs):
+    if kwargs:
+        return product.calculate_price(**kwargs)
+    return product.calculate_price()
@@ -1,23 +1,89 @@
+import threading
+
 from models.product import Product
+from models.accommodation import Accommodation
+from models.catalog_index import AffordableProduct, CatalogIndex
+from models.complex import Complex
+from models.ledger import PurchaseLedger
+from models.money import Money
+from models import availability, quote_cache
+from models.purchase import (
+    PURCHASE_OK, PURCHASE_INVALID_PRODUCT, PURCHASE_MISSING_PARAMS, PURCHASE_INSUFFICIENT_FUNDS,
+    PURCHASE_UNAVAILABLE, PurchaseResult, PurchaseEvent
+)
 
 
 class User:
     """
     Representa un usuario de la agencia con presupuesto e historial de compras.
+    
+    El presupuesto se guarda como Money (centavos enteros, ver
+    models/money.py), así no acumula errores de redondeo con las compras.
+    
+    Las compras son seguras entre hilos: cada usuario tiene su propio lock y
+    la verificación de fondos, el descuento del presupuesto y el registro en
+    el historial se hacen en una única sección crítica.
+    
+    Al comprar un alojamiento con `check_in` (fecha de entrada) también se
+    reservan sus noches en el inventario compartido (models/availability.py),
+    en la misma sección crítica: si no hay lugar, la compra falla sin cobrar.
+    
+    Las compras no imprimen nada: retornan un PurchaseResult y, si el usuario
+    tiene un `event_sink` (ver models/events.py), le envían un evento. Para
+    ver las compras en consola se usa un ConsoleSink.
     """
     
-    def __init__(self, name, budget):
+    def __init__(self, name, budget, event_sink=None, history=None):
         """
         Inicializa un usuario.
         
         Args:
             name (str): Nombre del usuario
-            budget (float): Presupuesto inicial del usuario
+            budget (Money | float): Presupuesto inicial del usuario
+            event_sink (EventSink): Destino opcional de los eventos de compra
+            history (PurchaseLedger | callable): Historial existente, o una
+                función que lo carga la primera vez que se usa
         """
         self.name = name
-        self.budget = budget
-        self.initial_budget = budget  # Para tracking
-        self.purchase_history = []
+        self.budget = Money.of(budget)
+        self.initial_budget = self.budget  # Para tracking
+        self.event_sink = event_sink
+        self._lock = threading.Lock()
+        
+        if callable(history):
+            self._purchase_history = None
+            self._history_loader = history
+        else:
+            self._purchase_history = history if history is not None else PurchaseLedger()
+            self._history_loader = None
+    
+    @property
+    def budget(self):
+        """Money: Presupuesto disponible (al asignarlo se convierte a Money)"""
+        return self._budget
+    
+    @budget.setter
+    def budget(self, amount):
+        self._budget = Money.of(amount)
+    
+    @property
+    def purchase_history(self):
+        """PurchaseLedger: Historial de compras (se carga al primer uso si es diferido)"""
+        history = self._purchase_history
+        if history is None:
+            with self._lock:
+                history = self._load_history()
+        return history
+    
+    def _load_history(self):
+        """
+        Retorna el historial, cargándolo si todavía no se cargó.
+        Debe llamarse con `self._lock` tomado.
+        """
+        if self._purchase_history is None:
+            self._purchase_history = self._history_loader()
+            self._history_loader = None
+        return self._purchase_history
     
     def purchase_product(self, product, **kwargs):
         """
@@ -28,52 +94,190 @@ class User:
             **kwargs: Parámetros adicionales (ej: nights para alojamientos)
             
         Returns:
-            bool: True si la compra fue exitosa, False si no hay fondos suficientes
+            PurchaseResult: Resultado de la compra (verdadero si fue exitosa)
+        """
+        result = self.try_purchase(product, **kwargs)
+        if self.event_sink is not None:
+            entries = [(product, result.price, kwargs)] if result.success else None
+            self.event_sink.emit(PurchaseEvent(self, product, result, entries))
+        return result
+    
+    def try_purchase(self, product, **kwargs):
+        """
+        Intenta comprar un producto sin emitir eventos.
+        
+        Args:
+            product (Product): Producto a comprar
+            **kwargs: Parámetros adicionales (ej: nights para alojamientos, y
+                check_in para reservar las fechas)
+            
+        Returns:
+            PurchaseResult: Resultado de la compra con el motivo si falló
         """
         # Validar que sea un Product
         if not isinstance(product, Product):
-            print(f"✗ Error: {type(product).__name__} no es un producto válido")
-            return False
+            return PurchaseResult(False, None, self.budget, PURCHASE_INVALID_PRODUCT)
         
         # Calcular precio según el tipo de producto
         try:
-            # Si el producto necesita parámetros (como nights para alojamientos)
-            if kwargs:
-                price = product.calculate_price(**kwargs)
-            else:
-                price = product.calculate_price()
+            price = self._quote(product, kwargs)
         except TypeError:
             # Si faltaron parámetros necesarios
-            print(f"✗ Error: El producto requiere parámetros adicionales (ej: nights)")
-            return False
+            return PurchaseResult(False, None, self.budget, PURCHASE_MISSING_PARAMS)
         
-        # Verificar si hay fondos suficientes
-        if price <= self.budget:
-            self.budget -= price
-            self.purchase_history.append({
-                'product': product,
-                'price': price,
-                'params': kwargs
-            })
-            print(f"✓ Compra exitosa: {product}")
-            print(f"  Precio: ${price:,.0f}")
-            print(f"  Presupuesto restante: ${self.budget:,.0f}")
-            return True
-        else:
-            print(f"✗ Fondos insuficientes para comprar: {product}")
-            print(f"  Precio: ${price:,.0f}")
-            print(f"  Presupuesto disponible: ${self.budget:,.0f}")
-            print(f"  Faltante: ${price - self.budget:,.0f}")
-            return False
+        # Verificar fondos, reservar y registrar la compra de forma atómica
+        with self._lock:
+            reason = self._commit([(product, price, kwargs)])
+            remaining = self.budget
+        
+        return PurchaseResult(reason == PURCHASE_OK, price, remaining, reason)
+    
+    def purchase_many(self, items):
+        """
+        Compra un carrito completo: se compran todos los productos o ninguno.
+        
+        Todos los precios se calculan antes de tomar el lock, y el total se
+        verifica y descuenta en una sola sección crítica.
+        
+        Args:
+            items (iterable): Productos o tuplas (producto, kwargs)
+                (ej: [vuelo, (hotel, {'nights': 3})])
+            
+        Returns:
+            PurchaseResult: Resultado del carrito, con el precio total
+        """
+        items = list(items)
+        result, entries = self._purchase_cart(items)
+        if self.event_sink is not None:
+            products = [item[0] if isinstance(item, tuple) else item for item in items]
+            self.event_sink.emit(PurchaseEvent(self, products, result, entries if result.success else None))
+        return result
+    
+    def quote_purchase(self, product, **kwargs):
+        """
+        Simula una compra sin realizarla.
+        
+        Args:
+            product (Product): Producto a verificar
+            **kwargs: Parámetros adicionales (ej: nights para alojamientos)
+            
+        Returns:
+            PurchaseResult: Resultado que tendría la compra con el presupuesto actual
+        """
+        if not isinstance(product, Product):
+            return PurchaseResult(False, None, self.budget, PURCHASE_INVALID_PRODUCT)
+        
+        try:
+            price = self._quote(product, kwargs)
+        except TypeError:
+            return PurchaseResult(False, None, self.budget, PURCHASE_MISSING_PARAMS)
+        
+        budget = self.budget
+        if price > budget:
+            return PurchaseResult(False, price, budget, PURCHASE_INSUFFICIENT_FUNDS)
+        request = _booking_request(product, kwargs)
+        if request is not None:
+            try:
+                available = availability.get_inventory().is_available(*request)
+            except ValueError:
+                available = False
+            if not available:
+                return PurchaseResult(False, price, budget, PURCHASE_UNAVAILABLE)
+        return PurchaseResult(True, price, budget, PURCHASE_OK)
+    
+    def _purchase_cart(self, items):
+        """
+        Calcula los precios de un carrito y lo compra de forma atómica.
+        
+        Returns:
+            tuple: (PurchaseResult, lista de tuplas (producto, precio, kwargs))
+        """
+        entries = []
+        for item in items:
+            product, kwargs = item if isinstance(item, tuple) else (item, {})
+            if not isinstance(product, Product):
+                return PurchaseResult(False, None, self.budget, PURCHASE_INVALID_PRODUCT), entries
+            try:
+                entries.append((product, self._quote(product, kwargs), kwargs))
+            except TypeError:
+                return PurchaseResult(False, None, self.budget, PURCHASE_MISSING_PARAMS), entries
+        
+        total = Money(sum(price.cents for _, price, _ in entries))
+        with self._lock:
+            reason = self._commit(entries)
+            remaining = self.budget
+        
+        return PurchaseResult(reason == PURCHASE_OK, total, remaining, reason), entries
+    
+    def _quote(self, product, kwargs):
+        """
+        Calcula el precio de un producto con los parámetros de la compra,
+        usando la caché compartida de cotizaciones (models/quote_cache.py).
+        
+        Returns:
+            Money: Precio
+        
+        Raises:
+            TypeError: Si faltan parámetros necesarios (ej: nights)
+        """
+        if 'check_in' in kwargs:
+            # La fecha no cambia el precio: se cotiza (y se cachea) sin ella
+            kwargs = {key: value for key, value in kwargs.items() if key != 'check_in'}
+        return Money.of(quote_cache.quote(product, kwargs))
+    
+    def _commit(self, entries):
+        """
+        Descuenta el total de las compras, reserva las fechas de los
+        alojamientos con `check_in` y las registra en el historial.
+        Debe llamarse con `self._lock` tomado.
+        
+        Args:
+            entries (list): Tuplas (producto, precio, kwargs)
+            
+        Returns:
+            str: PURCHASE_OK, PURCHASE_INSUFFICIENT_FUNDS o PURCHASE_UNAVAILABLE
+                 (sin lugar en esas fechas, o fechas fuera del calendario)
+        """
+        total = sum(price.cents for _, price, _ in entries)
+        if total > self._budget.cents:
+            return PURCHASE_INSUFFICIENT_FUNDS
+        
+        requests = [request for request in
+                    (_booking_request(product, kwargs) for product, _, kwargs in entries)
+                    if request is not None]
+        bookings = ()
+        if requests:
+            inventory = availability.get_inventory()
+            try:
+                bookings = inventory.book_all(requests)
+            except ValueError:
+                bookings = None
+            if bookings is None:
+                return PURCHASE_UNAVAILABLE
+        
+        # El historial se registra antes de descontar el presupuesto: si falla
+        # (ej: noches inválidas) se liberan las reservas y no se cobra nada
+        try:
+            self._load_history().extend(
+                (product, price, kwargs.get('nights', 0), kwargs.get('units_to_rent', 1))
+                for product, price, kwargs in entries
+            )
+        except BaseException:
+            for booking in bookings:
+                inventory.release(booking)
+            raise
+        
+        self._budget = Money(self._budget.cents - total)
+        return PURCHASE_OK
     
     def get_total_spent(self):
         """
         Calcula el total gastado por el usuario.
         
         Returns:
-            float: Total gastado
+            Money: Total gastado
         """
-        return self.initial_budget - self.budget
+        return self.purchase_history.total_spent
     
     def get_purchase_count(self):
         """
@@ -93,66 +297,91 @@ class User:
             **kwargs: Parámetros adicionales
             
         Returns:
-            bool: True si puede pagarlo, False si no
+            bool: True si puede pagarlo, False si no (también si los
+                  parámetros son inválidos, ej: unidades fuera de rango)
+        
+        Raises:
+            Exception: Los errores al cotizar que no son de parámetros (ej:
+                reglas sin tarifa para el producto) se propagan
         """
         try:
-            if kwargs:
-                price = product.calculate_price(**kwargs)
-            else:
-                price = product.calculate_price()
-            return price <= self.budget
-        except:
+            return self.quote_purchase(product, **kwargs).success
+        except ValueError:
             return False
         
-    def calculate_max_nights(self, accommodation):
+    def calculate_max_nights(self, accommodation, units_to_rent=1):
         """Calcula el máximo de noches que puede pagar"""
-        from models.complex import Complex
-        
         if isinstance(accommodation, Complex):
-            price_per_night = accommodation.calculate_price(1, units_to_rent=1)
-        else:
-            price_per_night = accommodation.calculate_price(1)
+            return accommodation.max_nights(self.budget, units_to_rent)
+        
+        price_per_night = quote_cache.quote(accommodation, {'nights': 1})
         
         if price_per_night > self.budget:
             return 0
         
-        return int(self.budget // price_per_night)
+        return self.budget // price_per_night
 
-    def show_affordable_products_max_nights(self, products):
-        """Muestra productos con el máximo de noches para alojamientos"""
-        from models.accommodation import Accommodation
-        from models.complex import Complex
-        
-        print(f"Usuario: {self.name}")
-        print(f"Presupuesto disponible: ${self.budget:,.0f}\n")
-        print("Productos que puede comprar:")
+    def get_affordable_products(self, products):
+        """
+        Obtiene los productos que el usuario puede pagar con su presupuesto.
         
-        count = 0
+        Args:
+            products (CatalogIndex | iterable): Índice del catálogo o lista de
+                productos
+                
+        Returns:
+            list: AffordableProduct con precio y, para alojamientos, el máximo
+                  de noches que puede pagar. Con un índice vienen ordenados
+                  por precio; con una lista, en el orden del catálogo
+        """
+        if isinstance(products, CatalogIndex):
+            return products.affordable(self.budget)
         
+        # Armar un índice cuesta O(n log n): para una sola consulta alcanza
+        # con recorrer la lista una vez
+        affordable = []
         for product in products:
             if isinstance(product, Accommodation):
                 max_nights = self.calculate_max_nights(product)
-                
                 if max_nights > 0:
-                    if isinstance(product, Complex):
-                        price = product.calculate_price(max_nights, units_to_rent=1)
-                    else:
-                        price = product.calculate_price(max_nights)
-                    
-                    print(f"  ✓ {product} (hasta {max_nights} noches) - ${price:,.0f}")
-                    count += 1
+                    price = product.calculate_price(max_nights)
+                    affordable.append(AffordableProduct(product, price, max_nights))
             else:
                 price = product.calculate_price()
-                
                 if price <= self.budget:
-                    print(f"  ✓ {product} - ${price:,.0f}")
-                    count += 1
+                    affordable.append(AffordableProduct(product, price, None))
+        return affordable
+
+    def show_affordable_products_max_nights(self, products):
+        """Muestra productos con el máximo de noches para alojamientos"""
+        print(f"Usuario: {self.name}")
+        print(f"Presupuesto disponible: ${self.budget:,.0f}\n")
+        print("Productos que puede comprar:")
+        
+        affordable = self.get_affordable_products(products)
         
-        if count == 0:
+        for item in affordable:
+            if item.nights is not None:
+                print(f"  ✓ {item.product} (hasta {item.nights} noches) - ${item.price:,.0f}")
+            else:
+                print(f"  ✓ {item.product} - ${item.price:,.0f}")
+        
+        if not affordable:
             print("  ⚠ No hay productos disponibles con tu presupuesto actual")
         
-        print(f"\nTotal de productos disponibles: {count}")
-        return count
+        print(f"\nTotal de productos disponibles: {len(affordable)}")
+        return len(affordable)
     
     def __str__(self):
-        return f"Usuario: {self.name} - Presupuesto: ${self.budget:,.0f} - Compras: {len(self.purchase_history)}"
\ No newline at end of file
+        return f"Usuario: {self.name} - Presupuesto: ${self.budget:,.0f} - Compras: {len(self.purchase_history)}"
+
+
+def _booking_request(product, kwargs):
+    """
+    Pedido de reserva para el inventario, o None si la compra no reserva
+    fechas (no es un alojamiento o no indica `check_in`).
+    """
+    check_in = kwargs.get('check_in')
+    if check_in is None or not isinstance(product, Accommodation):
+        return None
+    return (product, check_in, kwargs.get('nights', 1), kwargs.get('units_to_rent', 1))
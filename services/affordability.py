@@ -0,0 +1,233 @@
+import os
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from models.accommodation import Accommodation
+from models.money import to_cents
+from models import quote_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usa la versión en Python puro
+    np = None
+
+
+CellError = namedtuple('CellError', ['user', 'product', 'error'])
+CellError.__doc__ = """
+Celda de la matriz que no se pudo calcular.
+
+Attributes:
+    user (int): Fila (posición del usuario)
+    product (int): Columna (posición del producto)
+    error (Exception): Error al leer el presupuesto o al cotizar el producto
+"""
+
+
+class AffordabilityMatrix:
+    """
+    Resultado de `affordability_matrix`: qué productos puede pagar cada
+    usuario y por cuántas noches.
+
+    Las filas son usuarios y las columnas productos, en el orden recibido.
+    Con NumPy las matrices son ndarray (bool e int64); si no, listas de
+    filas.
+
+    Attributes:
+        users (list): Usuarios (filas)
+        products (list): Productos (columnas)
+        affordable: Matriz booleana; para los alojamientos significa que
+            alcanza para al menos una noche
+        max_nights: Máximo de noches pagables en cada alojamiento (0 si no
+            alcanza y para los productos sin noches)
+        prices (ndarray | array): Precio en centavos de cada producto (por
+            noche para los alojamientos)
+        per_night (list): Si cada producto se cobra por noche
+        user_errors (dict): Fila -> error al leer el presupuesto
+        product_errors (dict): Columna -> error al cotizar el producto
+
+    Las celdas con error quedan en False y 0.
+    """
+
+    def __init__(self, users, products, affordable, max_nights, prices, per_night,
+                 user_errors, product_errors):
+        self.users = users
+        self.products = products
+        self.affordable = affordable
+        self.max_nights = max_nights
+        self.prices = prices
+        self.per_night = per_night
+        self.user_errors = user_errors
+        self.product_errors = product_errors
+
+    @property
+    def shape(self):
+        """tuple: (usuarios, productos)"""
+        return len(self.users), len(self.products)
+
+    def error_at(self, row, column):
+        """
+        Error de una celda.
+
+        Args:
+            row (int): Posición del usuario
+            column (int): Posición del producto
+
+        Returns:
+            Exception | None: Error de la celda, o None si se calculó
+        """
+        error = self.user_errors.get(row)
+        if error is None:
+            error = self.product_errors.get(column)
+        return error
+
+    def errors(self):
+        """
+        Recorre las celdas que no se pudieron calcular.
+
+        Yields:
+            CellError: Una por celda, fila por fila
+        """
+        if not self.user_errors and not self.product_errors:
+            return
+        for row in range(len(self.users)):
+            for column in range(len(self.products)):
+                error = self.error_at(row, column)
+                if error is not None:
+                    yield CellError(row, column, error)
+
+    def affordable_products(self, row):
+        """
+        Productos que puede pagar un usuario.
+
+        Args:
+            row (int): Posición del usuario
+
+        Returns:
+            list: Tuplas (producto, noches), con noches None para los
+                  productos sin noches
+        """
+        affordable = self.affordable[row]
+        nights = self.max_nights[row]
+        return [
+            (product, int(nights[column]) if self.per_night[column] else None)
+            for column, product in enumerate(self.products)
+            if affordable[column]
+        ]
+
+
+def affordability_matrix(users, products, workers=1, chunk_size=20000):
+    """
+    Calcula de una vez qué productos puede pagar cada usuario y el máximo de
+    noches en cada alojamiento.
+
+    Cada producto se cotiza una sola vez (por noche para los alojamientos,
+    con la caché compartida de cotizaciones) y después la matriz se arma
+    comparando presupuestos contra precios en centavos: con NumPy en
+    operaciones vectorizadas, por bloques de `chunk_size` usuarios. Los
+    alojamientos se cotizan con una unidad, igual que `User.calculate_max_nights`
+    por defecto, así que el precio es lineal en las noches y el máximo es
+    `presupuesto // tarifa`.
+
+    Los errores no se ocultan: si un producto no se puede cotizar (ej: sin
+    tarifa para sus estrellas) o un usuario no tiene un presupuesto válido,
+    se anota en el resultado y esas celdas quedan en False y 0.
+
+    Con `workers` mayor a 1 y más de `chunk_size` usuarios, los bloques se
+    reparten en un ProcessPoolExecutor; a cada proceso solo se le envían los
+    presupuestos y precios en arreglos compactos, no los objetos.
+    Por defecto se usa un solo proceso: con NumPy el bloque se calcula más
+    rápido de lo que tarda en volver serializado desde otro proceso.
+
+    Args:
+        users (iterable): Usuarios (filas)
+        products (iterable): Productos del catálogo (columnas)
+        workers (int): Procesos a usar (None: uno por CPU)
+        chunk_size (int): Usuarios por bloque
+
+    Returns:
+        AffordabilityMatrix: Matrices y errores
+    """
+    users = list(users)
+    products = list(products)
+
+    user_errors = {}
+    budgets = array('q')
+    for row, user in enumerate(users):
+        try:
+            budgets.append(to_cents(user.budget))
+        except Exception as error:
+            user_errors[row] = error
+            budgets.append(-1)
+
+    product_errors = {}
+    prices = array('q')
+    per_night = []
+    for column, product in enumerate(products):
+        nightly = isinstance(product, Accommodation)
+        per_night.append(nightly)
+        try:
+            price = to_cents(quote_cache.quote(product, {'nights': 1} if nightly else {}))
+            if nightly and price <= 0:
+                raise ValueError(f"Tarifa por noche inválida para {product}: {price}")
+        except Exception as error:
+            product_errors[column] = error
+            price = -1
+        prices.append(price)
+
+    flags = bytes(per_night)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [(budgets[i:i + chunk_size], prices, flags)
+              for i in range(0, len(budgets), chunk_size)]
+    if workers <= 1 or len(chunks) <= 1:
+        results = [_chunk_matrix(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_chunk_matrix, chunks))
+
+    if np is not None:
+        if results:
+            affordable = np.concatenate([result[0] for result in results])
+            max_nights = np.concatenate([result[1] for result in results])
+        else:
+            affordable = np.zeros((0, len(products)), dtype=bool)
+            max_nights = np.zeros((0, len(products)), dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.int64)
+    else:
+        affordable = [row for result in results for row in result[0]]
+        max_nights = [row for result in results for row in result[1]]
+
+    return AffordabilityMatrix(users, products, affordable, max_nights, prices, per_night,
+                               user_errors, product_errors)
+
+
+def _chunk_matrix(chunk):
+    """
+    Matrices de un bloque de usuarios (puede ejecutarse en un proceso aparte).
+
+    Args:
+        chunk (tuple): (presupuestos, precios, marcas por noche); precios o
+            presupuestos negativos indican celdas con error
+
+    Returns:
+        tuple: (matriz de asequibilidad, matriz de noches máximas)
+    """
+    budgets, prices, flags = chunk
+    if np is not None:
+        budgets = np.asarray(budgets, dtype=np.int64)[:, None]
+        prices = np.asarray(prices, dtype=np.int64)
+        nightly = np.frombuffer(flags, dtype=np.uint8).astype(bool) & (prices > 0)
+        affordable = (prices >= 0) & (prices <= budgets)
+        max_nights = np.where(affordable & nightly,
+                              budgets // np.where(nightly, prices, 1), 0)
+        return affordable, max_nights
+
+    affordable = []
+    max_nights = []
+    columns = list(zip(prices, flags))
+    for budget in budgets:
+        affordable.append([0 <= price <= budget for price in prices])
+        max_nights.append([budget // price if nightly and 0 < price <= budget else 0
+                           for price, nightly in columns])
+    return affordable, max_nights
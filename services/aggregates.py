@@ -0,0 +1,200 @@
+import heapq
+import threading
+from array import array
+from collections import namedtuple
+
+from models.events import EventSink, attach_sink
+from models.money import to_cents, from_cents
+
+
+RANK_BY_PURCHASES = 'purchases'
+RANK_BY_SPENT = 'spent'
+
+RankedUser = namedtuple('RankedUser', ['user', 'purchases', 'spent'])
+RankedUser.__doc__ = """
+Posición de un usuario en un ranking.
+
+Attributes:
+    user (User): Usuario
+    purchases (int): Cantidad de productos comprados
+    spent (Money): Total gastado
+"""
+
+
+class AgencyStats(EventSink):
+    """
+    Totales de la agencia y ranking de usuarios, mantenidos al comprar.
+
+    Se usa como `event_sink` de los usuarios: cada compra exitosa suma a los
+    contadores del usuario y a los totales de la agencia, así consultar los
+    totales es O(1) y el top-k es O(n log k) con un heap, sin ordenar toda
+    la lista. Los contadores por usuario se guardan en arreglos compactos.
+
+    Ejemplo:
+        agencia = AgencyStats()
+        user = agencia.register(User("Juan Pérez", 500000))
+        user.purchase_product(vuelo)
+        agencia.top_k(10)
+    """
+
+    def __init__(self, users=()):
+        """
+        Inicializa los contadores.
+
+        Args:
+            users (iterable): Usuarios a registrar
+        """
+        self._lock = threading.Lock()
+        self._users = []
+        self._positions = {}
+        self._purchases = array('q')
+        self._cents = array('q')
+        self._total_purchases = 0
+        self._total_cents = 0
+        for user in users:
+            self.register(user)
+
+    def register(self, user):
+        """
+        Empieza a seguir a un usuario; sus compras previas se cuentan.
+
+        Si el usuario ya tenía un `event_sink`, se siguen usando ambos.
+        Conviene registrarlo antes de que compre desde otros hilos; si no,
+        una compra simultánea al registro puede contarse dos veces (se
+        corrige con `recompute`).
+
+        Args:
+            user (User): Usuario a registrar
+
+        Returns:
+            User: El mismo usuario
+        """
+        with self._lock:
+            if user not in self._positions:
+                history = user.purchase_history
+                cents = to_cents(history.total_spent)
+                self._positions[user] = len(self._users)
+                self._users.append(user)
+                self._purchases.append(len(history))
+                self._cents.append(cents)
+                self._total_purchases += len(history)
+                self._total_cents += cents
+        attach_sink(user, self)
+        return user
+
+    def emit_batch(self, events):
+        with self._lock:
+            for event in events:
+                if not event.result.success or not event.entries:
+                    continue
+                position = self._positions.get(event.user)
+                if position is None:
+                    continue
+                cents = sum(to_cents(price) for _, price, _ in event.entries)
+                self._purchases[position] += len(event.entries)
+                self._cents[position] += cents
+                self._total_purchases += len(event.entries)
+                self._total_cents += cents
+
+    @property
+    def user_count(self):
+        """int: Cantidad de usuarios registrados"""
+        return len(self._users)
+
+    @property
+    def total_purchases(self):
+        """int: Productos comprados por todos los usuarios"""
+        return self._total_purchases
+
+    @property
+    def total_spent(self):
+        """Money: Total gastado por todos los usuarios"""
+        return from_cents(self._total_cents)
+
+    def top_k(self, k, by=RANK_BY_PURCHASES):
+        """
+        Los k usuarios con más compras (o más gasto).
+
+        Los empates conservan el orden de registro, igual que un `sorted`
+        estable de toda la lista.
+
+        Args:
+            k (int): Cantidad de usuarios
+            by (str): 'purchases' o 'spent'
+
+        Returns:
+            list: RankedUser de mayor a menor
+
+        Raises:
+            ValueError: Si el criterio es desconocido
+        """
+        with self._lock:
+            column = self._column(by)
+            best = heapq.nlargest(k, range(len(self._users)), key=column.__getitem__)
+            return [self._ranked(position) for position in best]
+
+    def stats_for(self, user):
+        """
+        Contadores de un usuario registrado.
+
+        Args:
+            user (User): Usuario
+
+        Returns:
+            RankedUser | None: Compras y gasto, o None si no está registrado
+        """
+        with self._lock:
+            position = self._positions.get(user)
+            return None if position is None else self._ranked(position)
+
+    def recompute(self):
+        """
+        Recalcula todos los contadores desde los historiales de compras.
+
+        Sirve para corregir los contadores si hubo compras que no pasaron por
+        los eventos (ej: `try_purchase`). Ver `recompute_totals`.
+        """
+        with self._lock:
+            users = list(self._users)
+        purchases, cents = recompute_totals(users)
+        with self._lock:
+            self._purchases[:len(users)] = purchases
+            self._cents[:len(users)] = cents
+            self._total_purchases = sum(self._purchases)
+            self._total_cents = sum(self._cents)
+
+    def _column(self, by):
+        if by == RANK_BY_PURCHASES:
+            return self._purchases
+        if by == RANK_BY_SPENT:
+            return self._cents
+        raise ValueError(f"Criterio de ranking desconocido: {by}")
+
+    def _ranked(self, position):
+        return RankedUser(self._users[position], self._purchases[position],
+                          from_cents(self._cents[position]))
+
+
+def recompute_totals(users):
+    """
+    Calcula compras y gasto de cada usuario a partir de su historial.
+
+    Cada historial (models/ledger.py) mantiene su cantidad de compras y su
+    total gastado, así que el costo es O(1) por usuario: no se recorren los
+    precios. Repartir el trabajo entre procesos solo agregaría el costo de
+    enviar los datos.
+
+    Args:
+        users (list): Usuarios
+
+    Returns:
+        tuple: (array de compras, array de gasto en centavos), alineados
+               con `users`
+    """
+    purchases = array('q')
+    cents = array('q')
+    for user in users:
+        history = user.purchase_history
+        purchases.append(len(history))
+        cents.append(to_cents(history.total_spent))
+    return purchases, cents
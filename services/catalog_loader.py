@@ -0,0 +1,275 @@
+import csv
+import json
+import math
+from collections import namedtuple
+from itertools import islice
+
+from models.complex import Complex
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+from models.package import Package
+from models.user import User
+
+
+LoadError = namedtuple('LoadError', ['line', 'message', 'record'])
+LoadError.__doc__ = """
+Registro que no se pudo cargar.
+
+Attributes:
+    line (int): Número de línea (o de fila) en el archivo
+    message (str): Motivo del error
+    record (dict | str): Registro leído, o la línea cruda si no se pudo parsear
+"""
+
+
+class CatalogLoader:
+    """
+    Carga productos y usuarios desde archivos JSONL o CSV en forma de flujo.
+
+    Los registros se leen de a uno y se convierten en objetos a medida que
+    se consumen, así la memoria no depende del tamaño del archivo. Un
+    registro inválido no corta la carga: se guarda en `errors` (o se pasa a
+    `on_error`) y se sigue con el siguiente.
+
+    Formato de los registros (campo "type"):
+    - flight: departure_date, return_date, airline, price
+    - hotel: address, name, stars
+    - house: address, rooms
+    - complex: address, houses (lista de {"address", "rooms"})
+    - package: name, description, products (lista de registros anidados)
+    - user: name, budget
+
+    En CSV cada fila es un registro plano; los campos `houses` y `products`
+    se escriben como JSON dentro de la celda.
+    """
+
+    def __init__(self, on_error=None, max_errors=1000):
+        """
+        Inicializa el cargador.
+
+        Args:
+            on_error (callable): Función que recibe cada LoadError; si no se
+                indica, los errores se guardan en `errors`
+            max_errors (int): Cantidad máxima de errores guardados en `errors`
+        """
+        self.on_error = on_error
+        self.max_errors = max_errors
+        self.errors = []
+        self.error_count = 0
+        self.loaded_count = 0
+
+    def load(self, path):
+        """
+        Recorre los objetos definidos en un archivo.
+
+        Args:
+            path (str): Archivo .jsonl o .csv
+
+        Yields:
+            Product | User: Objeto construido por cada registro válido
+        """
+        for line, record in iter_records(path, self._report):
+            try:
+                obj = build_object(record)
+            except (KeyError, TypeError, ValueError, ArithmeticError, RecursionError) as error:
+                self._report(LoadError(line, _describe(error), record))
+                continue
+            self.loaded_count += 1
+            yield obj
+
+    def load_chunks(self, path, chunk_size=10000):
+        """
+        Recorre los objetos de un archivo en listas de hasta `chunk_size`.
+
+        Args:
+            path (str): Archivo .jsonl o .csv
+            chunk_size (int): Objetos por lote
+
+        Yields:
+            list: Lote de objetos
+        """
+        return iter_chunks(self.load(path), chunk_size)
+
+    def load_into(self, path, consumer, chunk_size=10000):
+        """
+        Carga un archivo entregando los objetos por lotes a un consumidor.
+
+        Args:
+            path (str): Archivo .jsonl o .csv
+            consumer (callable): Función que recibe cada lote (lista de objetos)
+            chunk_size (int): Objetos por lote
+
+        Returns:
+            int: Cantidad de objetos cargados
+        """
+        for chunk in self.load_chunks(path, chunk_size):
+            consumer(chunk)
+        return self.loaded_count
+
+    def _report(self, error):
+        self.error_count += 1
+        if self.on_error is not None:
+            self.on_error(error)
+        elif len(self.errors) < self.max_errors:
+            self.errors.append(error)
+
+
+def iter_records(path, on_error):
+    """
+    Lee los registros crudos (diccionarios) de un archivo JSONL o CSV.
+
+    Args:
+        path (str): Archivo .jsonl o .csv
+        on_error (callable): Recibe un LoadError por cada línea ilegible
+
+    Yields:
+        tuple: (número de línea, registro)
+    """
+    with open(path, newline='', encoding='utf-8') as file:
+        if path.endswith('.csv'):
+            for line, row in enumerate(csv.DictReader(file), start=2):
+                yield line, {key: value for key, value in row.items() if value not in ('', None)}
+            return
+
+        for line, text in enumerate(file, start=1):
+            text = text.strip()
+            if not text:
+                continue
+            try:
+                record = json.loads(text)
+            except (ValueError, RecursionError) as error:
+                # Un registro anidado demasiado profundo no corta la carga
+                on_error(LoadError(line, f"JSON inválido: {error}", text))
+                continue
+            if not isinstance(record, dict):
+                on_error(LoadError(line, "El registro debe ser un objeto JSON", text))
+                continue
+            yield line, record
+
+
+def build_object(record):
+    """
+    Construye el producto o usuario descripto por un registro.
+
+    Args:
+        record (dict): Registro con el campo "type"
+
+    Returns:
+        Product | User: Objeto construido
+
+    Raises:
+        KeyError: Si falta un campo obligatorio
+        ValueError: Si el tipo es desconocido o un valor es inválido
+    """
+    kind = record['type']
+    builder = _BUILDERS.get(kind)
+    if builder is None:
+        raise ValueError(f"Tipo de registro desconocido: {kind}")
+    return builder(record)
+
+
+def iter_chunks(iterable, chunk_size):
+    """
+    Agrupa un iterable en listas de hasta `chunk_size` elementos.
+
+    Args:
+        iterable (iterable): Elementos a agrupar
+        chunk_size (int): Tamaño de cada lote
+
+    Yields:
+        list: Lote de elementos
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _build_flight(record):
+    return Flight(
+        record['departure_date'],
+        record.get('return_date'),
+        record['airline'],
+        _number(record['price'])
+    )
+
+
+def _build_hotel(record):
+    return Hotel(record['address'], record['name'], int(record['stars']))
+
+
+def _build_house(record):
+    return House(record['address'], int(record['rooms']))
+
+
+def _build_complex(record):
+    houses = _nested(record['houses'])
+    return Complex(record['address'], [_build_house(house) for house in houses])
+
+
+def _build_package(record):
+    # Los paquetes anidados se arman con una pila explícita (como en
+    # services/snapshot.py): la profundidad de un registro no depende del
+    # límite de recursión. Cada sub-paquete se agrega a su padre ya completo
+    root = _new_package(record)
+    stack = [(root, iter(_nested(record.get('products', []))), None)]
+    while stack:
+        package, children, parent = stack[-1]
+        for child in children:
+            if isinstance(child, dict) and child.get('type') == 'package':
+                stack.append((_new_package(child), iter(_nested(child.get('products', []))), package))
+                break
+            package.add_product(build_object(child))
+        else:
+            stack.pop()
+            if parent is not None:
+                parent.add_product(package)
+    return root
+
+
+def _new_package(record):
+    return Package(record['name'], record.get('description', ''))
+
+
+def _build_user(record):
+    return User(record['name'], _number(record['budget']))
+
+
+_BUILDERS = {
+    'flight': _build_flight,
+    'hotel': _build_hotel,
+    'house': _build_house,
+    'complex': _build_complex,
+    'package': _build_package,
+    'user': _build_user,
+}
+
+
+def _number(value):
+    """Convierte un valor numérico (o su texto) conservando los enteros."""
+    if isinstance(value, str):
+        value = float(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"Valor numérico inválido: {value!r}")
+    return value
+
+
+def _nested(value):
+    """Lista anidada de registros; en CSV viene como texto JSON."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    if not isinstance(value, list):
+        raise ValueError("Se esperaba una lista de registros")
+    return value
+
+
+def _describe(error):
+    """Mensaje legible para un error de construcción."""
+    if isinstance(error, KeyError):
+        return f"Falta el campo {error.args[0]!r}"
+    return str(error)
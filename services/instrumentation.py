@@ -0,0 +1,368 @@
+"""
+Instrumentación opcional de los caminos calientes de precios y compras.
+
+Mientras está desactivada no hay ningún costo: los métodos originales de las
+clases quedan intactos. `enable()` los reemplaza por versiones que cuentan
+llamadas y miden su latencia por clase; `disable()` restaura los originales.
+
+Se registran:
+- `<Clase>.calculate_price` para cada clase de producto, y `<Clase>.price_cents`
+  donde la clase lo redefine (lo usan paquetes y complejos para sumar)
+- `User.purchase_product` y `User.can_afford`
+- `Package.depth`: niveles de paquetes anidados del plan compilado
+  (`Package.compile`) de cada paquete cotizado
+
+Los tiempos son inclusivos: el de un paquete incluye el de sus productos.
+
+Ejemplo:
+    with instrumented():
+        user.purchase_product(paquete)
+    print(format_text(snapshot()))
+"""
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from models.package import Package
+from models.product import Product
+from models.user import User
+
+
+DEPTH_METRIC = 'Package.depth'
+
+_lock = threading.Lock()
+_patched = []
+_local = threading.local()
+# Cada hilo registra en sus propios histogramas (sin locks en el camino
+# caliente); `snapshot` los combina. Los de los hilos terminados se pasan a
+# `_retired` para no acumular una entrada por cada hilo que existió
+_thread_metrics = []
+_retired = {}
+
+
+class Histogram:
+    """
+    Histograma de valores enteros con cubetas por potencia de dos.
+
+    La cubeta `b` cuenta los valores en [2^(b-1), 2^b); los percentiles se
+    estiman con el límite superior de la cubeta.
+    """
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = 0
+        self.buckets = {}
+
+    def record(self, value):
+        """
+        Registra un valor.
+
+        Args:
+            value (int): Valor no negativo (ej: nanosegundos)
+        """
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        bucket = value.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other):
+        """
+        Suma los valores de otro histograma a este.
+
+        Args:
+            other (Histogram): Histograma a sumar
+        """
+        if not other.count:
+            return
+        # `other` puede ser de otro hilo que sigue registrando: se copian las
+        # cubetas antes de recorrerlas
+        buckets = dict(other.buckets)
+        self.count += other.count
+        self.total += other.total
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        self.maximum = max(self.maximum, other.maximum)
+        for bucket, hits in buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + hits
+
+    def percentile(self, fraction):
+        """
+        Estima un percentil.
+
+        Args:
+            fraction (float): Percentil entre 0 y 1 (ej: 0.99)
+
+        Returns:
+            int: Límite superior de la cubeta que contiene el percentil
+        """
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                return min(self.maximum, (1 << bucket) - 1)
+        return self.maximum
+
+
+def enable():
+    """
+    Activa la instrumentación envolviendo los métodos de las clases.
+
+    Las clases de producto se descubren recorriendo las subclases de
+    Product, así que también se instrumentan las que se agreguen después
+    de importar este módulo (siempre que ya estén importadas al activar).
+    """
+    with _lock:
+        if _patched:
+            return
+        for cls in _product_classes():
+            if 'calculate_price' in vars(cls) and not getattr(
+                    vars(cls)['calculate_price'], '__isabstractmethod__', False):
+                wrapper = _wrap_package_price if cls is Package else _wrap_timed
+                _patch(cls, 'calculate_price', wrapper)
+            # Los paquetes y complejos suman a sus productos con price_cents;
+            # la versión base solo delega en calculate_price, ya instrumentado
+            if cls is not Product and 'price_cents' in vars(cls):
+                _patch(cls, 'price_cents', _wrap_timed)
+        _patch(User, 'purchase_product', _wrap_timed)
+        _patch(User, 'can_afford', _wrap_timed)
+
+
+def disable():
+    """Restaura los métodos originales. Los datos registrados se conservan."""
+    with _lock:
+        while _patched:
+            cls, name, original = _patched.pop()
+            setattr(cls, name, original)
+
+
+def is_enabled():
+    """bool: True si la instrumentación está activa"""
+    return bool(_patched)
+
+
+def reset():
+    """Descarta todos los datos registrados."""
+    with _lock:
+        for _, metrics in _thread_metrics:
+            metrics.clear()
+        _retired.clear()
+
+
+@contextmanager
+def instrumented(clear=True):
+    """
+    Activa la instrumentación dentro de un bloque `with`.
+
+    Args:
+        clear (bool): Descartar los datos previos al entrar
+    """
+    if clear:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def snapshot():
+    """
+    Copia de los datos registrados hasta el momento.
+
+    Los tiempos se informan en microsegundos; `Package.depth` se informa en
+    niveles de anidamiento.
+
+    Returns:
+        dict: Nombre de la métrica -> resumen (count, total, mean, min, max,
+              p50, p99 y las cubetas del histograma)
+    """
+    merged = {}
+    with _lock:
+        _retire_finished_threads()
+        for name, histogram in _retired.items():
+            merged.setdefault(name, Histogram()).merge(histogram)
+        for _, metrics in _thread_metrics:
+            for name, histogram in list(metrics.items()):
+                merged.setdefault(name, Histogram()).merge(histogram)
+    return {name: _summary(name, merged[name]) for name in sorted(merged)}
+
+
+def format_text(data=None):
+    """
+    Tabla legible con los datos registrados.
+
+    Args:
+        data (dict): Resultado de `snapshot()`; por defecto, el actual
+
+    Returns:
+        str: Tabla de texto
+    """
+    data = snapshot() if data is None else data
+    lines = [f"{'Métrica':<32} {'Llamadas':>10} {'Total ms':>10} {'Media µs':>10} "
+             f"{'p50 µs':>10} {'p99 µs':>10} {'Máx µs':>10}"]
+    for name, summary in data.items():
+        if name == DEPTH_METRIC:
+            continue
+        lines.append(f"{name:<32} {summary['count']:>10,} {summary['total'] / 1000:>10,.1f} "
+                     f"{summary['mean']:>10,.2f} {summary['p50']:>10,.1f} "
+                     f"{summary['p99']:>10,.1f} {summary['max']:>10,.1f}")
+    depth = data.get(DEPTH_METRIC)
+    if depth is not None:
+        lines.append(f"\nProfundidad de paquetes: {depth['count']:,} recorridos, "
+                     f"media {depth['mean']:.1f}, máxima {depth['max']:.0f}")
+    return "\n".join(lines)
+
+
+def export_text(path, data=None):
+    """
+    Guarda la tabla de `format_text` en un archivo.
+
+    Args:
+        path (str): Archivo de destino
+        data (dict): Resultado de `snapshot()`; por defecto, el actual
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(format_text(data) + "\n")
+
+
+def export_json(path, data=None):
+    """
+    Guarda los datos registrados en JSON.
+
+    Args:
+        path (str): Archivo de destino
+        data (dict): Resultado de `snapshot()`; por defecto, el actual
+    """
+    data = snapshot() if data is None else data
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'created': time.time(), 'metrics': data}, file, indent=2)
+
+
+def profile(workload, *args, sort='cumulative', limit=25, path=None, **kwargs):
+    """
+    Ejecuta una función dentro de una sesión de cProfile.
+
+    Args:
+        workload (callable): Función a perfilar
+        *args: Argumentos de la función
+        sort (str): Criterio de orden de pstats (ej: 'cumulative', 'tottime')
+        limit (int): Cantidad de funciones en el reporte
+        path (str): Si se indica, guarda las estadísticas crudas (para
+            snakeviz, pstats, etc.)
+        **kwargs: Argumentos con nombre de la función
+
+    Returns:
+        tuple: (resultado de la función, reporte de texto)
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(workload, *args, **kwargs)
+    if path is not None:
+        profiler.dump_stats(path)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+    return result, stream.getvalue()
+
+
+def _product_classes():
+    pending = [Product]
+    seen = []
+    while pending:
+        cls = pending.pop()
+        if cls not in seen:
+            seen.append(cls)
+            pending.extend(cls.__subclasses__())
+    return seen
+
+
+def _patch(cls, name, wrapper):
+    original = vars(cls)[name]
+    setattr(cls, name, wrapper(original, name))
+    _patched.append((cls, name, original))
+
+
+def _record(name, value):
+    metrics = getattr(_local, 'metrics', None)
+    if metrics is None:
+        metrics = _local.metrics = {}
+        with _lock:
+            _retire_finished_threads()
+            _thread_metrics.append((threading.current_thread(), metrics))
+    histogram = metrics.get(name)
+    if histogram is None:
+        histogram = metrics[name] = Histogram()
+    histogram.record(value)
+
+
+def _retire_finished_threads():
+    """Suma a `_retired` los datos de los hilos terminados (con `_lock` tomado)."""
+    alive = []
+    for thread, metrics in _thread_metrics:
+        if thread.is_alive():
+            alive.append((thread, metrics))
+            continue
+        for name, histogram in metrics.items():
+            _retired.setdefault(name, Histogram()).merge(histogram)
+    _thread_metrics[:] = alive
+
+
+def _wrap_timed(method, name):
+    names = {}
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            cls = type(self)
+            metric = names.get(cls)
+            if metric is None:
+                metric = names[cls] = f"{cls.__name__}.{name}"
+            _record(metric, elapsed)
+    return wrapper
+
+
+def _wrap_package_price(method, name):
+    timed = _wrap_timed(method, name)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        price = timed(self, *args, **kwargs)
+        # El paquete ya no se recorre recursivamente: la profundidad sale del
+        # plan compilado, que queda guardado después de cotizar
+        _record(DEPTH_METRIC, self.compile().depth)
+        return price
+    return wrapper
+
+
+def _summary(name, histogram):
+    # Las latencias se guardan en nanosegundos y se informan en microsegundos
+    scale = 1 if name == DEPTH_METRIC else 1000
+    count = histogram.count
+    return {
+        'count': count,
+        'total': histogram.total / scale,
+        'mean': histogram.total / count / scale if count else 0,
+        'min': (histogram.minimum or 0) / scale,
+        'max': histogram.maximum / scale,
+        'p50': histogram.percentile(0.5) / scale,
+        'p99': histogram.percentile(0.99) / scale,
+        'buckets': {str(bucket): hits for bucket, hits in sorted(histogram.buckets.items())},
+    }
@@ -0,0 +1,116 @@
+import asyncio
+
+
+class AsyncPurchaseService:
+    """
+    Servicio asíncrono de compras para usar desde un servidor asyncio.
+    
+    Cada usuario tiene su propia cola: sus compras se procesan en el orden
+    en que llegaron, mientras que las de distintos usuarios avanzan de forma
+    concurrente. Las colas son acotadas, así que `submit` espera cuando un
+    usuario tiene demasiadas compras pendientes (backpressure).
+    
+    Ejemplo:
+        async with AsyncPurchaseService() as service:
+            result = await service.purchase(user, hotel, nights=3)
+    """
+    
+    def __init__(self, max_queue_size=100):
+        """
+        Inicializa el servicio.
+        
+        Args:
+            max_queue_size (int): Compras pendientes permitidas por usuario
+        """
+        self.max_queue_size = max_queue_size
+        self._queues = {}
+        self._workers = {}
+    
+    async def submit(self, user, product, **kwargs):
+        """
+        Encola una compra y retorna un future con su resultado.
+        
+        Espera si la cola del usuario está llena.
+        
+        Args:
+            user (User): Usuario que compra
+            product (Product): Producto a comprar
+            **kwargs: Parámetros adicionales (ej: nights para alojamientos)
+            
+        Returns:
+            asyncio.Future: Se resuelve con el PurchaseResult de la compra
+        """
+        queue = self._queues.get(user)
+        if queue is None:
+            queue = self._queues[user] = asyncio.Queue(self.max_queue_size)
+        if user not in self._workers:
+            self._workers[user] = asyncio.ensure_future(self._process(user, queue))
+        
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((product, kwargs, future))
+        return future
+    
+    async def purchase(self, user, product, **kwargs):
+        """
+        Compra un producto y espera el resultado.
+        
+        Args:
+            user (User): Usuario que compra
+            product (Product): Producto a comprar
+            **kwargs: Parámetros adicionales (ej: nights para alojamientos)
+            
+        Returns:
+            PurchaseResult: Resultado de la compra
+        """
+        return await (await self.submit(user, product, **kwargs))
+    
+    def pending(self, user):
+        """
+        Retorna la cantidad de compras encoladas de un usuario.
+        
+        Args:
+            user (User): Usuario a consultar
+            
+        Returns:
+            int: Compras pendientes
+        """
+        queue = self._queues.get(user)
+        return queue.qsize() if queue is not None else 0
+    
+    async def drain(self):
+        """Espera a que se procesen todas las compras encoladas."""
+        while self._workers:
+            await asyncio.gather(*self._workers.values())
+    
+    async def close(self):
+        """Procesa las compras pendientes y libera las colas."""
+        await self.drain()
+        self._queues.clear()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _process(self, user, queue):
+        """
+        Procesa en orden las compras de un usuario hasta vaciar su cola.
+        
+        La tarea termina cuando no quedan compras; la próxima llamada a
+        `submit` crea una nueva, así los usuarios inactivos no ocupan tareas.
+        """
+        try:
+            while not queue.empty():
+                product, kwargs, future = queue.get_nowait()
+                if not future.cancelled():
+                    try:
+                        future.set_result(user.purchase_product(product, **kwargs))
+                    except Exception as error:
+                        future.set_exception(error)
+                # Cede el control para que avancen los demás usuarios
+                await asyncio.sleep(0)
+        finally:
+            del self._workers[user]
+            if queue.empty():
+                del self._queues[user]
@@ -0,0 +1,436 @@
+"""
+Servicio HTTP/JSON local de cotizaciones y asequibilidad, solo con asyncio.
+
+Rutas:
+- POST /quote   {"product": 12, "nights": 3}          -> precio
+- POST /afford  {"user": "Juan", "product": 12, ...}  -> si le alcanza
+- GET  /health  y  GET /stats
+
+Los productos se identifican por su posición en el catálogo con el que se
+crea el servidor (y los usuarios por su nombre). Los parámetros opcionales
+son `nights` (obligatorio para alojamientos) y `units_to_rent` (complejos).
+
+Dos optimizaciones para muchos pedidos chicos y repetidos:
+- Micro-lotes: las cotizaciones se juntan durante `batch_window` segundos,
+  o hasta `max_batch` pedidos. Las de vuelos, hoteles, casas y complejos
+  (una unidad) se calculan juntas con `PriceCatalog.prices_at` (vectorizado
+  con NumPy si está disponible); paquetes y complejos con varias unidades,
+  de a una con la caché compartida (models/quote_cache.py).
+- Coalescencia: los pedidos idénticos que llegan mientras uno igual espera
+  su lote reciben ese mismo resultado en lugar de calcularlo otra vez.
+
+El catálogo se indexa al crear el servidor: si se modifica un producto en
+el lugar hay que crear otro servidor. Los cambios de reglas de precios
+(models/pricing_rules.py) se aplican en el momento.
+
+Uso:
+    python -m services.quote_server --catalog catalogo.jsonl --port 8080
+"""
+import argparse
+import asyncio
+import json
+from collections import namedtuple
+
+from models.accommodation import Accommodation
+from models.batch_pricing import PriceCatalog
+from models.complex import Complex
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+from models.money import Money
+from models.user import User
+from models import quote_cache
+from services.catalog_loader import CatalogLoader
+
+
+MAX_BODY_BYTES = 64 * 1024
+BATCHABLE_TYPES = (Flight, Hotel, House, Complex)
+
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+ServerStats = namedtuple('ServerStats', ['requests', 'computations', 'coalesced', 'batches',
+                                         'batched'])
+ServerStats.__doc__ = """
+Contadores del servidor de cotizaciones.
+
+Attributes:
+    requests (int): Pedidos HTTP atendidos
+    computations (int): Precios calculados (los pedidos coalescidos no suman)
+    coalesced (int): Pedidos resueltos con el cálculo de otro pedido idéntico
+    batches (int): Micro-lotes calculados
+    batched (int): Cotizaciones calculadas dentro de micro-lotes
+"""
+
+
+class RequestError(Exception):
+    """Pedido inválido; se responde con el código HTTP indicado."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class QuoteServer:
+    """
+    Servidor HTTP/1.1 de cotizaciones con conexiones persistentes.
+
+    Ejemplo:
+        async with QuoteServer(productos, usuarios) as server:
+            print(server.port)
+            await server.serve_forever()
+    """
+
+    def __init__(self, products, users=(), host='127.0.0.1', port=0, batch_window=0.001,
+                 max_batch=256):
+        """
+        Inicializa el servidor (no empieza a escuchar hasta `start`).
+
+        Args:
+            products (iterable): Catálogo; cada producto se pide por su posición
+            users (iterable): Usuarios que pueden consultar asequibilidad
+            host (str): Dirección donde escuchar
+            port (int): Puerto (0 = uno libre, ver `port` después de iniciar)
+            batch_window (float): Segundos que se espera para juntar un micro-lote
+            max_batch (int): Cotizaciones por micro-lote (al llegar se calcula ya)
+        """
+        self.products = list(products)
+        self.users = {user.name: user for user in users}
+        self.host = host
+        self.port = port
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+
+        batchable = [(index, product) for index, product in enumerate(self.products)
+                     if isinstance(product, BATCHABLE_TYPES)]
+        self._catalog = PriceCatalog(product for _, product in batchable)
+        self._rows = {index: row for row, (index, _) in enumerate(batchable)}
+
+        self._server = None
+        self._inflight = {}
+        self._pending = []
+        self._flush_handle = None
+        self._requests = 0
+        self._computations = 0
+        self._coalesced = 0
+        self._batches = 0
+        self._batched = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def start(self):
+        """Empieza a aceptar conexiones."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Deja de aceptar conexiones y calcula los micro-lotes pendientes."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._flush()
+
+    async def serve_forever(self):
+        """Atiende pedidos hasta que se cancele la tarea."""
+        await self._server.serve_forever()
+
+    def stats(self):
+        """
+        Contadores de pedidos, coalescencia y micro-lotes.
+
+        Returns:
+            ServerStats: Contadores actuales
+        """
+        return ServerStats(self._requests, self._computations, self._coalesced,
+                           self._batches, self._batched)
+
+    async def quote(self, index, params):
+        """
+        Precio de un producto del catálogo, coalesciendo pedidos idénticos.
+
+        Args:
+            index (int): Posición del producto en el catálogo
+            params (dict): nights y/o units_to_rent
+
+        Returns:
+            Money: Precio
+
+        Raises:
+            RequestError: Si el producto no existe o faltan parámetros
+        """
+        product = self._product(index)
+        params = _pricing_params(product, params)
+        key = (index, tuple(sorted(params.items())))
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self._coalesced += 1
+            # shield: si este pedido se cancela, los demás siguen esperando
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._computations += 1
+        row = self._rows.get(index)
+        if params.get('units_to_rent', 1) != 1:
+            row = None
+        self._enqueue(row, params.get('nights', 0), product, params, future, key)
+        return await asyncio.shield(future)
+
+    async def afford(self, name, index, params):
+        """
+        Verifica si a un usuario le alcanza para un producto.
+
+        Args:
+            name (str): Nombre del usuario
+            index (int): Posición del producto en el catálogo
+            params (dict): nights y/o units_to_rent
+
+        Returns:
+            tuple: (bool si le alcanza, precio, presupuesto)
+
+        Raises:
+            RequestError: Si el usuario o el producto no existen o faltan parámetros
+        """
+        user = self.users.get(name)
+        if user is None:
+            raise RequestError(404, f"Usuario desconocido: {name}")
+        price = await self.quote(index, params)
+        budget = user.budget
+        return price <= budget, price, budget
+
+    def _product(self, index):
+        if not isinstance(index, int) or not 0 <= index < len(self.products):
+            raise RequestError(404, f"Producto desconocido: {index}")
+        return self.products[index]
+
+    def _enqueue(self, row, nights, product, params, future, key):
+        self._pending.append((row, nights, product, params, future, key))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window,
+                                                                       self._flush)
+
+    def _flush(self):
+        """Calcula el micro-lote pendiente y resuelve sus futures."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        try:
+            self._compute(pending)
+        finally:
+            # Ningún future queda sin resolver ni registrado: si quedara en
+            # `_inflight`, los pedidos idénticos esperarían para siempre
+            for _, _, _, _, future, key in pending:
+                if not future.done():
+                    future.set_exception(RequestError(500, "No se pudo calcular el precio"))
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def _compute(self, pending):
+        """Resuelve los futures de un micro-lote."""
+        batch = []
+        for item in pending:
+            if item[0] is None:
+                _resolve(item[4], item[2], item[3])
+            else:
+                batch.append(item)
+        if not batch:
+            return
+        self._batches += 1
+        self._batched += len(batch)
+        try:
+            cents = self._catalog.prices_at([item[0] for item in batch],
+                                            [item[1] for item in batch])
+        except Exception:
+            # Algún producto no se pudo cotizar en lote: se cotizan de a uno
+            # para que solo esos pedidos reciban el error
+            for _, _, product, params, future, _ in batch:
+                _resolve(future, product, params)
+            return
+        for (_, _, _, _, future, _), price in zip(batch, cents):
+            if not future.done():
+                future.set_result(Money(int(price)))
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as error:
+                    writer.write(_response(error.status, {'error': str(error)}, False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                self._requests += 1
+                status, payload = await self._dispatch(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        try:
+            if path == '/health':
+                _expect(method, 'GET')
+                return 200, {'status': 'ok', 'products': len(self.products)}
+            if path == '/stats':
+                _expect(method, 'GET')
+                return 200, self.stats()._asdict()
+            if path == '/quote':
+                _expect(method, 'POST')
+                data = _parse(body)
+                price = await self.quote(data.get('product'), data)
+                return 200, {'product': data['product'], 'price': float(price),
+                             'cents': price.cents}
+            if path == '/afford':
+                _expect(method, 'POST')
+                data = _parse(body)
+                affordable, price, budget = await self.afford(data.get('user'),
+                                                              data.get('product'), data)
+                return 200, {'user': data['user'], 'product': data['product'],
+                             'affordable': affordable, 'price': float(price),
+                             'budget': float(budget)}
+            raise RequestError(404, f"Ruta desconocida: {path}")
+        except RequestError as error:
+            return error.status, {'error': str(error)}
+        except (TypeError, ValueError) as error:
+            return 400, {'error': str(error)}
+        except Exception as error:
+            return 500, {'error': f"{type(error).__name__}: {error}"}
+
+
+def _pricing_params(product, data):
+    """Parámetros de `calculate_price` que usa el producto."""
+    params = {}
+    if isinstance(product, Accommodation):
+        if 'nights' not in data:
+            raise RequestError(400, "Los alojamientos requieren 'nights'")
+        params['nights'] = _positive(data, 'nights')
+        if isinstance(product, Complex) and 'units_to_rent' in data:
+            params['units_to_rent'] = _positive(data, 'units_to_rent')
+    elif not isinstance(product, Flight) and 'nights' in data:
+        params['nights'] = _positive(data, 'nights')
+    return params
+
+
+def _positive(data, name):
+    value = data[name]
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise RequestError(400, f"'{name}' debe ser un entero positivo")
+    return value
+
+
+def _resolve(future, product, params):
+    """Cotiza un producto y deja el resultado (o el error) en el future."""
+    try:
+        future.set_result(Money.of(quote_cache.quote(product, params)))
+    except (TypeError, ValueError) as error:
+        future.set_exception(RequestError(400, str(error)))
+    except Exception as error:
+        # Error interno de este pedido (ej: RecursionError en un paquete muy
+        # profundo): responde 500 sin afectar al resto del lote
+        future.set_exception(error)
+
+
+def _expect(method, expected):
+    if method != expected:
+        raise RequestError(405, f"Método no permitido: {method}")
+
+
+def _parse(body):
+    try:
+        data = json.loads(body or b'{}')
+    except ValueError:
+        raise RequestError(400, "El cuerpo no es JSON válido")
+    if not isinstance(data, dict):
+        raise RequestError(400, "El cuerpo debe ser un objeto JSON")
+    return data
+
+
+async def _read_request(reader):
+    """
+    Lee un pedido HTTP/1.1.
+
+    Returns:
+        tuple | None: (método, ruta, encabezados, cuerpo), o None si el
+                      cliente cerró la conexión
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise RequestError(400, "Línea de pedido inválida")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise RequestError(400, "Content-Length inválido")
+    if length > MAX_BODY_BYTES:
+        raise RequestError(413, "Cuerpo demasiado grande")
+    body = await reader.readexactly(length) if length else b''
+    return method, path.split('?', 1)[0], headers, body
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+async def _serve(args):
+    loader = CatalogLoader()
+    products, users = [], []
+    for item in loader.load(args.catalog):
+        (users if isinstance(item, User) else products).append(item)
+    async with QuoteServer(products, users, args.host, args.port, args.batch_window,
+                           args.max_batch) as server:
+        print(f"Escuchando en http://{server.host}:{server.port} "
+              f"({len(products):,} productos, {len(users):,} usuarios, "
+              f"{loader.error_count:,} errores de carga)")
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--catalog', required=True, help="Archivo JSONL o CSV (ver CatalogLoader)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--batch-window', type=float, default=0.001)
+    parser.add_argument('--max-batch', type=int, default=256)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
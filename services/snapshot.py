@@ -0,0 +1,392 @@
+import mmap
+import struct
+
+from models.complex import Complex
+from models.flight import Flight
+from models.hotel import Hotel
+from models.house import House
+from models.package import Package
+from models.money import to_cents, from_cents
+
+
+MAGIC = b'AGSNAP01'
+
+KIND_FLIGHT = 0
+KIND_HOTEL = 1
+KIND_HOUSE = 2
+KIND_COMPLEX = 3
+KIND_PACKAGE = 4
+
+# Secciones en el orden en que aparecen en el encabezado
+SECTIONS = ('strings', 'flights', 'hotels', 'houses', 'complexes', 'packages', 'edges', 'roots')
+
+HEADER = struct.Struct('<8s' + 'QQ' * len(SECTIONS))
+STRING_OFFSET = struct.Struct('<Q')
+FLIGHT = struct.Struct('<iiiq')      # salida, regreso (-1 = solo ida), aerolínea, precio en centavos
+HOTEL = struct.Struct('<iii')        # dirección, nombre, estrellas
+HOUSE = struct.Struct('<ii')         # dirección, ambientes
+COMPLEX = struct.Struct('<iII')      # dirección, primera arista, cantidad de casas
+PACKAGE = struct.Struct('<iiII')     # nombre, descripción, primera arista, cantidad de productos
+EDGE = struct.Struct('<II')          # tipo, índice dentro de su sección
+
+_RECORDS = {
+    'flights': FLIGHT,
+    'hotels': HOTEL,
+    'houses': HOUSE,
+    'complexes': COMPLEX,
+    'packages': PACKAGE,
+    'edges': EDGE,
+    'roots': EDGE,
+}
+
+
+def write_snapshot(path, products):
+    """
+    Guarda un catálogo en un archivo binario de registros de ancho fijo.
+
+    Los productos compartidos (la misma casa en dos complejos, un paquete
+    dentro de varios paquetes) se guardan una sola vez.
+
+    Args:
+        path (str): Archivo de destino
+        products (iterable): Productos del catálogo (sus hijos se incluyen solos)
+
+    Raises:
+        TypeError: Si algún producto no tiene formato de snapshot
+    """
+    writer = _SnapshotWriter()
+    roots = [writer.register(product) for product in products]
+    writer.write(path, roots)
+
+
+class Snapshot:
+    """
+    Catálogo guardado con `write_snapshot`, abierto con mmap.
+
+    Abrirlo solo lee el encabezado: cada producto se construye la primera
+    vez que se accede a él y queda en caché. El costo de arranque es
+    proporcional a lo que se usa, no al tamaño del catálogo.
+
+    Ejemplo:
+        with Snapshot("catalogo.snap") as snapshot:
+            primero = snapshot.products[0]
+            hotel = snapshot.hotels[10]
+    """
+
+    def __init__(self, path):
+        """
+        Abre un snapshot.
+
+        Args:
+            path (str): Archivo generado con write_snapshot
+
+        Raises:
+            ValueError: Si el archivo no es un snapshot válido
+        """
+        self._file = open(path, 'rb')
+        self._map = None
+        try:
+            self._sections = self._read_header(path)
+        except BaseException:
+            self.close()
+            raise
+        self._strings = {}
+        self._cache = {}
+
+        self.flights = LazySection(self, KIND_FLIGHT, self._count('flights'))
+        self.hotels = LazySection(self, KIND_HOTEL, self._count('hotels'))
+        self.houses = LazySection(self, KIND_HOUSE, self._count('houses'))
+        self.complexes = LazySection(self, KIND_COMPLEX, self._count('complexes'))
+        self.packages = LazySection(self, KIND_PACKAGE, self._count('packages'))
+        self.products = _RootSection(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Cierra el archivo. Los productos ya construidos siguen siendo válidos."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def get(self, kind, index):
+        """
+        Retorna un producto, construyéndolo si todavía no se usó.
+
+        Args:
+            kind (int): Tipo de producto (constantes KIND_*)
+            index (int): Posición dentro de su sección
+
+        Returns:
+            Product: Producto construido
+        """
+        key = (kind, index)
+        product = self._cache.get(key)
+        if product is None:
+            if kind == KIND_PACKAGE:
+                product = self._build_packages(index)
+            else:
+                product = self._cache[key] = self._build(kind, index)
+        return product
+
+    @property
+    def materialized_count(self):
+        """int: Cantidad de productos ya construidos"""
+        return len(self._cache)
+
+    def _read_header(self, path):
+        """
+        Mapea el archivo y valida el encabezado.
+
+        Args:
+            path (str): Archivo abierto (solo para los mensajes)
+
+        Returns:
+            dict: Sección -> (desplazamiento, cantidad de registros)
+
+        Raises:
+            ValueError: Si el archivo está vacío, truncado o no es un snapshot
+        """
+        try:
+            # mmap no acepta archivos vacíos y unpack_from falla si el
+            # encabezado está incompleto
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            fields = HEADER.unpack_from(self._map, 0)
+        except (ValueError, struct.error) as error:
+            raise ValueError(f"{path} no es un snapshot de catálogo: {error}") from error
+        if fields[0] != MAGIC:
+            raise ValueError(f"{path} no es un snapshot de catálogo")
+
+        sections = {
+            name: (fields[1 + 2 * i], fields[2 + 2 * i])
+            for i, name in enumerate(SECTIONS)
+        }
+        # Cada sección tiene que entrar completa en el archivo. La de textos
+        # es una tabla de count + 1 desplazamientos seguida de los textos; el
+        # último desplazamiento es el largo total de los textos
+        size = len(self._map)
+        for name, (offset, count) in sections.items():
+            if name == 'strings':
+                end = offset + (count + 1) * STRING_OFFSET.size
+                if end <= size:
+                    end += STRING_OFFSET.unpack_from(self._map, end - STRING_OFFSET.size)[0]
+            else:
+                end = offset + count * _RECORDS[name].size
+            if end > size:
+                raise ValueError(f"{path} está truncado (sección {name})")
+        return sections
+
+    def _count(self, section):
+        return self._sections[section][1]
+
+    def _record(self, section, index):
+        offset, count = self._sections[section]
+        if not 0 <= index < count:
+            raise IndexError(f"Índice fuera de rango en {section}: {index}")
+        record = _RECORDS[section]
+        return record.unpack_from(self._map, offset + index * record.size)
+
+    def _string(self, string_id):
+        if string_id < 0:
+            return None
+        text = self._strings.get(string_id)
+        if text is None:
+            offset, count = self._sections['strings']
+            table_size = (count + 1) * STRING_OFFSET.size
+            start, = STRING_OFFSET.unpack_from(self._map, offset + string_id * STRING_OFFSET.size)
+            end, = STRING_OFFSET.unpack_from(self._map, offset + (string_id + 1) * STRING_OFFSET.size)
+            base = offset + table_size
+            text = self._strings[string_id] = self._map[base + start:base + end].decode('utf-8')
+        return text
+
+    def _edges(self, first, count):
+        return [self._record('edges', first + i) for i in range(count)]
+
+    def _build(self, kind, index):
+        if kind == KIND_FLIGHT:
+            departure, returned, airline, cents = self._record('flights', index)
+            return Flight(self._string(departure), self._string(returned),
+                          self._string(airline), from_cents(cents))
+        if kind == KIND_HOTEL:
+            address, name, stars = self._record('hotels', index)
+            return Hotel(self._string(address), self._string(name), stars)
+        if kind == KIND_HOUSE:
+            address, rooms = self._record('houses', index)
+            return House(self._string(address), rooms)
+        if kind == KIND_COMPLEX:
+            address, first, count = self._record('complexes', index)
+            houses = [self.get(child_kind, child) for child_kind, child in self._edges(first, count)]
+            return Complex(self._string(address), houses)
+        raise ValueError(f"Tipo de producto desconocido: {kind}")
+
+    def _build_packages(self, index):
+        """
+        Construye un paquete y los sub-paquetes que falten, de abajo hacia
+        arriba y sin recursión.
+        """
+        pending = [(index, False)]
+        in_progress = set()
+        while pending:
+            current, children_ready = pending.pop()
+            if (KIND_PACKAGE, current) in self._cache:
+                continue
+            name, description, first, count = self._record('packages', current)
+            edges = self._edges(first, count)
+            if not children_ready:
+                in_progress.add(current)
+                pending.append((current, True))
+                for kind, child in edges:
+                    if kind != KIND_PACKAGE or (KIND_PACKAGE, child) in self._cache:
+                        continue
+                    if child in in_progress:
+                        raise ValueError(f"El paquete '{self._string(name)}' forma un ciclo")
+                    pending.append((child, False))
+                continue
+            package = Package(self._string(name), self._string(description))
+            for kind, child in edges:
+                package.add_product(self.get(kind, child))
+            self._cache[(KIND_PACKAGE, current)] = package
+        return self._cache[(KIND_PACKAGE, index)]
+
+
+class LazySection:
+    """
+    Secuencia de productos de un tipo que se construyen al accederlos.
+    """
+
+    def __init__(self, snapshot, kind, count):
+        self._snapshot = snapshot
+        self._kind = kind
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._snapshot.get(self._kind, index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._snapshot.get(self._kind, index)
+
+
+class _RootSection(LazySection):
+    """Productos del catálogo en el orden en que se guardaron."""
+
+    def __init__(self, snapshot):
+        super().__init__(snapshot, None, snapshot._count('roots'))
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        kind, child = self._snapshot._record('roots', index)
+        return self._snapshot.get(kind, child)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+
+class _SnapshotWriter:
+    """Acumula los registros de cada sección antes de escribir el archivo."""
+
+    def __init__(self):
+        self.strings = {}
+        self.records = {name: [] for name in _RECORDS}
+        self.ids = {}
+        self.pending_packages = []
+        self._draining = False
+
+    def string(self, text):
+        if text is None:
+            return -1
+        string_id = self.strings.get(text)
+        if string_id is None:
+            string_id = self.strings[text] = len(self.strings)
+        return string_id
+
+    def register(self, product):
+        """Asigna tipo e índice a un producto (y a sus hijos) y retorna la arista."""
+        edge = self.ids.get(id(product))
+        if edge is not None:
+            return edge
+
+        if isinstance(product, Flight):
+            edge = self._add('flights', KIND_FLIGHT, product, (
+                self.string(product.departure_date), self.string(product.return_date),
+                self.string(product.airline), to_cents(product.price)))
+        elif isinstance(product, Hotel):
+            edge = self._add('hotels', KIND_HOTEL, product, (
+                self.string(product.address), self.string(product.name), product.stars))
+        elif isinstance(product, House):
+            edge = self._add('houses', KIND_HOUSE, product, (
+                self.string(product.address), product.rooms))
+        elif isinstance(product, Complex):
+            houses = [self.register(house) for house in product.houses]
+            first = len(self.records['edges'])
+            self.records['edges'].extend(houses)
+            edge = self._add('complexes', KIND_COMPLEX, product, (
+                self.string(product.address), first, len(houses)))
+        elif isinstance(product, Package):
+            # Las aristas de los paquetes se escriben al final para no recursar
+            edge = self._add('packages', KIND_PACKAGE, product, None)
+            self.pending_packages.append(product)
+            if not self._draining:
+                self._register_packages()
+        else:
+            raise TypeError(f"No se puede guardar en un snapshot: {type(product).__name__}")
+        return edge
+
+    def _add(self, section, kind, product, record):
+        edge = (kind, len(self.records[section]))
+        self.records[section].append(record)
+        self.ids[id(product)] = edge
+        return edge
+
+    def _register_packages(self):
+        self._draining = True
+        try:
+            while self.pending_packages:
+                package = self.pending_packages.pop()
+                _, index = self.ids[id(package)]
+                children = [self.register(child) for child in package.products]
+                first = len(self.records['edges'])
+                self.records['edges'].extend(children)
+                self.records['packages'][index] = (
+                    self.string(package.name), self.string(package.description),
+                    first, len(children))
+        finally:
+            self._draining = False
+
+    def write(self, path, roots):
+        self.records['roots'] = roots
+        encoded = [text.encode('utf-8') for text in self.strings]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+
+        with open(path, 'wb') as file:
+            file.write(b'\0' * HEADER.size)
+            layout = []
+
+            position = file.tell()
+            file.write(b''.join(STRING_OFFSET.pack(offset) for offset in offsets))
+            file.write(b''.join(encoded))
+            layout.append((position, len(encoded)))
+
+            for name in SECTIONS[1:]:
+                position = file.tell()
+                record = _RECORDS[name]
+                file.write(b''.join(record.pack(*values) for values in self.records[name]))
+                layout.append((position, len(self.records[name])))
+
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, *[value for pair in layout for value in pair]))
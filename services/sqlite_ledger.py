@@ -0,0 +1,239 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from models.events import EventSink, attach_sink
+from models.ledger import PurchaseLedger
+from models.money import to_cents, from_cents
+from models.user import User
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    name TEXT PRIMARY KEY,
+    initial_budget_cents INTEGER NOT NULL,
+    budget_cents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS purchases (
+    id INTEGER PRIMARY KEY,
+    user_name TEXT NOT NULL REFERENCES users(name),
+    product_type TEXT NOT NULL,
+    product TEXT NOT NULL,
+    price_cents INTEGER NOT NULL,
+    nights INTEGER NOT NULL,
+    units INTEGER NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS purchases_by_user ON purchases(user_name, id);
+"""
+
+# Sentencias fijas: sqlite3 las prepara una vez por conexión y las reutiliza
+INSERT_USER = ("INSERT INTO users (name, initial_budget_cents, budget_cents) "
+               "VALUES (?, ?, ?)")
+INSERT_PURCHASE = ("INSERT INTO purchases (user_name, product_type, product, price_cents, "
+                   "nights, units, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)")
+DEBIT_USER = "UPDATE users SET budget_cents = budget_cents - ? WHERE name = ?"
+SELECT_USER = "SELECT initial_budget_cents, budget_cents FROM users WHERE name = ?"
+SELECT_PURCHASES = ("SELECT product_type, product, price_cents, nights, units, timestamp "
+                    "FROM purchases WHERE user_name = ? ORDER BY id")
+
+
+class StoredProduct:
+    """
+    Producto restaurado desde la base: solo conserva su tipo y descripción.
+    """
+
+    __slots__ = ('type_name', 'description')
+
+    def __init__(self, type_name, description):
+        self.type_name = type_name
+        self.description = description
+
+    def __str__(self):
+        return self.description
+
+
+class SQLiteLedger(EventSink):
+    """
+    Persistencia opcional de presupuestos y compras en SQLite (modo WAL).
+
+    Se usa como `event_sink` de los usuarios: cada compra exitosa se escribe
+    en la base. Las escrituras se agrupan y se confirman juntas cada
+    `group_commit_size` compras (group commit); las compras todavía no
+    confirmadas se pierden si el proceso termina sin `flush()` o `close()`.
+    Las lecturas usan un pool de conexiones, así no compiten con el escritor.
+
+    Ejemplo:
+        ledger = SQLiteLedger("agencia.db")
+        user = ledger.register_user(User("Juan Pérez", 500000))
+        user.purchase_product(vuelo)
+        ledger.close()
+
+        restored = SQLiteLedger("agencia.db").load_user("Juan Pérez")
+    """
+
+    def __init__(self, path, group_commit_size=256, pool_size=4):
+        """
+        Abre (o crea) la base.
+
+        Args:
+            path (str): Archivo de la base SQLite
+            group_commit_size (int): Compras por commit (1 = commit por compra)
+            pool_size (int): Conexiones de lectura disponibles
+        """
+        self.path = path
+        self.group_commit_size = max(1, group_commit_size)
+        self._writer = self._connect()
+        self._writer.executescript(SCHEMA)
+        self._writer.commit()
+        self._write_lock = threading.Lock()
+        self._pending = 0
+        self._readers = queue.LifoQueue()
+        self._reader_slots = threading.Semaphore(pool_size)
+        self._all_readers = []
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level='DEFERRED')
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def register_user(self, user):
+        """
+        Guarda un usuario nuevo y lo conecta a la base.
+
+        Si el usuario ya tenía un `event_sink`, se siguen usando ambos. Un
+        usuario que ya está en la base se restaura con `load_user`: volver a
+        registrarlo le daría un presupuesto en memoria distinto del guardado,
+        y las compras se descontarían del guardado hasta dejarlo negativo.
+
+        Args:
+            user (User): Usuario a registrar
+
+        Returns:
+            User: El mismo usuario, con la base como destino de sus eventos
+
+        Raises:
+            ValueError: Si ya hay un usuario registrado con ese nombre
+        """
+        with self._write_lock:
+            cents = to_cents(user.budget)
+            try:
+                self._writer.execute(INSERT_USER, (user.name, to_cents(user.initial_budget), cents))
+            except sqlite3.IntegrityError:
+                raise ValueError(f"El usuario '{user.name}' ya está registrado; "
+                                 f"usar load_user") from None
+            self._writer.commit()
+        attach_sink(user, self)
+        return user
+
+    def load_user(self, name, event_sink=None):
+        """
+        Restaura un usuario guardado.
+
+        El presupuesto se lee en el momento; el historial se carga recién la
+        primera vez que se usa `purchase_history`.
+
+        Args:
+            name (str): Nombre del usuario
+            event_sink (EventSink): Destino adicional de eventos (ej: consola)
+
+        Returns:
+            User | None: Usuario restaurado, o None si no existe
+        """
+        with self._reader() as connection:
+            row = connection.execute(SELECT_USER, (name,)).fetchone()
+        if row is None:
+            return None
+
+        initial_cents, budget_cents = row
+        user = User(name, from_cents(initial_cents), event_sink=event_sink,
+                    history=lambda: self.load_history(name))
+        user.budget = from_cents(budget_cents)
+        attach_sink(user, self)
+        return user
+
+    def load_history(self, name):
+        """
+        Lee el historial de compras guardado de un usuario.
+
+        Args:
+            name (str): Nombre del usuario
+
+        Returns:
+            PurchaseLedger: Historial con productos StoredProduct
+        """
+        # Las compras sin confirmar no son visibles para las conexiones de lectura
+        self.flush()
+        ledger = PurchaseLedger()
+        products = {}
+        with self._reader() as connection:
+            for type_name, description, cents, nights, units, timestamp in connection.execute(
+                    SELECT_PURCHASES, (name,)):
+                key = (type_name, description)
+                product = products.get(key)
+                if product is None:
+                    product = products[key] = StoredProduct(type_name, description)
+                ledger.append(product, from_cents(cents), nights, units, timestamp, type_name)
+        return ledger
+
+    def emit_batch(self, events):
+        rows = []
+        debits = []
+        now = time.time()
+        for event in events:
+            if not event.result.success or not event.entries:
+                continue
+            total = 0
+            for product, price, kwargs in event.entries:
+                cents = to_cents(price)
+                total += cents
+                rows.append((event.user.name, type(product).__name__, str(product), cents,
+                             kwargs.get('nights', 0), kwargs.get('units_to_rent', 1), now))
+            debits.append((total, event.user.name))
+        if not rows:
+            return
+
+        with self._write_lock:
+            self._writer.executemany(INSERT_PURCHASE, rows)
+            self._writer.executemany(DEBIT_USER, debits)
+            self._pending += len(debits)
+            if self._pending >= self.group_commit_size:
+                self._commit()
+
+    def flush(self):
+        """Confirma las compras pendientes."""
+        with self._write_lock:
+            self._commit()
+
+    def close(self):
+        """Confirma lo pendiente y cierra todas las conexiones."""
+        self.flush()
+        with self._write_lock:
+            self._writer.close()
+        for connection in self._all_readers:
+            connection.close()
+
+    def _commit(self):
+        if self._pending:
+            self._writer.commit()
+            self._pending = 0
+
+    @contextmanager
+    def _reader(self):
+        """Toma una conexión de lectura del pool (creándola si hace falta)."""
+        self._reader_slots.acquire()
+        try:
+            try:
+                connection = self._readers.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+                self._all_readers.append(connection)
+            try:
+                yield connection
+            finally:
+                self._readers.put(connection)
+        finally:
+            self._reader_slots.release()
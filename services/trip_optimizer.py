@@ -0,0 +1,173 @@
+from bisect import bisect_right
+from collections import namedtuple
+
+from models.catalog_index import CatalogIndex
+from models.flight import Flight
+from models.hotel import Hotel
+
+
+OBJECTIVE_NIGHTS = 'nights'
+OBJECTIVE_STARS = 'stars'
+
+TripPlan = namedtuple('TripPlan', ['flight', 'accommodation', 'nights', 'stars', 'total_price'])
+TripPlan.__doc__ = """
+Viaje armado por el optimizador: un vuelo y un alojamiento por varias noches.
+
+Attributes:
+    flight (Flight): Vuelo elegido
+    accommodation (Accommodation): Alojamiento elegido
+    nights (int): Noches de alojamiento
+    stars (int): Estrellas del alojamiento (0 si no es un hotel)
+    total_price (Money | float): Precio del vuelo más el del alojamiento
+"""
+
+
+class TripOptimizer:
+    """
+    Arma el mejor viaje (vuelo + alojamiento + noches) para un presupuesto.
+
+    Trabaja sobre los arreglos ordenados de un CatalogIndex: vuelos por
+    precio y alojamientos por tarifa por noche. Además precalcula, para cada
+    prefijo de alojamientos, cuál tiene más estrellas, de modo que elegir el
+    alojamiento para un presupuesto restante es una búsqueda binaria.
+
+    Los vuelos se recorren de más barato a más caro (branch and bound): el
+    mejor alojamiento para un presupuesto restante se obtiene de forma exacta
+    y nunca mejora al achicarse ese presupuesto, así que la búsqueda se corta
+    en cuanto un vuelo no supera al mejor viaje encontrado.
+
+    Objetivos:
+    - 'nights': máximo de noches; desempata por estrellas y luego por precio
+    - 'stars': máximo de estrellas; desempata por noches y luego por precio
+    """
+
+    def __init__(self, catalog):
+        """
+        Prepara el optimizador.
+
+        Args:
+            catalog (CatalogIndex | iterable): Índice del catálogo o lista de productos
+        """
+        if not isinstance(catalog, CatalogIndex):
+            catalog = CatalogIndex(catalog)
+
+        flights = [
+            (price, product)
+            for price, product in zip(catalog.fixed_prices, catalog.fixed_products)
+            if isinstance(product, Flight)
+        ]
+        self.flight_prices = [price for price, _ in flights]
+        self.flights = [product for _, product in flights]
+        self.rates = catalog.nightly_rates
+        self.accommodations = catalog.accommodations
+        self.stars = [
+            product.stars if isinstance(product, Hotel) else 0
+            for product in self.accommodations
+        ]
+
+        # best_prefix[i]: índice con más estrellas entre los alojamientos 0..i
+        # (ante empates, el de menor tarifa)
+        self.best_prefix = []
+        best = 0
+        for i, stars in enumerate(self.stars):
+            if stars > self.stars[best]:
+                best = i
+            self.best_prefix.append(best)
+
+    def optimize(self, budget, objective=OBJECTIVE_NIGHTS, min_nights=1, round_trip=None):
+        """
+        Busca el mejor viaje para un presupuesto.
+
+        Args:
+            budget (Money | float): Presupuesto disponible
+            objective (str): 'nights' o 'stars'
+            min_nights (int): Mínimo de noches de alojamiento
+            round_trip (bool): Si se indica, exige vuelo de ida y vuelta (True)
+                o solo ida (False)
+
+        Returns:
+            TripPlan | None: El mejor viaje, o None si ninguno entra en el presupuesto
+
+        Raises:
+            ValueError: Si el objetivo no es válido o min_nights es menor a 1
+        """
+        if objective not in (OBJECTIVE_NIGHTS, OBJECTIVE_STARS):
+            raise ValueError(f"Objetivo inválido: {objective}")
+        if min_nights < 1:
+            raise ValueError("Se debe reservar al menos una noche")
+        if not self.rates:
+            return None
+
+        best_plan = None
+        best_key = None
+        for flight_price, flight in zip(self.flight_prices, self.flights):
+            if round_trip is not None and flight.is_round_trip() != round_trip:
+                continue
+
+            remaining = budget - flight_price
+            if remaining < self.rates[0] * min_nights:
+                # Los vuelos siguientes son más caros: ninguno deja lugar
+                break
+
+            plan = self._best_for(flight, flight_price, remaining, objective, min_nights)
+            if plan is None:
+                # Con menos presupuesto restante tampoco habrá alojamiento
+                break
+
+            # _best_for es exacto para el presupuesto restante y nunca mejora
+            # al achicarse, así que sirve de cota para los vuelos siguientes
+            key = self._key(plan, objective)
+            if best_key is not None and key <= best_key:
+                break
+            best_plan, best_key = plan, key
+
+        return best_plan
+
+    def _best_for(self, flight, flight_price, remaining, objective, min_nights):
+        """Elige alojamiento y noches para un vuelo ya elegido."""
+        if objective == OBJECTIVE_NIGHTS:
+            nights = int(remaining // self.rates[0])
+            if nights < min_nights:
+                return None
+            # Todos los alojamientos con tarifa <= remaining // nights logran esas noches
+            end = bisect_right(self.rates, remaining // nights)
+        else:
+            end = bisect_right(self.rates, remaining // min_nights)
+            if end == 0:
+                return None
+
+        index = self.best_prefix[max(end, 1) - 1]
+        accommodation = self.accommodations[index]
+        nights = int(remaining // self.rates[index])
+        price = accommodation.calculate_price(nights)
+        if price > remaining:
+            # Resguardo: se usa la tarifa más baja, que siempre entra
+            index = 0
+            accommodation = self.accommodations[0]
+            nights = int(remaining // self.rates[0])
+            price = accommodation.calculate_price(nights)
+
+        return TripPlan(flight, accommodation, nights, self.stars[index], flight_price + price)
+
+    def _key(self, plan, objective):
+        """Clave de comparación de un viaje (mayor es mejor)."""
+        if objective == OBJECTIVE_NIGHTS:
+            return (plan.nights, plan.stars, -plan.total_price)
+        return (plan.stars, plan.nights, -plan.total_price)
+
+
+def optimize_trip(user, catalog, objective=OBJECTIVE_NIGHTS, min_nights=1, round_trip=None):
+    """
+    Busca el mejor viaje para el presupuesto actual de un usuario.
+
+    Args:
+        user (User): Usuario que viaja
+        catalog (CatalogIndex | iterable): Índice del catálogo o lista de productos
+        objective (str): 'nights' o 'stars'
+        min_nights (int): Mínimo de noches de alojamiento
+        round_trip (bool): Exigir ida y vuelta (True) o solo ida (False)
+
+    Returns:
+        TripPlan | None: El mejor viaje, o None si ninguno entra en el presupuesto
+    """
+    return TripOptimizer(catalog).optimize(user.budget, objective, min_nights, round_trip)